@@ -0,0 +1,141 @@
+'''
+    Career and season totals for every driver and constructor, worked out
+    from data/results.csv (and data/races.csv for the year of each race)
+    in a single pass.
+
+    The totals are saved next to the data (AGGREGATES_FILE) and re-used
+    until results.csv or races.csv change.
+'''
+import os
+import collections
+from multi_command_utils import materialized_view
+from Formula1.f1_data_readers.Results import ResultsDataFile, results_data_directory, results_data_file
+from Formula1.f1_data_readers.Races import RacesDataFile, races_data_directory, races_data_file
+
+AGGREGATES_FILE = 'f1_aggregates.json'
+
+# Totals for a driver or constructor, over a career or a season
+career = collections.namedtuple("career", "races podiums wins poles front_rows dnfs points")
+EMPTY_CAREER = career(0, 0, 0, 0, 0, 0, 0.0)
+
+
+class CareerAggregates:
+    # Change whenever the totals, or the way they are worked out, change
+    SIGNATURE = 1
+
+    def __init__(self, directory = None, results_file = None, races_file = None):
+        '''
+            directory :     Folder holding results.csv and races.csv, the
+                            data folder if not provided.
+            results_file,
+            races_file :    Already loaded readers to use if the totals
+                            have to be worked out again, otherwise they
+                            are loaded here.
+        '''
+        results_path = os.path.join(directory or results_data_directory, results_data_file)
+        races_path = os.path.join(directory or races_data_directory, races_data_file)
+        sources = [results_path, races_path]
+        self.source_paths = sources
+        self.view_path = os.path.join(os.path.dirname(results_path), AGGREGATES_FILE)
+
+        data = materialized_view.load_view(self.view_path, sources, CareerAggregates.SIGNATURE)
+        self.loaded_from_cache = data is not None
+        if data is None:
+            fingerprints = materialized_view.source_fingerprints(sources)
+            data = CareerAggregates._build(
+                results_file or ResultsDataFile(directory),
+                races_file or RacesDataFile(directory))
+            materialized_view.save_view(self.view_path, fingerprints, CareerAggregates.SIGNATURE, data)
+
+        self.drivers = data['drivers']
+        self.constructors = data['constructors']
+        self.seasons = data['seasons']
+
+    def get_source_paths(self):
+        return list(self.source_paths)
+
+    def driver(self, driver_id):
+        return CareerAggregates._career(self.drivers, driver_id)
+
+    def constructor(self, constructor_id):
+        return CareerAggregates._career(self.constructors, constructor_id)
+
+    def season_driver(self, year, driver_id):
+        return CareerAggregates._career(self.seasons.get(str(year), {}).get('drivers', {}), driver_id)
+
+    def season_constructor(self, year, constructor_id):
+        return CareerAggregates._career(self.seasons.get(str(year), {}).get('constructors', {}), constructor_id)
+
+    def season_drivers(self, year):
+        '''
+            Dictionary of driver id -> totals for everyone who raced in year.
+        '''
+        drivers = self.seasons.get(str(year), {}).get('drivers', {})
+        return {driver_id : career(*totals) for driver_id, totals in drivers.items()}
+
+    def season_constructors(self, year):
+        constructors = self.seasons.get(str(year), {}).get('constructors', {})
+        return {constructor_id : career(*totals) for constructor_id, totals in constructors.items()}
+
+    def years(self):
+        return sorted(self.seasons.keys())
+
+    @staticmethod
+    def _career(table, key):
+        totals = table.get(str(key))
+        return career(*totals) if totals else EMPTY_CAREER
+
+    @staticmethod
+    def _build(results_file, races_file):
+        race_years = dict(zip(
+            [str(race_id) for race_id in races_file.get_column_by_name('raceId')],
+            [str(year) for year in races_file.get_column_by_name('year')]))
+
+        drivers = {}
+        constructors = {}
+        seasons = {}
+        columns = [
+            results_file.get_column_by_name(column_name)
+            for
+            column_name in ('raceId', 'driverId', 'constructorId', 'grid', 'position', 'points')
+            ]
+
+        for race_id, driver_id, constructor_id, grid, position, points in zip(*columns):
+            grid = CareerAggregates._text(grid)
+            position = CareerAggregates._text(position)
+            points = CareerAggregates._text(points)
+            totals = [
+                1,
+                1 if position in ('1', '2', '3') else 0,
+                1 if position == '1' else 0,
+                1 if grid == '1' else 0,
+                1 if grid in ('1', '2') else 0,
+                0 if position else 1,
+                float(points) if points else 0.0
+            ]
+
+            tables = [(drivers, driver_id), (constructors, constructor_id)]
+            year = race_years.get(str(race_id))
+            if year is not None:
+                season = seasons.setdefault(year, {'drivers' : {}, 'constructors' : {}})
+                tables.append( (season['drivers'], driver_id) )
+                tables.append( (season['constructors'], constructor_id) )
+
+            for table, key in tables:
+                key = str(key)
+                current = table.get(key)
+                if current is None:
+                    table[key] = list(totals)
+                else:
+                    for idx, value in enumerate(totals):
+                        current[idx] += value
+
+        return {
+            'drivers' : drivers,
+            'constructors' : constructors,
+            'seasons' : seasons
+        }
+
+    @staticmethod
+    def _text(value):
+        return '' if value is None else str(value).strip()
@@ -4,29 +4,31 @@
     Functionlity not complete, enough to get driver history.
 '''
 from multi_command_utils.data_finder import find_file_root
-from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.data_file import column_data
+from multi_command_utils.record_type import record_type, field_getter
+from multi_command_utils.record_cache import RecordCache
+from Formula1.f1_data_readers.F1DataFile import F1DataFile
 
 constructor_data_file = 'constructors.csv'
 constructor_data_directory = find_file_root(constructor_data_file)
 
-class Constructor:
-    def __init__(self, data_row):
-        for key in ConstructorsDataFile.CONSTRUCTOR_INDEXES:
-            setattr(self, key, data_row[ConstructorsDataFile.CONSTRUCTOR_INDEXES[key]])
+CONSTRUCTOR_FIELDS = (
+    'constructorId',
+    'constructorRef',
+    'name',
+    'nationality',
+    )
 
-class ConstructorsDataFile(DataFile):
-    CONSTRUCTOR_INDEXES = {
-        "constructorId" : -1 ,
-        'constructorRef' : -1,
-        'name' : -1,
-        'nationality' : -1
-        }
+class Constructor(record_type('Constructor', CONSTRUCTOR_FIELDS)):
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__(constructor_data_directory, constructor_data_file)
+class ConstructorsDataFile(F1DataFile):
+    def __init__(self, directory = None):
+        super().__init__(directory or constructor_data_directory, constructor_data_file, ['constructorId'])
 
-        for key in ConstructorsDataFile.CONSTRUCTOR_INDEXES.keys():
-            ConstructorsDataFile.CONSTRUCTOR_INDEXES[key] = self.get_field_index(key)
+    def header_loaded(self):
+        self.record_values = field_getter([self.get_field_index(key) for key in CONSTRUCTOR_FIELDS])
+        self.constructor_cache = RecordCache(self, 'constructorId')
 
     def get_by_id(self,id):
         columns = []
@@ -35,11 +37,17 @@ class ConstructorsDataFile(DataFile):
 
         return self.find(columns)
 
-    def find(self, column_data_list):
-        return_results = []
+    def get_constructor(self, constructor_id):
+        '''
+            Cached lookup of a single constructor, None if not found.
+        '''
+        return self.constructor_cache.get(constructor_id)
 
-        results = super().find(column_data_list)
-        for result in results:
-            return_results.append(Constructor(result))
+    def get_constructors(self, constructor_ids):
+        '''
+            Dictionary of id -> constructor for a list of ids, through the cache.
+        '''
+        return self.constructor_cache.get_many(constructor_ids)
 
-        return return_results
+    def make_record(self, row_data):
+        return Constructor(*self.record_values(row_data))
@@ -5,31 +5,46 @@
 '''
 from multi_command_utils.data_finder import find_file_root
 from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.record_type import record_type, field_getter
+from Formula1.f1_data_readers.F1DataFile import F1DataFile
 
 constructor_data_file = 'constructorStandings.csv'
 constructor_data_directory = find_file_root(constructor_data_file)
 
-class ConstructorStanding:
-    def __init__(self, data_row):
-        for key in ConstructorStandingsDataFile.CONSTRUCTOR_INDEXES:
-            setattr(self, key, data_row[ConstructorStandingsDataFile.CONSTRUCTOR_INDEXES[key]])
-
-class ConstructorStandingsDataFile(DataFile):
-    CONSTRUCTOR_INDEXES = {
-        "constructorStandingsId" : -1 ,
-        'raceId' : -1,
-        'constructorId' : -1,
-        'points' : -1,
-        'position' : -1,
-        'positionText' : -1,
-        'wins' : -1
+CONSTRUCTOR_STANDING_FIELDS = (
+    'constructorStandingsId',
+    'raceId',
+    'constructorId',
+    'points',
+    'position',
+    'positionText',
+    'wins',
+    )
+
+class ConstructorStanding(record_type('ConstructorStanding', CONSTRUCTOR_STANDING_FIELDS)):
+    __slots__ = ()
+
+class ConstructorStandingsDataFile(F1DataFile):
+    CONSTRUCTOR_SCHEMA = {
+        "constructorStandingsId" : int,
+        'raceId' : int,
+        'constructorId' : int,
+        'points' : float,
+        'position' : int,
+        'positionText' : str,
+        'wins' : int
         }
 
-    def __init__(self):
-        super().__init__(constructor_data_directory, constructor_data_file)
+    def __init__(self, directory = None):
+        super().__init__(
+            directory or constructor_data_directory, 
+            constructor_data_file, 
+            ['raceId', 'constructorId'],
+            storage = DataFile.COLUMNAR_STORAGE,
+            schema = ConstructorStandingsDataFile.CONSTRUCTOR_SCHEMA)
 
-        for key in ConstructorStandingsDataFile.CONSTRUCTOR_INDEXES.keys():
-            ConstructorStandingsDataFile.CONSTRUCTOR_INDEXES[key] = self.get_field_index(key)
+    def header_loaded(self):
+        self.record_values = field_getter([self.get_field_index(key) for key in CONSTRUCTOR_STANDING_FIELDS])
 
     def get_by_race_id(self,id):
         columns = []
@@ -45,11 +60,5 @@ class ConstructorStandingsDataFile(DataFile):
 
         return self.find(columns)
 
-    def find(self, column_data_list):
-        return_results = []
-
-        results = super().find(column_data_list)
-        for result in results:
-            return_results.append(ConstructorStanding(result))
-
-        return return_results
+    def make_record(self, row_data):
+        return ConstructorStanding(*self.record_values(row_data))
@@ -4,33 +4,35 @@
     Functionlity not complete, enough to get driver history.
 '''
 from multi_command_utils.data_finder import find_file_root
-from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.data_file import column_data
+from multi_command_utils.record_type import record_type, field_getter
+from multi_command_utils.record_cache import RecordCache
+from Formula1.f1_data_readers.F1DataFile import F1DataFile
 
 driver_data_file = 'drivers.csv'
 driver_data_directory = find_file_root(driver_data_file)
 
-class Driver:
-    def __init__(self, data_row):
-        for key in DriverDataFile.DRIVER_INDEXES:
-            setattr(self, key, data_row[DriverDataFile.DRIVER_INDEXES[key]])
-
-class DriverDataFile(DataFile):
-    DRIVER_INDEXES = {
-        'driverId' : -1,
-        'driverRef' : -1,
-        'number' : -1,
-        'code' : -1,
-        'forename' : -1,
-        'surname' : -1,
-        'dob' : -1,
-        'nationality' : -1
-        }
-
-    def __init__(self):
-        super().__init__(driver_data_directory, driver_data_file)
-
-        for key in DriverDataFile.DRIVER_INDEXES.keys():
-            DriverDataFile.DRIVER_INDEXES[key] = self.get_field_index(key)
+DRIVER_FIELDS = (
+    'driverId',
+    'driverRef',
+    'number',
+    'code',
+    'forename',
+    'surname',
+    'dob',
+    'nationality',
+    )
+
+class Driver(record_type('Driver', DRIVER_FIELDS)):
+    __slots__ = ()
+
+class DriverDataFile(F1DataFile):
+    def __init__(self, directory = None):
+        super().__init__(directory or driver_data_directory, driver_data_file, ['driverId'])
+
+    def header_loaded(self):
+        self.record_values = field_getter([self.get_field_index(key) for key in DRIVER_FIELDS])
+        self.driver_cache = RecordCache(self, 'driverId')
 
     def get_by_driver_id(self,driver_id):
         columns = []
@@ -48,12 +50,18 @@ class DriverDataFile(DataFile):
 
         return self.find(columns)
 
-    def find(self, column_data_list):
-        return_results = []
+    def get_driver(self, driver_id):
+        '''
+            Cached lookup of a single driver, None if not found.
+        '''
+        return self.driver_cache.get(driver_id)
 
-        results = super().find(column_data_list)
-        for result in results:
-            return_results.append(Driver(result))
+    def get_drivers(self, driver_ids):
+        '''
+            Dictionary of id -> driver for a list of ids, through the cache.
+        '''
+        return self.driver_cache.get_many(driver_ids)
 
-        return return_results
+    def make_record(self, row_data):
+        return Driver(*self.record_values(row_data))
 
@@ -5,31 +5,46 @@
 '''
 from multi_command_utils.data_finder import find_file_root
 from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.record_type import record_type, field_getter
+from Formula1.f1_data_readers.F1DataFile import F1DataFile
 
 driver_standing_data_file = 'driverStandings.csv'
 driver_standing_data_directory = find_file_root(driver_standing_data_file)
 
-class DriverStanding:
-    def __init__(self, data_row):
-        for key in DriverStandingFile.DRIVER_STANDING_INDEXES:
-            setattr(self, key, data_row[DriverStandingFile.DRIVER_STANDING_INDEXES[key]])
-
-class DriverStandingFile(DataFile):
-    DRIVER_STANDING_INDEXES = {
-        'driverStandingsId' : -1,
-        'raceId' : -1,
-        'driverId' : -1,
-        'points' : -1,
-        'position' : -1,
-        'positionText' : -1,
-        'wins' : -1
+DRIVER_STANDING_FIELDS = (
+    'driverStandingsId',
+    'raceId',
+    'driverId',
+    'points',
+    'position',
+    'positionText',
+    'wins',
+    )
+
+class DriverStanding(record_type('DriverStanding', DRIVER_STANDING_FIELDS)):
+    __slots__ = ()
+
+class DriverStandingFile(F1DataFile):
+    DRIVER_STANDING_SCHEMA = {
+        'driverStandingsId' : int,
+        'raceId' : int,
+        'driverId' : int,
+        'points' : float,
+        'position' : int,
+        'positionText' : str,
+        'wins' : int
         }
 
-    def __init__(self):
-        super().__init__(driver_standing_data_directory, driver_standing_data_file)
+    def __init__(self, directory = None):
+        super().__init__(
+            directory or driver_standing_data_directory, 
+            driver_standing_data_file, 
+            ['raceId', 'driverId'],
+            storage = DataFile.COLUMNAR_STORAGE,
+            schema = DriverStandingFile.DRIVER_STANDING_SCHEMA)
 
-        for key in DriverStandingFile.DRIVER_STANDING_INDEXES.keys():
-            DriverStandingFile.DRIVER_STANDING_INDEXES[key] = self.get_field_index(key)
+    def header_loaded(self):
+        self.record_values = field_getter([self.get_field_index(key) for key in DRIVER_STANDING_FIELDS])
 
     def get_by_driver_id(self,driver_id):
         columns = []
@@ -38,12 +53,6 @@ class DriverStandingFile(DataFile):
 
         return self.find(columns)
 
-    def find(self, column_data_list):
-        return_results = []
-
-        results = super().find(column_data_list)
-        for result in results:
-            return_results.append(DriverStanding(result))
-
-        return return_results
+    def make_record(self, row_data):
+        return DriverStanding(*self.record_values(row_data))
 
@@ -0,0 +1,15 @@
+'''
+    Base class of the readers over the Kaggle Formula One CSV files.
+
+    Every file in the data set is read the same way, so the settings 
+    are made once here rather than on each reader.
+'''
+from multi_command_utils.data_file import DataFile
+
+
+class F1DataFile(DataFile):
+    # Kaggle data is UTF-8 and marks missing values with \N
+    ENCODING = 'utf-8'
+    NULL_MARKER = '\\N'
+    # The files are large, re-use the parsed snapshot while unchanged
+    USE_CACHE = True
@@ -0,0 +1,58 @@
+'''
+    Abstraction over data/lapTimes.csv
+
+    The largest of the Kaggle files, held in typed columns rather than
+    rows of strings. The file is in race order so the raceId index is one
+    range of rows (a partition) per race, everything asked of a race is
+    answered from those rows only.
+'''
+from multi_command_utils.data_finder import find_file_root
+from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.record_type import record_type, field_getter
+from Formula1.f1_data_readers.F1DataFile import F1DataFile
+
+lap_times_data_file = 'lapTimes.csv'
+lap_times_data_directory = find_file_root(lap_times_data_file)
+
+LAP_TIME_FIELDS = (
+    'raceId',
+    'driverId',
+    'lap',
+    'position',
+    'time',
+    'milliseconds',
+    )
+
+class LapTime(record_type('LapTime', LAP_TIME_FIELDS)):
+    __slots__ = ()
+
+class LapTimesDataFile(F1DataFile):
+    LAP_TIME_SCHEMA = {
+        'raceId' : int,
+        'driverId' : int,
+        'lap' : int,
+        'position' : int,
+        'time' : str,
+        'milliseconds' : int
+        }
+
+    def __init__(self, directory = None):
+        super().__init__(
+            directory or lap_times_data_directory,
+            lap_times_data_file,
+            ['raceId'],
+            storage = DataFile.COLUMNAR_STORAGE,
+            schema = LapTimesDataFile.LAP_TIME_SCHEMA)
+
+    def header_loaded(self):
+        self.record_values = field_getter([self.get_field_index(key) for key in LAP_TIME_FIELDS])
+
+    def get_by_race_id(self, race_id, driver_id = None):
+        columns = [column_data('raceId', race_id)]
+        if driver_id:
+            columns.append(column_data('driverId', driver_id))
+
+        return self.find(columns)
+
+    def make_record(self, row_data):
+        return LapTime(*self.record_values(row_data))
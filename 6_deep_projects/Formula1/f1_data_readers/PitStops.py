@@ -0,0 +1,58 @@
+'''
+    Abstraction over data/pitStops.csv
+
+    Typed columns, the raceId index is one partition of rows per race.
+'''
+from multi_command_utils.data_finder import find_file_root
+from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.record_type import record_type, field_getter
+from Formula1.f1_data_readers.F1DataFile import F1DataFile
+
+pit_stops_data_file = 'pitStops.csv'
+pit_stops_data_directory = find_file_root(pit_stops_data_file)
+
+PIT_STOP_FIELDS = (
+    'raceId',
+    'driverId',
+    'stop',
+    'lap',
+    'time',
+    'duration',
+    'milliseconds',
+    )
+
+class PitStop(record_type('PitStop', PIT_STOP_FIELDS)):
+    __slots__ = ()
+
+class PitStopsDataFile(F1DataFile):
+    # duration is text, long stops are written as minutes:seconds
+    PIT_STOP_SCHEMA = {
+        'raceId' : int,
+        'driverId' : int,
+        'stop' : int,
+        'lap' : int,
+        'time' : str,
+        'duration' : str,
+        'milliseconds' : int
+        }
+
+    def __init__(self, directory = None):
+        super().__init__(
+            directory or pit_stops_data_directory,
+            pit_stops_data_file,
+            ['raceId'],
+            storage = DataFile.COLUMNAR_STORAGE,
+            schema = PitStopsDataFile.PIT_STOP_SCHEMA)
+
+    def header_loaded(self):
+        self.record_values = field_getter([self.get_field_index(key) for key in PIT_STOP_FIELDS])
+
+    def get_by_race_id(self, race_id, driver_id = None):
+        columns = [column_data('raceId', race_id)]
+        if driver_id:
+            columns.append(column_data('driverId', driver_id))
+
+        return self.find(columns)
+
+    def make_record(self, row_data):
+        return PitStop(*self.record_values(row_data))
@@ -0,0 +1,60 @@
+'''
+    Abstraction over data/qualifying.csv
+
+    Typed columns, the raceId index is one partition of rows per race.
+'''
+from multi_command_utils.data_finder import find_file_root
+from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.record_type import record_type, field_getter
+from Formula1.f1_data_readers.F1DataFile import F1DataFile
+
+qualifying_data_file = 'qualifying.csv'
+qualifying_data_directory = find_file_root(qualifying_data_file)
+
+QUALIFYING_FIELDS = (
+    'qualifyId',
+    'raceId',
+    'driverId',
+    'constructorId',
+    'number',
+    'position',
+    'q1',
+    'q2',
+    'q3',
+    )
+
+class Qualifying(record_type('Qualifying', QUALIFYING_FIELDS)):
+    __slots__ = ()
+
+class QualifyingDataFile(F1DataFile):
+    QUALIFYING_SCHEMA = {
+        'qualifyId' : int,
+        'raceId' : int,
+        'driverId' : int,
+        'constructorId' : int,
+        'number' : int,
+        'position' : int,
+        'q1' : str,
+        'q2' : str,
+        'q3' : str
+        }
+
+    def __init__(self, directory = None):
+        super().__init__(
+            directory or qualifying_data_directory,
+            qualifying_data_file,
+            ['raceId', 'driverId'],
+            storage = DataFile.COLUMNAR_STORAGE,
+            schema = QualifyingDataFile.QUALIFYING_SCHEMA)
+
+    def header_loaded(self):
+        self.record_values = field_getter([self.get_field_index(key) for key in QUALIFYING_FIELDS])
+
+    def get_by_race_id(self, race_id):
+        return self.find([column_data('raceId', race_id)])
+
+    def get_by_driver_id(self, driver_id):
+        return self.find([column_data('driverId', driver_id)])
+
+    def make_record(self, row_data):
+        return Qualifying(*self.record_values(row_data))
@@ -4,31 +4,32 @@
     Functionlity not complete, enough to get driver history.
 '''
 from multi_command_utils.data_finder import find_file_root
-from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.data_file import column_data
+from multi_command_utils.record_type import record_type, field_getter
+from Formula1.f1_data_readers.F1DataFile import F1DataFile
 
 races_data_file = 'races.csv'
 races_data_directory = find_file_root(races_data_file)
 
-class Race:
-    def __init__(self, data_row):
-        for key in RacesDataFile.RACES_INDEXES:
-            setattr(self, key, data_row[RacesDataFile.RACES_INDEXES[key]])
+RACE_FIELDS = (
+    'raceId',
+    'year',
+    'round',
+    'circuitId',
+    'name',
+    'date',
+    )
 
-class RacesDataFile(DataFile):
-    RACES_INDEXES = {
-        'raceId' : -1,
-        'year' : -1,
-        'round' : -1,
-        'circuitId' : -1,
-        'name' : -1,
-        'date' : -1
-        }
+class Race(record_type('Race', RACE_FIELDS)):
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__(races_data_directory, races_data_file)
+class RacesDataFile(F1DataFile):
+    def __init__(self, directory = None):
+        super().__init__(directory or races_data_directory, races_data_file, ['raceId', 'year'], sorted_columns = ['year', 'date'])
 
-        for key in RacesDataFile.RACES_INDEXES.keys():
-            RacesDataFile.RACES_INDEXES[key] = self.get_field_index(key)
+    def header_loaded(self):
+        self.record_values = field_getter([self.get_field_index(key) for key in RACE_FIELDS])
+        self.season_finals = None
 
     def get_by_race_id(self,race_id):
         columns = []
@@ -44,14 +45,32 @@ class RacesDataFile(DataFile):
 
         return self.find(columns)
 
-    def find(self, column_data_list):
-        return_results = []
+    def get_season_finals(self):
+        '''
+            Dictionary of year -> raceId of the final round that year,
+            worked out in one pass the first time it is asked for.
+        '''
+        if self.season_finals is None:
+            finals = {}
+            last_rounds = {}
+            columns = [self.get_column_by_name(column_name) for column_name in ('year', 'round', 'raceId')]
+            for year, race_round, race_id in zip(*columns):
+                year = str(year)
+                race_round = int(race_round)
+                if year not in last_rounds or race_round > last_rounds[year]:
+                    last_rounds[year] = race_round
+                    finals[year] = str(race_id)
+            self.season_finals = finals
+        return self.season_finals
 
-        results = super().find(column_data_list)
-        for result in results:
-            return_results.append(Race(result))
+    def get_final_race_id(self, year):
+        final_race_id = self.get_season_finals().get(str(year).strip())
+        if final_race_id is None:
+            raise Exception("No races found for year {}".format(year))
+        return final_race_id
 
-        return return_results
+    def make_record(self, row_data):
+        return Race(*self.record_values(row_data))
 
 '''
 df = RacesDataFile()
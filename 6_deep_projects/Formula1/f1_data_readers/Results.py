@@ -4,15 +4,37 @@
     Functionlity not complete, enough to get driver history.
 '''
 from multi_command_utils.data_finder import find_file_root
-from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.data_file import column_data
+from multi_command_utils.record_type import record_type, field_getter
+from multi_command_utils.data_join import join, join_on
+from Formula1.f1_data_readers.F1DataFile import F1DataFile
 
 results_data_file = 'results.csv'
 results_data_directory = find_file_root(results_data_file)
 
-class Result:
-    def __init__(self, data_row):
-        for key in ResultsDataFile.RESULTS_INDEXES:
-            setattr(self, key, data_row[ResultsDataFile.RESULTS_INDEXES[key]])
+RESULT_FIELDS = (
+    'resultId',
+    'raceId',
+    'driverId',
+    'constructorId',
+    'number',
+    'grid',
+    'position',
+    'positionText',
+    'positionOrder',
+    'points',
+    'laps',
+    'time',
+    'milliseconds',
+    'fastestLap',
+    'rank',
+    'fastestLapTime',
+    'fastestLapSpeed',
+    'statusId',
+    )
+
+class Result(record_type('Result', RESULT_FIELDS)):
+    __slots__ = ()
 
     def is_front_row_start(self):
         grid = self.grid.strip()
@@ -29,33 +51,12 @@ class Result:
     def is_dnf(self):
         return not self.position.strip() 
 
-class ResultsDataFile(DataFile):
-    RESULTS_INDEXES = {
-        'resultId' : -1,
-        'raceId' : -1,
-        'driverId' : -1,
-        'constructorId' : -1,
-        'number' : -1,
-        'grid' : -1,
-        'position' : -1,
-        'positionText' : -1,
-        'positionOrder' : -1,
-        'points' : -1,
-        'laps' : -1,
-        'time' : -1,
-        'milliseconds' : -1,
-        'fastestLap' : -1,
-        'rank' : -1,
-        'fastestLapTime' : -1,
-        'fastestLapSpeed' : -1,
-        'statusId' : -1
-        }
+class ResultsDataFile(F1DataFile):
+    def __init__(self, directory = None):
+        super().__init__(directory or results_data_directory, results_data_file, ['raceId', 'driverId'], sorted_columns = ['milliseconds'])
 
-    def __init__(self):
-        super().__init__(results_data_directory, results_data_file)
-
-        for key in ResultsDataFile.RESULTS_INDEXES.keys():
-            ResultsDataFile.RESULTS_INDEXES[key] = self.get_field_index(key)
+    def header_loaded(self):
+        self.record_values = field_getter([self.get_field_index(key) for key in RESULT_FIELDS])
 
     def get_by_driver_id(self,driver_id):
         columns = []
@@ -71,14 +72,23 @@ class ResultsDataFile(DataFile):
 
         return self.find(columns)
 
-    def find(self, column_data_list):
-        return_results = []
-
-        results = super().find(column_data_list)
-        for result in results:
-            return_results.append(Result(result))
-
-        return return_results
+    def join(self, results, races, constructors, status):
+        '''
+            Joins results (i.e. from get_by_driver_id) to their race,
+            constructor and status in one go. Returns a row per result with
+            the fields result, race, constructor and status.
+        '''
+        return join(
+            results,
+            [
+                join_on('race', races, 'raceId', 'raceId'),
+                join_on('constructor', constructors, 'constructorId', 'constructorId'),
+                join_on('status', status, 'statusId', 'statusId')
+            ],
+            'result')
+
+    def make_record(self, row_data):
+        return Result(*self.record_values(row_data))
 
 '''
 df = ResultsDataFile()
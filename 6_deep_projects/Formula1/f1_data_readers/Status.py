@@ -4,28 +4,28 @@
     Functionlity not complete, enough to get driver history.
 '''
 from multi_command_utils.data_finder import find_file_root
-from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.data_file import column_data
+from multi_command_utils.record_type import record_type, field_getter
+from Formula1.f1_data_readers.F1DataFile import F1DataFile
 
 status_data_file = 'status.csv'
 status_data_directory = find_file_root(status_data_file)
 
 
-class Status:
-    def __init__(self, data_row):
-        for key in StatusDataFile.STATUS_INDEXES:
-            setattr(self, key, data_row[StatusDataFile.STATUS_INDEXES[key]])
+STATUS_FIELDS = (
+    'statusId',
+    'status',
+    )
 
-class StatusDataFile(DataFile):
-    STATUS_INDEXES = {
-        'statusId' : -1,
-        'status' : -1
-        }
+class Status(record_type('Status', STATUS_FIELDS)):
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__(status_data_directory, status_data_file)
+class StatusDataFile(F1DataFile):
+    def __init__(self, directory = None):
+        super().__init__(directory or status_data_directory, status_data_file, ['statusId'])
 
-        for key in StatusDataFile.STATUS_INDEXES.keys():
-            StatusDataFile.STATUS_INDEXES[key] = self.get_field_index(key)
+    def header_loaded(self):
+        self.record_values = field_getter([self.get_field_index(key) for key in STATUS_FIELDS])
 
     def get_by_status_id(self,driver_id):
         columns = []
@@ -34,14 +34,8 @@ class StatusDataFile(DataFile):
 
         return self.find(columns)
 
-    def find(self, column_data_list):
-        return_results = []
-
-        results = super().find(column_data_list)
-        for result in results:
-            return_results.append(Status(result))
-
-        return return_results
+    def make_record(self, row_data):
+        return Status(*self.record_values(row_data))
 
 '''
 sf = StatusDataFile()
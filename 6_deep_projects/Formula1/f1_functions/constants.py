@@ -14,3 +14,4 @@ class F1DataConstants:
     LAP_TIMES_DATA = 'laptimes'
     PIT_STOP_DATA = 'pitstops'
     QUALIFYING_DATA = 'qualifying'
+    CAREER_DATA = 'careers'
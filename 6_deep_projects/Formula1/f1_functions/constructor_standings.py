@@ -1,8 +1,8 @@
 import json
 from multi_command_utils.data_file import column_data
 from multi_command_utils.interface import IFunction, argument_definition
+from multi_command_utils.tabular_result import CommandResult, TabularResult
 from Formula1.f1_functions.constants import F1DataConstants
-from Formula1.f1_functions.banner import print_banner, print_row
 
 class ConstructorStandings(IFunction):
     def __init__(self, datasets):
@@ -30,38 +30,32 @@ class ConstructorStandings(IFunction):
                 constructor_standing_data = self.datasets[F1DataConstants.CONSTRUCTOR_STANDINGS_DATA]
 
                 # -y is required and the only way to run this
-                # Races come back in order
-                races = race_data.get_by_race_year(execute_args['-y'])
-                standings = constructor_standing_data.get_by_race_id(races[-1].raceId)
+                # Standings after the final race of the year
+                race_id = race_data.get_final_race_id(execute_args['-y'])
+                standings = constructor_standing_data.get_by_race_id(race_id)
 
                 if standings and len(standings):
-                    for standing in standings:
-                        standing.points = int(float(standing.points))
-
-                    headers = ["Position", "Wins", "Points", "Name","Nationality"]
-                    columns = [10,6,8,20,13]
-                    print_banner(columns, headers)
-
+                    # Points are typed (float) by the standings reader
                     standings = sorted(standings, reverse=True, key=lambda standing : standing.points)
-                    for standing in standings:
-                        name, nationality = self._get_constructor_info(constructor_data, standing.constructorId)
-
-                        print_row(
-                            columns,
-                            [
-                                standing.position,
-                                standing.wins,
-                                standing.points,
-                                name,
-                                nationality
-                            ],
-                            False
-                        )    
+                    constructor_data.get_constructors([standing.constructorId for standing in standings])
+                    return CommandResult([
+                        TabularResult(
+                            ["Position", "Wins", "Points", "Name","Nationality"],
+                            self._standing_rows(constructor_data, standings),
+                            [10,6,8,20,13])
+                        ])
 
         except Exception as ex:
             print(str(ex))
             raise ex
 
+    def _standing_rows(self, constructor_data, standings):
+        rows = []
+        for standing in standings:
+            name, nationality = self._get_constructor_info(constructor_data, standing.constructorId)
+            rows.append([standing.position, standing.wins, standing.points, name, nationality])
+        return rows
+
     def _get_constructor_info(self, constructor_data, constructor_id):
-        constructor = constructor_data.get_by_id(constructor_id)
-        return constructor[0].name, constructor[0].nationality
\ No newline at end of file
+        constructor = constructor_data.get_constructor(constructor_id)
+        return constructor.name, constructor.nationality
\ No newline at end of file
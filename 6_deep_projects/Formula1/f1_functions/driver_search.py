@@ -17,10 +17,15 @@
         -y
 '''
 import json
+from collections import namedtuple
 from multi_command_utils.data_file import column_data
+from multi_command_utils.data_join import semi_join
 from multi_command_utils.interface import IFunction, argument_definition
+from multi_command_utils.tabular_result import CommandResult, TabularResult
 from Formula1.f1_functions.constants import F1DataConstants
-from Formula1.f1_functions.banner import print_banner, print_row
+
+# A driver record with their career totals
+driver_career = namedtuple("driver_career", "driver races podiums")
 
 class DriverSearch(IFunction):
     def __init__(self, datasets):
@@ -48,8 +53,10 @@ class DriverSearch(IFunction):
                 race_data = self.datasets[F1DataConstants.RACE_DATA]
                 results_data = self.datasets[F1DataConstants.RESULTS_DATA]
                 driver_standing_data = self.datasets[F1DataConstants.DRIVER_STANDING_DATA]
+                career_data = self.datasets[F1DataConstants.CAREER_DATA]
 
                 driver_info = None
+                messages = []
 
                 search_header = "Search All Drivers:"
                 if IFunction.GLOBAL_QUERY in execute_args.keys():
@@ -70,85 +77,66 @@ class DriverSearch(IFunction):
                     # Search by year
                     search_header = "Search Drivers By Year {}:".format(execute_args['-y'])
                     races = race_data.get_by_race_year(execute_args['-y'])
-                    driver_id_list = []
-                    driver_info = []
-                    print("Races", len(races))
-                    for race in races:
-                        race_results = results_data.get_by_race_id(race.raceId)
-                        for race_result in race_results:
-                            if race_result.driverId not in driver_id_list:
-                                driver_id_list.append(race_result.driverId)
-                                current_driver = driver_data.get_by_driver_id(race_result.driverId)
-                                driver_info.extend(current_driver)
+                    messages.append("Races {}".format(len(races)))
+                    # Races of the year -> results of those races -> the
+                    # drivers in them, in the order they first raced
+                    race_results = semi_join(results_data, 'raceId', races.column('raceId'))
+                    driver_info = semi_join(driver_data, 'driverId', race_results.column('driverId'))
                 else:
                     # Get all
                     driver_info = driver_data.get_by_name(None,None)
 
-                # Now dump out what we found
+                # Now return what we found
                 count = len(driver_info) if driver_info else 0
-                print("{}: {} drivers".format(search_header, count))
-                headers = [
-                    ["Driver ID", "DOB", "Nationality", "Races/Podiums", "Name"],
-                    ["", "", "", "Career", ""],
-                ]
-                columns = [9,11,13,18,30]
-                print_banner(columns, headers)
+                messages.append("{}: {} drivers".format(search_header, count))
 
                 driver_iterations = driver_info if driver_info else []
-                driver_iterations = self._prep_driver_list(driver_iterations, results_data, race_data)
-                for driver in driver_iterations:
-                    stats = "%d/%d (%.2f" % (
-                        driver.races, 
-                        driver.podiums,
-                        (driver.podiums / driver.races) * 100)
-                    stats += '%)'
-
-                    print_row(
-                        columns,
-                        [
-                            driver.driverId,
-                            driver.dob,
-                            driver.nationality,
-                            stats,
-                            "{} {}".format(driver.forename, driver.surname)
-                        ],
-                        False
-                    )
-
+                driver_iterations = self._prep_driver_list(driver_iterations, career_data)
+                return CommandResult(
+                    [
+                        TabularResult(
+                            ["Driver ID", "DOB", "Nationality", "Races", "Podiums", "Podium %", "Name"],
+                            self._driver_rows(driver_iterations),
+                            [9,11,13,7,9,10,30])
+                    ],
+                    messages)
 
         except Exception as ex:
             print(str(ex))
             raise ex
 
-    def _prep_driver_list(self, driver_list, results_data, race_data):
+    def _driver_rows(self, careers):
+        rows = []
+        for career in careers:
+            driver = career.driver
+            # Drivers with no results on file have no podium percentage
+            podium_percent = "{:.2f}".format((career.podiums / career.races) * 100) if career.races else "0.00"
+            rows.append([
+                driver.driverId,
+                driver.dob,
+                driver.nationality,
+                career.races,
+                career.podiums,
+                podium_percent,
+                "{} {}".format(driver.forename, driver.surname)
+            ])
+        return rows
+
+    def _prep_driver_list(self, driver_list, career_data):
 
+        career_list = []
         if len(driver_list):
             for driver in driver_list:
-                races, podiums = self._get_driver_standings(driver.driverId, results_data, race_data)
-                setattr(driver,'races', int(races))
-                setattr(driver,'podiums', int(podiums))
+                career = career_data.driver(driver.driverId)
+                career_list.append(driver_career(driver, career.races, career.podiums))
        
             # Get everyone that has a podium
-            podium_drivers = [driver for driver in driver_list if driver.podiums > 0]
-            non_podium_drivers = [driver for driver in driver_list if driver.podiums == 0]
+            podium_drivers = [career for career in career_list if career.podiums > 0]
+            non_podium_drivers = [career for career in career_list if career.podiums == 0]
 
-            podium_drivers = sorted(podium_drivers, reverse=True, key=lambda driver : driver.podiums)
-            non_podium_drivers = sorted(non_podium_drivers, reverse=True, key=lambda driver : driver.races)
+            podium_drivers = sorted(podium_drivers, reverse=True, key=lambda career : career.podiums)
+            non_podium_drivers = sorted(non_podium_drivers, reverse=True, key=lambda career : career.races)
             podium_drivers.extend(non_podium_drivers)
             return  podium_drivers
 
-        return driver_list
-
-    def _get_driver_standings(self, driver_id, results_data, race_data):
-        career_podiums = 0
-        career_races = 0
-        # Get podiums
-        podium_positions = ['1','2','3']
-        all_results = results_data.find([column_data('driverId', driver_id)])
-        final_positions = [result.position for result in all_results]
-
-        for position in podium_positions:
-            career_podiums += final_positions.count(position)
-
-        career_races = len(all_results)
-        return career_races, career_podiums
+        return career_list
@@ -18,9 +18,10 @@
 '''
 import json
 from multi_command_utils.data_file import column_data
+from multi_command_utils.data_join import semi_join
 from multi_command_utils.interface import IFunction, argument_definition
+from multi_command_utils.tabular_result import CommandResult, TabularResult
 from Formula1.f1_functions.constants import F1DataConstants
-from Formula1.f1_functions.banner import print_banner, print_row
 
 class DriverStandings(IFunction):
     def __init__(self, datasets):
@@ -50,75 +51,57 @@ class DriverStandings(IFunction):
                 search_header = "Search All Years:"
                 if '-y' in execute_args.keys():
                     search_header = "Search Standings By Year {}:".format(execute_args['-y'])
-                    print(search_header)
-                    headers = ["Position" ,"Points", "Driver"] 
-                    columns = [10,8,20]
-                    print_banner(columns,headers)
-
-                    # Get all races for the year
-                    races = race_data.get_by_race_year(execute_args['-y'])
-
-                    # Only interested in the last one
-                    race = races[-1]
-                    standings = driver_standing_data.find([column_data('raceId', race.raceId)])
-                    for standing in standings:
-                        standing.points = int(float(standing.points))
-
-                    # Sort on points
-                    position = 1
+
+                    # Only interested in the last race of the year
+                    race_id = race_data.get_final_race_id(execute_args['-y'])
+                    standings = driver_standing_data.find([column_data('raceId', race_id)])
+
+                    # Sort on points, already typed (float) by the standings reader
                     standings = sorted(standings, reverse=True, key=lambda standing : standing.points)
+                    driver_data.get_drivers([standing.driverId for standing in standings])
 
-                    # Now print them out.
-                    for standing in standings:
-                        print_row(
-                            columns,
-                            [
-                                position, 
-                                standing.points,
-                                self._get_driver_info(driver_data,standing.driverId)
-                            ],
-                            False
-                        )
-                        position += 1
+                    return CommandResult(
+                        [TabularResult(["Position" ,"Points", "Driver"], self._standing_rows(driver_data, standings), [10,8,20])],
+                        search_header)
 
                 else:
                     # Slightly different, we want to get the winner by each year
-                    print(search_header)
-
-                    headers = ["Year" ,"Driver Name"] 
-                    columns = [8,30]
-                    print_banner(columns,headers)
-                    
-                    # Get all the years 
-                    years = race_data.get_column_by_name('year')
-                    years = list(set(years))
-                    years.sort(reverse = True)
-
-                    # For each year, get the races and take the last one
-                    for year in years:
-                        # Get all races for the year
-                        races = race_data.get_by_race_year(year)
-
-                        # Only interested in the last one
-                        race = races[-1]
-                        standings = driver_standing_data.find([column_data('position', '1'),column_data('raceId', race.raceId)])
-                        # Seems to have some, but not all, 2018 data so we will get no standings 
-                        # for that year, so ignore it. 
-                        if len(standings):
-                            print_row(
-                                columns,
-                                [
-                                    year,
-                                    self._get_driver_info(driver_data, standings[0].driverId)
-                                ],
-                                False
-                            )
+                    # Final race of every year, latest year first
+                    season_finals = race_data.get_season_finals()
+                    final_races = [(year, season_finals[year]) for year in sorted(season_finals.keys(), reverse = True)]
 
+                    # Standings after every final race in one go, keep the leader
+                    champions = {}
+                    for standing in semi_join(driver_standing_data, 'raceId', [race_id for _, race_id in final_races]):
+                        if str(standing.position) == '1':
+                            champions.setdefault(str(standing.raceId), standing.driverId)
+
+                    driver_data.get_drivers(champions.values())
+                    return CommandResult(
+                        [TabularResult(["Year" ,"Driver Name"], self._champion_rows(driver_data, final_races, champions), [8,30])],
+                        search_header)
 
         except Exception as ex:
             print(str(ex))
             raise ex
 
+    def _standing_rows(self, driver_data, standings):
+        rows = []
+        position = 1
+        for standing in standings:
+            rows.append([position, standing.points, self._get_driver_info(driver_data, standing.driverId)])
+            position += 1
+        return rows
+
+    def _champion_rows(self, driver_data, final_races, champions):
+        rows = []
+        for year, race_id in final_races:
+            # Seems to have some, but not all, 2018 data so we will get no standings 
+            # for that year, so ignore it. 
+            if race_id in champions:
+                rows.append([year, self._get_driver_info(driver_data, champions[race_id])])
+        return rows
+
     def _get_driver_info(self, driver_data, driver_id):
-        driver = driver_data.get_by_driver_id(driver_id)
-        return "%s, %s" % (driver[0].surname, driver[0].forename)
\ No newline at end of file
+        driver = driver_data.get_driver(driver_id)
+        return "%s, %s" % (driver.surname, driver.forename)
\ No newline at end of file
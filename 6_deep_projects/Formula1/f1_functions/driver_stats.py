@@ -19,6 +19,7 @@
 '''
 
 from multi_command_utils.interface import IFunction, argument_definition
+from multi_command_utils.tabular_result import CommandResult, TabularResult
 from Formula1.f1_functions.constants import F1DataConstants
 
 class DriverStats(IFunction):
@@ -52,83 +53,81 @@ class DriverStats(IFunction):
 
                 if len(driver_info):
                     driver_info = driver_info[0]
-                    self._get_stats(driver_info)
+                    return self._get_stats(driver_info)
                 else:
-                    print("No driver info could be found for supplied information.")
+                    return CommandResult(messages=["No driver info could be found for supplied information."])
 
         except Exception as ex:
             print(str(ex))
+            raise ex
 
     def _get_stats(self, driver):
-        print("{} : {}, {}".format(driver.driverId, driver.surname, driver.forename))
-
         results_file = self.datasets[F1DataConstants.RESULTS_DATA]
         constructor_file = self.datasets[F1DataConstants.CONSTRUCTOR_DATA]
         status_file = self.datasets[F1DataConstants.STATUS_DATA]
         races_file = self.datasets[F1DataConstants.RACE_DATA]
+        career_data = self.datasets[F1DataConstants.CAREER_DATA]
 
         # Get driver race results    
         driver_results = results_file.get_by_driver_id(driver.driverId)
 
-        # Some total statistics
-        total_grands_prixs = len(driver_results)
-        pole_positions = 0
-        front_row_starts = 0
-        podium_finishes = 0
-        dnf_total = 0
+        # Career totals are worked out ahead of time
+        career = career_data.driver(driver.driverId)
         teams = []
-        race_results_by_year = {}
+        race_results = []
 
-        for result in driver_results:
+        # Constructor, status and race of every result in one go
+        joined_results = results_file.join(driver_results, races_file, constructor_file, status_file)
 
-            dnf_total += 1 if result.is_dnf() else 0
-            podium_finishes += 1 if result.is_podium() else 0
-            front_row_starts += 1 if result.is_front_row_start() else 0
-            pole_positions += 1 if result.is_pole_position() else 0
+        for joined in joined_results:
+            result = joined.result
 
-            # Get constructor
-            constructor = constructor_file.get_by_id(result.constructorId)
-            assert(len(constructor) == 1)
-            constructor = constructor[0]
+            constructor = joined.constructor
+            assert(constructor is not None)
             # Get teams raced for
             if constructor.name not in teams:
                 teams.append(constructor.name)
 
-            # Find the status
-            current_status = status_file.get_by_status_id(result.statusId)
-            assert(len(current_status) == 1)
-            current_status = current_status[0]
-
-            # Now find the race 
-            current_race = races_file.get_by_race_id(result.raceId)
-            assert(len(current_race) == 1)
-            current_race = current_race[0]
+            current_status = joined.status
+            assert(current_status is not None)
 
-            # Put it in the collection 
-            if current_race.year not in race_results_by_year.keys():
-                race_results_by_year[current_race.year] = {}
+            current_race = joined.race
+            assert(current_race is not None)
 
-            race_results_by_year[current_race.year][current_race.round] = "%15s %4s %6s %s %s" % (
+            race_results.append([
+                current_race.year,
+                current_race.round,
                 constructor.name,
                 result.grid,
                 result.position if not result.is_dnf() else "DNF",
-                current_status.status.center(20),
+                current_status.status,
                 current_race.name
-            )
-
-        # Now dump out all the information we have collected
-        years_keys = list(race_results_by_year.keys())
-        print("   Years In F1 :", len(race_results_by_year.keys()),"({} - {})".format(years_keys[-1], years_keys[0]))
-        print("   Teams       :", len(teams),"-", ','.join(teams))
-        print("   Grands Prix :", total_grands_prixs)
-        print("   Front Rows  : {} of which {} are pole position".format(front_row_starts,pole_positions))    
-        print("   Podiums     :", podium_finishes)
-        print("   DNF Total   :", dnf_total)
-        input("\nPress enter to see race results")
-        print("\n   RESULTS:")
-        print("     YEAR ROUND %15s GRID FINISH %s NAME" %('CONSTRUCTOR', 'STATUS'.center(20)))
-        years = list(race_results_by_year.keys())
-        years.sort()
-        for year in years:
-            for race_round in race_results_by_year[year]:
-                print("     %s %5s %s" % (year, race_round, race_results_by_year[year][race_round]))
+            ])
+
+        # Results in file order within a year
+        race_results.sort(key=lambda race_result : race_result[0])
+        years = sorted(set(race_result[0] for race_result in race_results))
+
+        summary = TabularResult(
+            ["Years In F1", "First", "Last", "Grands Prix", "Front Rows", "Poles", "Podiums", "DNF Total"],
+            [[
+                len(years),
+                years[0] if years else None,
+                years[-1] if years else None,
+                career.races,
+                career.front_rows,
+                career.poles,
+                career.podiums,
+                career.dnfs
+            ]],
+            title = "Teams : {} - {}".format(len(teams), ','.join(teams)))
+
+        results = TabularResult(
+            ["Year", "Round", "Constructor", "Grid", "Finish", "Status", "Race"],
+            race_results,
+            [6,7,17,6,8,22,30],
+            ["", "RESULTS:"])
+
+        return CommandResult(
+            [summary, results],
+            "{} : {}, {}".format(driver.driverId, driver.surname, driver.forename))
@@ -17,9 +17,10 @@
         -r
 '''
 from multi_command_utils.data_file import column_data
+from multi_command_utils.data_join import semi_join
 from multi_command_utils.interface import IFunction, argument_definition
+from multi_command_utils.tabular_result import CommandResult, TabularResult
 from Formula1.f1_functions.constants import F1DataConstants
-from Formula1.f1_functions.banner import print_banner, print_row
 
 class ListRaces(IFunction):
     def __init__(self, datasets):
@@ -61,16 +62,19 @@ class ListRaces(IFunction):
                 for race in races:
                     full_results[race.raceId] = {}
                     full_results[race.raceId]['race'] = race
-                    full_results[race.raceId]['result'] = results_file.get_by_race_id(race.raceId)
+                    full_results[race.raceId]['result'] = []
+
+                # Results of every race in one go
+                for result in semi_join(results_file, 'raceId', full_results.keys()):
+                    full_results[result.raceId]['result'].append(result)
 
                 # Regardless of result, we are going to have the same header
                 header = ["Race ID","Round","Date","Race","Winner"]
                 columns = [9,7,12,28,30]
-                print_banner(columns,header)
 
                 # Now what specifics do we want?
                 if len(full_results) == 1:
-                    # Only one race so we print out the same header followed
+                    # Only one race so we return the same table followed
                     # by the individual results. 
                     for race_id in full_results:
                         race = full_results[race_id]['race']
@@ -78,50 +82,51 @@ class ListRaces(IFunction):
 
                         winner = [x for x in results if x.position == '1']
                         winner_name = self._get_driver_name(driver_data,winner[0].driverId)
-                        
-                        self._output_race(columns, race, winner_name)
-
-                        # Now we dump all of them.
-                        print("")
-                        header = ["Position", "Driver Name"]
-                        columns = [10,30]
-                        print_banner(columns,header)
-                        for result in results:
-                            position = result.position if len(result.position.strip()) > 0 else "DNF"
-                            driver_name = self._get_driver_name(driver_data,result.driverId)
-                            print_row(columns,[position,driver_name],False)
+
+                        # Names looked up in one go
+                        driver_data.get_drivers([result.driverId for result in results])
+                        return CommandResult([
+                            TabularResult(header, [self._race_row(race, winner_name)], columns),
+                            TabularResult(["Position", "Driver Name"], self._result_rows(driver_data, results), [10,30], "")
+                            ])
 
                 else:
                     # Sort the races by race ids as they are in order
                     race_id_list = list(full_results.keys())
                     race_id_list.sort()
-
-                    for race_id in race_id_list:
-                        race = full_results[race_id]['race']
-                        results = full_results[race_id]['result']
-
-                        winner = [x for x in results if x.position == '1']
-                        winner_name = self._get_driver_name(driver_data,winner[0].driverId)
-                        
-                        self._output_race(columns, race, winner_name)
+                    return CommandResult([TabularResult(header, self._race_rows(driver_data, full_results, race_id_list), columns)])
 
         except Exception as ex:
             print(str(ex))
             raise ex
 
     def _get_driver_name(self, driver_data, driver_id):
-        driver = driver_data.get_by_driver_id(driver_id)
-        return "{} {}".format(driver[0].forename, driver[0].surname )
-
-    def _output_race(self,columns, race, winners_name):
-        print_row(
-            columns,
-            [
-                race.raceId, 
-                race.round, 
-                race.date, 
-                race.name, 
-                winners_name 
-            ],
-            False
-        )
+        driver = driver_data.get_driver(driver_id)
+        return "{} {}".format(driver.forename, driver.surname )
+
+    def _race_rows(self, driver_data, full_results, race_id_list):
+        rows = []
+        for race_id in race_id_list:
+            race = full_results[race_id]['race']
+            results = full_results[race_id]['result']
+
+            winner = [x for x in results if x.position == '1']
+            winner_name = self._get_driver_name(driver_data,winner[0].driverId)
+            rows.append(self._race_row(race, winner_name))
+        return rows
+
+    def _result_rows(self, driver_data, results):
+        rows = []
+        for result in results:
+            position = result.position if len(result.position.strip()) > 0 else "DNF"
+            rows.append([position, self._get_driver_name(driver_data,result.driverId)])
+        return rows
+
+    def _race_row(self, race, winners_name):
+        return [
+            race.raceId, 
+            race.round, 
+            race.date, 
+            race.name, 
+            winners_name 
+        ]
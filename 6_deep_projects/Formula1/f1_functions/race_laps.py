@@ -0,0 +1,105 @@
+'''
+    Race Laps:
+
+    Lap times of a race. Every lap of a race is in one partition of the
+    lap times file (the rows of its raceId) so only those rows are read.
+
+    1. -r : Race id (required)
+    2. -d : Driver id, list every lap of that driver. Without it each 
+            driver's laps are summarized (laps, fastest lap, average).
+'''
+from multi_command_utils.interface import IFunction, argument_definition
+from multi_command_utils.tabular_result import CommandResult, TabularResult
+from Formula1.f1_functions.constants import F1DataConstants
+
+class RaceLaps(IFunction):
+    def __init__(self, datasets):
+        super().__init__(
+            datasets,
+            # Define the arguments you will accept, -h is a default for all.
+            [
+            argument_definition('-r',True, 'Race id'),
+            argument_definition('-d',False, 'Laps of a specific driver id')
+            ])
+
+    def execute(self, args):
+        try:
+            # This call validates inputs. If a required arg isn't there 
+            # or an additional, unexpected, arg is present it will except.
+            execute_args = super()._parse_execute_arguments(args)
+
+            if IFunction.GLOBAL_HELP in execute_args.keys():
+                # Regardless of anything else, if help is there, show it and quit
+                self.get_help(1)
+            else:
+                driver_data = self.datasets[F1DataConstants.DRIVER_DATA]
+                race_data = self.datasets[F1DataConstants.RACE_DATA]
+                lap_times_data = self.datasets[F1DataConstants.LAP_TIMES_DATA]
+
+                races = race_data.get_by_race_id(execute_args['-r'])
+                if not len(races):
+                    raise Exception("No race found with id {}".format(execute_args['-r']))
+                race = races[0]
+
+                laps = lap_times_data.get_by_race_id(race.raceId, execute_args.get('-d'))
+                title = "{} {} (Race ID {})".format(race.year, race.name, race.raceId)
+                if not len(laps) and '-d' in execute_args.keys():
+                    return CommandResult(messages=[title, "No lap times for driver {} in this race".format(execute_args['-d'])])
+                elif not len(laps):
+                    return CommandResult(messages=[title, "No lap times for this race"])
+                elif '-d' in execute_args.keys():
+                    return CommandResult([self._driver_laps(driver_data, laps)], title)
+                else:
+                    return CommandResult([self._summary(driver_data, laps)], title)
+
+        except Exception as ex:
+            print(str(ex))
+            raise ex
+
+    def _driver_laps(self, driver_data, laps):
+        return TabularResult(
+            ["Lap", "Position", "Time", "Milliseconds"],
+            [[lap.lap, lap.position, lap.time, lap.milliseconds] for lap in laps],
+            [6,10,12,14],
+            "Driver : {}".format(self._get_driver_name(driver_data, laps[0].driverId)))
+
+    def _summary(self, driver_data, laps):
+        # Straight from the typed columns, no record per lap
+        summary = {}
+        for driver_id, lap, milliseconds in zip(laps.column('driverId'), laps.column('lap'), laps.column('milliseconds')):
+            # [laps completed, fastest lap, fastest lap time]
+            totals = summary.setdefault(driver_id, [0, None, None])
+            totals[0] = max(totals[0], lap)
+            if milliseconds is not None and (totals[2] is None or milliseconds < totals[2]):
+                totals[1] = lap
+                totals[2] = milliseconds
+
+        # Most laps first, then fastest
+        drivers = sorted(summary.items(), key=lambda item : (-item[1][0], item[1][2] or 0))
+        driver_data.get_drivers([driver_id for driver_id, _ in drivers])
+        return TabularResult(
+            ["Driver Name", "Laps", "Fastest Lap", "Fastest Time"],
+            self._summary_rows(driver_data, drivers),
+            [30,6,13,14])
+
+    def _summary_rows(self, driver_data, drivers):
+        rows = []
+        for driver_id, totals in drivers:
+            rows.append([
+                self._get_driver_name(driver_data, driver_id),
+                totals[0],
+                totals[1],
+                RaceLaps._format_time(totals[2])
+            ])
+        return rows
+
+    def _get_driver_name(self, driver_data, driver_id):
+        driver = driver_data.get_driver(driver_id)
+        return "{} {}".format(driver.forename, driver.surname) if driver else str(driver_id)
+
+    @staticmethod
+    def _format_time(milliseconds):
+        if milliseconds is None:
+            return ''
+        minutes, milliseconds = divmod(milliseconds, 60000)
+        return "{}:{:06.3f}".format(minutes, milliseconds / 1000)
@@ -0,0 +1,80 @@
+'''
+    Race Pit Stops:
+
+    Pit stops of a race, read from the partition of the pit stops file
+    that holds the rows of the race.
+
+    1. -r : Race id (required)
+    2. -d : Only the stops of a specific driver id
+'''
+from multi_command_utils.interface import IFunction, argument_definition
+from multi_command_utils.tabular_result import CommandResult, TabularResult
+from Formula1.f1_functions.constants import F1DataConstants
+
+class RacePitStops(IFunction):
+    def __init__(self, datasets):
+        super().__init__(
+            datasets,
+            # Define the arguments you will accept, -h is a default for all.
+            [
+            argument_definition('-r',True, 'Race id'),
+            argument_definition('-d',False, 'Stops of a specific driver id')
+            ])
+
+    def execute(self, args):
+        try:
+            # This call validates inputs. If a required arg isn't there 
+            # or an additional, unexpected, arg is present it will except.
+            execute_args = super()._parse_execute_arguments(args)
+
+            if IFunction.GLOBAL_HELP in execute_args.keys():
+                # Regardless of anything else, if help is there, show it and quit
+                self.get_help(1)
+            else:
+                driver_data = self.datasets[F1DataConstants.DRIVER_DATA]
+                race_data = self.datasets[F1DataConstants.RACE_DATA]
+                pit_stop_data = self.datasets[F1DataConstants.PIT_STOP_DATA]
+
+                races = race_data.get_by_race_id(execute_args['-r'])
+                if not len(races):
+                    raise Exception("No race found with id {}".format(execute_args['-r']))
+                race = races[0]
+
+                stops = pit_stop_data.get_by_race_id(race.raceId, execute_args.get('-d'))
+                title = "{} {} (Race ID {})".format(race.year, race.name, race.raceId)
+                if not len(stops) and '-d' in execute_args.keys():
+                    return CommandResult(messages=[title, "No pit stops for driver {} in this race".format(execute_args['-d'])])
+                elif not len(stops):
+                    return CommandResult(messages=[title, "No pit stops for this race"])
+
+                # Stops in the order they happened
+                stops = sorted(stops, key=lambda stop : (stop.lap, stop.stop))
+                driver_data.get_drivers([stop.driverId for stop in stops])
+                return CommandResult(
+                    [
+                        TabularResult(
+                            ["Lap", "Stop", "Driver Name", "Time", "Duration"],
+                            self._stop_rows(driver_data, stops),
+                            [6,6,30,10,10])
+                    ],
+                    title)
+
+        except Exception as ex:
+            print(str(ex))
+            raise ex
+
+    def _stop_rows(self, driver_data, stops):
+        rows = []
+        for stop in stops:
+            rows.append([
+                stop.lap,
+                stop.stop,
+                self._get_driver_name(driver_data, stop.driverId),
+                stop.time,
+                stop.duration
+            ])
+        return rows
+
+    def _get_driver_name(self, driver_data, driver_id):
+        driver = driver_data.get_driver(driver_id)
+        return "{} {}".format(driver.forename, driver.surname) if driver else str(driver_id)
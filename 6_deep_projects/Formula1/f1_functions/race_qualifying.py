@@ -0,0 +1,79 @@
+'''
+    Race Qualifying:
+
+    Qualifying results of a race, read from the partition of the
+    qualifying file that holds the rows of the race.
+
+    1. -r : Race id (required)
+'''
+from multi_command_utils.interface import IFunction, argument_definition
+from multi_command_utils.tabular_result import CommandResult, TabularResult
+from Formula1.f1_functions.constants import F1DataConstants
+
+class RaceQualifying(IFunction):
+    def __init__(self, datasets):
+        super().__init__(
+            datasets,
+            # Define the arguments you will accept, -h is a default for all.
+            [
+            argument_definition('-r',True, 'Race id')
+            ])
+
+    def execute(self, args):
+        try:
+            # This call validates inputs. If a required arg isn't there
+            # or an additional, unexpected, arg is present it will except.
+            execute_args = super()._parse_execute_arguments(args)
+
+            if IFunction.GLOBAL_HELP in execute_args.keys():
+                # Regardless of anything else, if help is there, show it and quit
+                self.get_help(1)
+            else:
+                driver_data = self.datasets[F1DataConstants.DRIVER_DATA]
+                constructor_data = self.datasets[F1DataConstants.CONSTRUCTOR_DATA]
+                race_data = self.datasets[F1DataConstants.RACE_DATA]
+                qualifying_data = self.datasets[F1DataConstants.QUALIFYING_DATA]
+
+                races = race_data.get_by_race_id(execute_args['-r'])
+                if not len(races):
+                    raise Exception("No race found with id {}".format(execute_args['-r']))
+                race = races[0]
+
+                qualifying = qualifying_data.get_by_race_id(race.raceId)
+                title = "{} {} (Race ID {})".format(race.year, race.name, race.raceId)
+                if not len(qualifying):
+                    return CommandResult(messages=[title, "No qualifying results for this race"])
+
+                # Grid order, anyone without a position last
+                qualifying = sorted(qualifying, key=lambda result : (result.position is None, result.position or 0))
+                driver_data.get_drivers([result.driverId for result in qualifying])
+                return CommandResult(
+                    [
+                        TabularResult(
+                            ["Position", "Driver Name", "Constructor", "Q1", "Q2", "Q3"],
+                            self._qualifying_rows(driver_data, constructor_data, qualifying),
+                            [10,30,17,10,10,10])
+                    ],
+                    title)
+
+        except Exception as ex:
+            print(str(ex))
+            raise ex
+
+    def _qualifying_rows(self, driver_data, constructor_data, qualifying):
+        rows = []
+        for result in qualifying:
+            constructor = constructor_data.get_constructor(result.constructorId)
+            rows.append([
+                result.position,
+                self._get_driver_name(driver_data, result.driverId),
+                constructor.name if constructor else str(result.constructorId),
+                result.q1,
+                result.q2,
+                result.q3
+            ])
+        return rows
+
+    def _get_driver_name(self, driver_data, driver_id):
+        driver = driver_data.get_driver(driver_id)
+        return "{} {}".format(driver.forename, driver.surname) if driver else str(driver_id)
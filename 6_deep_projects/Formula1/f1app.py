@@ -26,7 +26,11 @@ sys.path.insert(0,currentdir)
 
 # General Utilties
 from multi_command_utils.multi_command_application import MultiCommandApp
+from multi_command_utils.command_server import CommandServer
+from multi_command_utils.renderers import RENDERERS
 from multi_command_utils.interface_dummy import DummyFunction
+from multi_command_utils.dataset_registry import DatasetRegistry
+from multi_command_utils.result_cache import ResultCache, RESULT_CACHE_DIRECTORY
 
 # Formula 1 Data Readers
 from Formula1.f1_data_readers.Driver import *
@@ -36,6 +40,10 @@ from Formula1.f1_data_readers.Results import *
 from Formula1.f1_data_readers.Status import *
 from Formula1.f1_data_readers.Constructor import *
 from Formula1.f1_data_readers.ConstructorStandings import *
+from Formula1.f1_data_readers.Aggregates import *
+from Formula1.f1_data_readers.LapTimes import *
+from Formula1.f1_data_readers.PitStops import *
+from Formula1.f1_data_readers.Qualifying import *
 
 # Formula One Functions
 from Formula1.f1_functions.constants import F1DataConstants
@@ -44,6 +52,9 @@ from Formula1.f1_functions.driver_standings import DriverStandings
 from Formula1.f1_functions.driver_search import DriverSearch
 from Formula1.f1_functions.list_races import ListRaces
 from Formula1.f1_functions.constructor_standings import ConstructorStandings
+from Formula1.f1_functions.race_laps import RaceLaps
+from Formula1.f1_functions.race_pitstops import RacePitStops
+from Formula1.f1_functions.race_qualifying import RaceQualifying
 
 '''
     The IFunction base class expects a data set dictionary. Each
@@ -52,16 +63,35 @@ from Formula1.f1_functions.constructor_standings import ConstructorStandings
 
     Dictionary is built using F1DataConstants as keys so that 
     the keys remain constant across the F1Functions.
+
+    The DatasetRegistry acts like that dictionary but a data file is
+    only loaded the first time a function uses it, so a command never
+    pays for files it doesn't read. Run with --preload to load every
+    file in the background, in parallel, as soon as the app starts.
 '''
-f1_datasets = {
-    F1DataConstants.DRIVER_DATA : DriverDataFile() ,
-    F1DataConstants.DRIVER_STANDING_DATA : DriverStandingFile(),
-    F1DataConstants.RACE_DATA : RacesDataFile(),
-    F1DataConstants.RESULTS_DATA : ResultsDataFile(),
-    F1DataConstants.STATUS_DATA : StatusDataFile(),
-    F1DataConstants.CONSTRUCTOR_DATA : ConstructorsDataFile(),
-    F1DataConstants.CONSTRUCTOR_STANDINGS_DATA : ConstructorStandingsDataFile()
-}
+f1_datasets = DatasetRegistry()
+f1_datasets.register(F1DataConstants.DRIVER_DATA, DriverDataFile)
+f1_datasets.register(F1DataConstants.DRIVER_STANDING_DATA, DriverStandingFile)
+f1_datasets.register(F1DataConstants.RACE_DATA, RacesDataFile)
+f1_datasets.register(F1DataConstants.RESULTS_DATA, ResultsDataFile)
+f1_datasets.register(F1DataConstants.STATUS_DATA, StatusDataFile)
+f1_datasets.register(F1DataConstants.CONSTRUCTOR_DATA, ConstructorsDataFile)
+f1_datasets.register(F1DataConstants.CONSTRUCTOR_STANDINGS_DATA, ConstructorStandingsDataFile)
+# Worked out from the results and races already registered
+f1_datasets.register(
+    F1DataConstants.CAREER_DATA,
+    CareerAggregates,
+    uses={'results_file' : F1DataConstants.RESULTS_DATA, 'races_file' : F1DataConstants.RACE_DATA})
+f1_datasets.register(F1DataConstants.LAP_TIMES_DATA, LapTimesDataFile)
+f1_datasets.register(F1DataConstants.PIT_STOP_DATA, PitStopsDataFile)
+f1_datasets.register(F1DataConstants.QUALIFYING_DATA, QualifyingDataFile)
+
+'''
+    Output of every command is saved (data/.result_cache) and replayed
+    when the same command is run again, until one of the data files it
+    used changes. Run with --no-cache to always work it out.
+'''
+f1_results = ResultCache(os.path.join(results_data_directory, RESULT_CACHE_DIRECTORY))
 
 '''
     The applicaiton menu is built using a dictionary with string keys
@@ -71,20 +101,79 @@ f1_datasets = {
 app_functions = {
     "get" : {
         "driver" : {
-            "stats" : DriverStats(f1_datasets),
-            "standings" : DriverStandings(f1_datasets)
+            "stats" : f1_results.wrap(DriverStats(f1_datasets.for_command('get driver stats'))),
+            "standings" : f1_results.wrap(DriverStandings(f1_datasets.for_command('get driver standings')))
 
         },
         "constructor" : {
-            "standings" : ConstructorStandings(f1_datasets)
+            "standings" : f1_results.wrap(ConstructorStandings(f1_datasets.for_command('get constructor standings')))
+        },
+        "race" : {
+            "laps" : f1_results.wrap(RaceLaps(f1_datasets.for_command('get race laps'))),
+            "pitstops" : f1_results.wrap(RacePitStops(f1_datasets.for_command('get race pitstops'))),
+            "qualifying" : f1_results.wrap(RaceQualifying(f1_datasets.for_command('get race qualifying')))
         }
     },
     "list" : {
-        "drivers" : DriverSearch(f1_datasets),
-        "races" : ListRaces(f1_datasets)
+        "drivers" : f1_results.wrap(DriverSearch(f1_datasets.for_command('list drivers'))),
+        "races" : f1_results.wrap(ListRaces(f1_datasets.for_command('list races')))
     }
 }
 
 
-app = MultiCommandApp("F1", app_functions)
-app.run()
\ No newline at end of file
+def _option_value(option, default):
+    '''
+        Value following option on the command line.
+    '''
+    if option not in sys.argv:
+        return default
+    position = sys.argv.index(option) + 1
+    if position < len(sys.argv) and not sys.argv[position].startswith('--'):
+        return sys.argv[position]
+    return default
+
+
+if __name__ == '__main__':
+    # --format text|csv|json, how results are written
+    output_format = _option_value('--format', 'text')
+    if output_format not in RENDERERS:
+        print("Unknown format {}, use one of {}".format(output_format, ', '.join(RENDERERS)))
+        sys.exit(1)
+
+    # Worker processes import this file too, only the app loads and runs
+    if '--preload' in sys.argv:
+        f1_datasets.preload()
+    if '--no-cache' in sys.argv:
+        f1_results.enabled = False
+
+    app = MultiCommandApp("F1", app_functions, RENDERERS[output_format]())
+    try:
+        if '--batch' in sys.argv:
+            # --batch script.txt, or --batch - to read the commands from
+            # stdin. --workers N runs N commands at a time.
+            script = _option_value('--batch', '-')
+            workers = int(_option_value('--workers', 1))
+            # Commands are only echoed between text results
+            echo = output_format == 'text'
+            if script == '-':
+                failed = app.run_batch(sys.stdin, workers, echo)
+            else:
+                with open(script, 'r') as script_file:
+                    failed = app.run_batch(script_file, workers, echo)
+            if failed:
+                print("{} command(s) failed".format(failed))
+                sys.exit(1)
+        elif '--serve' in sys.argv:
+            # --serve [port] answers the commands as JSON over HTTP, 
+            # --workers N runs N commands at a time
+            port = int(_option_value('--serve', CommandServer.DEFAULT_PORT))
+            workers = int(_option_value('--workers', 4))
+            CommandServer(app, port=port, workers=workers).serve_forever()
+        else:
+            app.run()
+    finally:
+        # --load-stats, how long each data file took to load
+        if '--load-stats' in sys.argv:
+            for description in f1_datasets.describe_loads():
+                print(description)
+        f1_datasets.shutdown()
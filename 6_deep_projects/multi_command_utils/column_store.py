@@ -0,0 +1,322 @@
+'''
+    Columnar, typed storage for a DataFile.
+
+    Instead of holding every row as a list of strings, each column is
+    held in a single container:
+
+        int     -> array('q')
+        float   -> array('d')
+        str     -> array('I') of codes into a list of distinct values
+                   (dictionary encoding)
+
+    Empty values are nulls and come back as None. Because the store also
+    behaves like a list of rows (len, indexing and iteration return row
+    lists) the DataFile search code works on it unchanged.
+'''
+from array import array
+
+COLUMN_TYPES = {
+    int : 'q',
+    float : 'd',
+    str : 'I'
+}
+
+
+class Column:
+    '''
+        A single typed column. Nulls are tracked in a bytearray so the
+        typed array never holds a placeholder that could be mistaken for
+        a real value.
+    '''
+    def __init__(self, column_type):
+        if column_type not in COLUMN_TYPES:
+            raise Exception("Unsupported column type {}".format(column_type))
+
+        self.column_type = column_type
+        self.values = array(COLUMN_TYPES[column_type])
+        self.nulls = bytearray()
+        self.has_nulls = False
+        # Dictionary encoding for str columns, codes is only needed to
+        # append so is rebuilt on demand for a column read from a cache
+        self.dictionary = []
+        self.codes = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, text):
+        if text == '':
+            self.values.append(0)
+            self.nulls.append(1)
+            self.has_nulls = True
+            return
+
+        if self.column_type is str:
+            if self.codes is None:
+                self.codes = {value : code for code, value in enumerate(self.dictionary)}
+            code = self.codes.get(text)
+            if code is None:
+                code = len(self.dictionary)
+                self.codes[text] = code
+                self.dictionary.append(text)
+            self.values.append(code)
+        else:
+            self.values.append(self.column_type(text))
+        self.nulls.append(0)
+
+    def extend(self, texts):
+        '''
+            Bulk append, numeric columns with no empty values are
+            converted in a single pass.
+        '''
+        if self.column_type is not str and '' not in texts:
+            self.values.extend(map(self.column_type, texts))
+            self.nulls.extend(bytes(len(texts)))
+        else:
+            for text in texts:
+                self.append(text)
+
+    def get(self, position):
+        if self.nulls[position]:
+            return None
+        if self.column_type is str:
+            return self.dictionary[self.values[position]]
+        return self.values[position]
+
+    def to_list(self):
+        '''
+            Decoded column values. Numeric columns without nulls are
+            returned as the typed array itself.
+        '''
+        if self.column_type is not str and not self.has_nulls:
+            return self.values
+        return [self.get(position) for position in range(len(self.values))]
+
+    def to_text(self):
+        '''
+            Column values as strings with nulls as empty strings, which
+            is how row storage holds them.
+        '''
+        if self.column_type is str:
+            dictionary = self.dictionary
+            texts = [dictionary[code] for code in self.values] if dictionary else [''] * len(self.values)
+        else:
+            texts = [str(value) for value in self.values]
+
+        if self.has_nulls:
+            for position, is_null in enumerate(self.nulls):
+                if is_null:
+                    texts[position] = ''
+        return texts
+
+    def coerce(self, value):
+        '''
+            Converts a search value to the column type, returns None
+            for a null and raises ValueError if it can never match.
+        '''
+        if value is None or str(value) == '':
+            return None
+        if self.column_type is str:
+            return str(value).casefold()
+        if self.column_type is int:
+            try:
+                return int(value)
+            except ValueError:
+                return float(value)
+        return float(value)
+
+    def key(self, position):
+        '''
+            Index key of a stored value, comparable with coerce().
+        '''
+        value = self.get(position)
+        if self.column_type is str and value is not None:
+            return value.casefold()
+        return value
+
+    def build_index(self):
+        '''
+            Maps key -> positions (file order). For str columns the
+            codes are grouped first so each distinct string is folded
+            only once.
+        '''
+        grouped = {}
+        for position, code in enumerate(self.values):
+            grouped.setdefault(None if self.nulls[position] else code, []).append(position)
+
+        if self.column_type is not str:
+            return grouped
+
+        index = {}
+        for code, positions in grouped.items():
+            key = None if code is None else self.dictionary[code].casefold()
+            if key in index:
+                # Two spellings of the same value, keep file order
+                index[key] = sorted(index[key] + positions)
+            else:
+                index[key] = positions
+        return index
+
+    def match(self, value, positions = None):
+        '''
+            Positions whose value equals value. For str columns this is a
+            compare of integer codes, not strings.
+        '''
+        try:
+            target = self.coerce(value)
+        except ValueError:
+            return []
+
+        nulls = self.nulls
+        if target is None:
+            if positions is None:
+                positions = range(len(self.values))
+            return [position for position in positions if nulls[position]]
+
+        values = self.values
+        if self.column_type is str:
+            wanted = set(
+                code
+                for code, text in enumerate(self.dictionary)
+                if text.casefold() == target
+                )
+        else:
+            wanted = set([target])
+
+        if not wanted:
+            return []
+        elif len(wanted) == 1:
+            # Common case, a single value (or string code) to compare
+            target = wanted.pop()
+            if positions is None:
+                found = [position for position, value in enumerate(values) if value == target]
+            else:
+                found = [position for position in positions if values[position] == target]
+        elif positions is None:
+            found = [position for position, value in enumerate(values) if value in wanted]
+        else:
+            found = [position for position in positions if values[position] in wanted]
+
+        # Nulls are stored as 0 in the typed array, drop any false hits
+        if self.has_nulls:
+            found = [position for position in found if not nulls[position]]
+        return found
+
+    def numbers(self, positions = None):
+        '''
+            Non null values of the column (at positions if provided) for
+            aggregation.
+        '''
+        values = self.values
+        nulls = self.nulls
+        if self.column_type is str:
+            raise Exception("Cannot aggregate a text column")
+
+        if positions is None:
+            if not self.has_nulls:
+                return values
+            positions = range(len(values))
+        elif isinstance(positions, range) and positions.step == 1 and not self.has_nulls:
+            # Rows next to each other (an index partition), slice them
+            return values[positions.start:positions.stop]
+        return [values[position] for position in positions if not nulls[position]]
+
+
+class ColumnStore:
+    '''
+        A set of typed columns that together make up the rows of a file.
+
+        schema :    Dictionary of column name -> int, float or str. Columns
+                    not in the schema are str. If no schema is given,
+                    every column type is inferred from its values.
+    '''
+    def __init__(self, header, schema = None):
+        self.header = header
+        self.schema = schema
+        self.columns = []
+        self._raw_columns = []
+        for column_name in header:
+            if schema is None:
+                self.columns.append(None)
+                self._raw_columns.append([])
+            else:
+                self.columns.append(Column(schema.get(column_name, str)))
+                self._raw_columns.append(None)
+        self.count = 0
+
+    def append(self, row_data):
+        if len(row_data) != len(self.header):
+            raise Exception("Row has {} fields, expected {}".format(len(row_data), len(self.header)))
+
+        for hdr_index, text in enumerate(row_data):
+            column = self.columns[hdr_index]
+            if column is None:
+                self._raw_columns[hdr_index].append(text)
+            else:
+                column.append(text)
+        self.count += 1
+
+    def finish(self):
+        '''
+            Called once every row is appended, types any inferred columns.
+        '''
+        for hdr_index, raw_values in enumerate(self._raw_columns):
+            if raw_values is None:
+                continue
+            column = Column(ColumnStore.infer_type(raw_values))
+            column.extend(raw_values)
+            self.columns[hdr_index] = column
+            self._raw_columns[hdr_index] = None
+        return self
+
+    @staticmethod
+    def infer_type(raw_values):
+        for column_type in (int, float):
+            try:
+                for text in raw_values:
+                    if text != '':
+                        column_type(text)
+                return column_type
+            except ValueError:
+                continue
+        return str
+
+    @classmethod
+    def from_columns(cls, header, columns, count):
+        '''
+            Rebuild a store from already typed columns (i.e. a cache).
+        '''
+        store = cls(header, {})
+        store.columns = columns
+        store.schema = {header[idx] : column.column_type for idx, column in enumerate(columns)}
+        store.count = count
+        return store
+
+    def to_rows(self):
+        '''
+            Rows as lists of strings, the DataFile row storage layout.
+        '''
+        return [list(row_data) for row_data in zip(*[column.to_text() for column in self.columns])]
+
+    def get_schema(self):
+        return {self.header[idx] : column.column_type for idx, column in enumerate(self.columns)}
+
+    # Row access, so the store can stand in for a list of rows
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.row(idx) for idx in range(*position.indices(self.count))]
+        if position < 0:
+            position += self.count
+        if position < 0 or position >= self.count:
+            raise IndexError("row index out of range")
+        return self.row(position)
+
+    def __iter__(self):
+        for position in range(self.count):
+            yield self.row(position)
+
+    def row(self, position):
+        return [column.get(position) for column in self.columns]
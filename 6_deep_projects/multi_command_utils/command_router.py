@@ -0,0 +1,135 @@
+'''
+    The application menu compiled into a routing tree.
+
+    MultiCommandApp used to walk the menu dictionaries for every command
+    and, on any mistake, walk the whole menu again to print the help.
+    CommandRouter walks the menu once, when the application starts, into
+    a tree of route nodes. Each node holds:
+
+        - A table of every name of its sub commands AND every prefix that
+          is unique among them, so a command can be shortened as long as
+          it stays unambiguous (g d st -i 102 is get driver stats -i 102).
+          Finding the next node is one dictionary lookup per word.
+        - Its help text, rendered the first time it is needed and kept.
+
+    EX:
+        router = CommandRouter(app_functions)
+        found = router.route("get driver stats -i 102".split(' '))
+        if found.action is not None:
+            found.action.execute(found.arguments)
+'''
+import collections
+from multi_command_utils.interface import IFunction
+from multi_command_utils.menuutils import MenuUtils
+
+# action :      IFunction or function to run, None if the command didn't 
+#               reach one
+# path :        Full names of the commands matched
+# arguments :   Words following the command, for an IFunction
+# node :        Node the route ended on
+# error :       None, or one of CommandRouter.INVALID, INCOMPLETE, AMBIGUOUS
+# word :        The word the route ended on
+route_match = collections.namedtuple("route_match", "action path arguments node error word")
+
+
+class RouteNode:
+    def __init__(self, path, menu):
+        self.path = path
+        self.menu = menu
+        self.children = collections.OrderedDict()
+        # Name or unique prefix -> child name, ambiguous prefix -> list
+        # of the names it could be
+        self.routes = {}
+        self._help_lines = None
+
+    def add_child(self, name, child):
+        self.children[name] = child
+
+    def compile_routes(self):
+        candidates = {}
+        for name in self.children:
+            for length in range(1, len(name) + 1):
+                candidates.setdefault(name[:length], []).append(name)
+
+        for prefix, names in candidates.items():
+            if prefix in self.children:
+                # A full name always wins over a longer name it starts
+                self.routes[prefix] = prefix
+            elif len(names) == 1:
+                self.routes[prefix] = names[0]
+            else:
+                self.routes[prefix] = names
+
+    def help_lines(self):
+        if self._help_lines is None:
+            self._help_lines = MenuUtils.menu_lines(self.menu)
+        return self._help_lines
+
+
+class CommandRouter:
+    INVALID = 'invalid'
+    INCOMPLETE = 'incomplete'
+    AMBIGUOUS = 'ambiguous'
+
+    def __init__(self, application_menu):
+        self.root = CommandRouter._compile([], application_menu)
+        self._header = "\n".join(MenuUtils.header_lines())
+
+    @staticmethod
+    def _compile(path, menu):
+        node = RouteNode(path, menu)
+        for name, action in menu.items():
+            if isinstance(action, dict):
+                node.add_child(name, CommandRouter._compile(path + [name], action))
+            elif isinstance(action, IFunction) or callable(action):
+                node.add_child(name, action)
+        node.compile_routes()
+        return node
+
+    def route(self, inputs):
+        '''
+            inputs :    The words of the command line.
+
+            Returns a route_match.
+        '''
+        node = self.root
+        word = None
+        for position, word in enumerate(inputs):
+            word = word.strip()
+            if len(word) == 0:
+                continue
+
+            name = node.routes.get(word)
+            if name is None:
+                return route_match(None, node.path, [], node, CommandRouter.INVALID, word)
+            if isinstance(name, list):
+                return route_match(None, node.path, [], node, CommandRouter.AMBIGUOUS, word)
+
+            child = node.children[name]
+            if isinstance(child, RouteNode):
+                node = child
+            else:
+                return route_match(child, node.path + [name], inputs[position + 1:], node, None, word)
+
+        return route_match(None, node.path, [], node, CommandRouter.INCOMPLETE, word)
+
+    def help_text(self, node = None, incomplete = None):
+        '''
+            Help for the commands under node (every command if None), 
+            incomplete is the word an incomplete command ended on.
+        '''
+        node = node or self.root
+        lines = [self._header]
+        if isinstance(incomplete, str):
+            lines.append(MenuUtils.incomplete_line(incomplete))
+        lines.extend(node.help_lines())
+        return "\n".join(lines)
+
+    def candidates(self, node, word):
+        '''
+            Names of node's commands that word could be short for.
+        '''
+        found = node.routes.get(word)
+        if isinstance(found, list):
+            return found
+        return [found] if found else []
@@ -0,0 +1,245 @@
+'''
+    Serves the commands of a MultiCommandApp over HTTP as JSON, so the
+    data loaded by one process can answer many clients (i.e. a dashboard).
+
+    Every IFunction in the menu is an endpoint, the words of the command
+    are the path and the arguments the query string (without the -):
+
+        GET /get/driver/stats?i=102
+        GET /list/races?y=2010
+        GET /list/drivers?q=nationality=Brazilian
+
+    A POST to the same path can send the arguments as a JSON object 
+    instead, {"i" : "102"}. GET / lists the endpoints. Paths can be
+    shortened like commands (see command_router).
+
+    The response is a JSON object :
+
+        command :   The full command that was run
+        arguments : The arguments passed to it
+        messages :  Lines of text from the command's result
+        tables :    The tables of the command's result (see 
+                    tabular_result), each as
+                    {"title" : [...], "columns" : [...], "rows" : [[...], ...]}
+        output :    Anything the command printed (i.e. help), as text
+        error :     null, or the message if the command failed (400)
+
+    Only the standard library is used. Connections are kept open
+    (HTTP/1.1 keep-alive) and requests are served concurrently, the
+    commands run in a pool of threads so they share the datasets the
+    application already has loaded.
+
+    EX:
+        CommandServer(app, port=8080).serve_forever()
+'''
+import json
+import asyncio
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from multi_command_utils import console
+from multi_command_utils.interface import IFunction
+from multi_command_utils.tabular_result import CommandResult
+from multi_command_utils.command_router import RouteNode
+
+STATUS_TEXT = {
+    200 : 'OK',
+    400 : 'Bad Request',
+    404 : 'Not Found',
+    405 : 'Method Not Allowed',
+    413 : 'Payload Too Large',
+    500 : 'Internal Server Error'
+}
+
+
+class CommandServer:
+    DEFAULT_HOST = '127.0.0.1'
+    DEFAULT_PORT = 8080
+    # Seconds an idle kept-alive connection stays open
+    KEEP_ALIVE = 30
+    MAX_HEADER_LINES = 100
+    MAX_BODY = 1024 * 1024
+
+    def __init__(self, app, host = DEFAULT_HOST, port = DEFAULT_PORT, workers = 4):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.endpoints = CommandServer._endpoints(app.router.root)
+        self._executor = None
+
+    def serve_forever(self):
+        try:
+            asyncio.run(self._serve())
+        except KeyboardInterrupt:
+            pass
+
+    async def _serve(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            server = await asyncio.start_server(self._connection, self.host, self.port)
+            print("Serving {} commands on http://{}:{}/".format(len(self.endpoints), self.host, self.port))
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(CommandServer._read_request(reader), CommandServer.KEEP_ALIVE)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+
+                if isinstance(request, int):
+                    # Not a request we can answer, close afterwards
+                    await self._respond(writer, request, {'error' : STATUS_TEXT[request]}, False)
+                    break
+
+                method, target, keep_alive, body = request
+                status, response = await self._handle(method, target, body)
+                await self._respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _read_request(reader):
+        '''
+            (method, target, keep alive, body), None when the client has
+            gone, or an error status.
+        '''
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        parts = request_line.decode('latin-1').split()
+        if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+            return 400
+        method, target, version = parts
+
+        headers = {}
+        for _ in range(CommandServer.MAX_HEADER_LINES):
+            line = await reader.readline()
+            if not line:
+                return None
+            line = line.decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            return 400
+
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.0':
+            keep_alive = connection == 'keep-alive'
+        else:
+            keep_alive = connection != 'close'
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            return 400
+        if length > CommandServer.MAX_BODY:
+            return 413
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target, keep_alive, body
+
+    async def _respond(self, writer, status, response, keep_alive):
+        body = json.dumps(response, default=str).encode('utf-8')
+        head = [
+            "HTTP/1.1 {} {}".format(status, STATUS_TEXT[status]),
+            "Content-Type: application/json",
+            "Content-Length: {}".format(len(body)),
+            "Connection: {}".format('keep-alive' if keep_alive else 'close'),
+            '',
+            ''
+        ]
+        writer.write("\r\n".join(head).encode('latin-1') + body)
+        await writer.drain()
+
+    async def _handle(self, method, target, body):
+        if method not in ('GET', 'POST'):
+            return 405, {'error' : STATUS_TEXT[405]}
+
+        url = urllib.parse.urlsplit(target)
+        words = [urllib.parse.unquote(word) for word in url.path.split('/') if word]
+        if not words:
+            return 200, {'endpoints' : self.endpoints}
+
+        found = self.app.router.route(words)
+        if found.error is not None or not isinstance(found.action, IFunction):
+            return 404, {'error' : "No command at {}".format(url.path)}
+
+        try:
+            arguments = dict(urllib.parse.parse_qsl(url.query, keep_blank_values=True))
+            if method == 'POST' and body:
+                posted = json.loads(body.decode('utf-8'))
+                if not isinstance(posted, dict):
+                    raise ValueError("Arguments must be a JSON object")
+                arguments.update({name : '' if value is None else str(value) for name, value in posted.items()})
+        except ValueError as ex:
+            return 400, {'error' : str(ex)}
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, 
+            CommandServer._run, 
+            found.action, 
+            ' '.join(found.path), 
+            arguments)
+
+    @staticmethod
+    def _run(function, command, arguments):
+        '''
+            Runs in a pool thread, the command's output is captured for
+            that thread only.
+        '''
+        args = []
+        for name, value in arguments.items():
+            args.append(name if name.startswith('-') else '-' + name)
+            args.extend(value.split(' ') if value else [])
+
+        error = None
+        result = None
+        with console.capture_output() as capture:
+            try:
+                result = function.execute(args)
+                if isinstance(result, CommandResult):
+                    result = result.to_dict()
+                else:
+                    result = None
+            except Exception as ex:
+                error = str(ex)
+
+        response = {
+            'command' : command,
+            'arguments' : arguments,
+            'messages' : result['messages'] if result else [],
+            'tables' : result['tables'] if result else [],
+            'output' : capture.getvalue(),
+            'error' : error
+        }
+        return (400 if error else 200), response
+
+    @staticmethod
+    def _endpoints(node):
+        '''
+            Path -> accepted arguments for every IFunction in the menu.
+        '''
+        endpoints = {}
+        for name, child in node.children.items():
+            if isinstance(child, RouteNode):
+                endpoints.update(CommandServer._endpoints(child))
+            elif isinstance(child, IFunction):
+                endpoints['/' + '/'.join(node.path + [name])] = [
+                    argument.arg.lstrip('-') for argument in child.arguments
+                    ]
+        return endpoints
@@ -0,0 +1,103 @@
+'''
+    Console output for commands that may not be running at a console.
+
+    capture_output() collects what the current thread prints. Each 
+    thread has its own captures, so commands run side by side (see 
+    MultiCommandApp.run_batch) never mix their output. While a capture
+    is active sys.stdout is replaced by a router that sends each write to
+    the captures of the thread writing it, or on to the real output.
+
+    EX:
+        with capture_output() as capture:
+            function.execute(args)
+        text = capture.getvalue()
+'''
+import io
+import sys
+import threading
+import contextlib
+
+_state = threading.local()
+_lock = threading.Lock()
+_router = None
+_active = 0
+
+
+class Capture:
+    '''
+        tee :       Also pass the output on (to an outer capture or the
+                    console) rather than only keeping it.
+    '''
+    def __init__(self, tee = False):
+        self.tee = tee
+        self.buffer = io.StringIO()
+
+    def getvalue(self):
+        return self.buffer.getvalue()
+
+
+class _OutputRouter:
+    def __init__(self, output):
+        self.output = output
+
+    def write(self, text):
+        captures = _receiving_captures()
+        for capture in captures:
+            capture.buffer.write(text)
+        if captures and not captures[-1].tee:
+            return len(text)
+        return self.output.write(text)
+
+    def flush(self):
+        if not _captures():
+            self.output.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.output, name)
+
+
+def _captures():
+    captures = getattr(_state, 'captures', None)
+    if captures is None:
+        captures = []
+        _state.captures = captures
+    return captures
+
+
+def _receiving_captures():
+    '''
+        Captures of this thread that get what it prints, innermost first.
+    '''
+    receiving = []
+    for capture in reversed(_captures()):
+        receiving.append(capture)
+        if not capture.tee:
+            break
+    return receiving
+
+
+@contextlib.contextmanager
+def capture_output(tee = False):
+    global _router, _active
+
+    with _lock:
+        if _active == 0:
+            _router = _OutputRouter(sys.stdout)
+            sys.stdout = _router
+        _active += 1
+
+    capture = Capture(tee)
+    captures = _captures()
+    captures.append(capture)
+    try:
+        yield capture
+    finally:
+        captures.remove(capture)
+        with _lock:
+            _active -= 1
+            if _active == 0:
+                # Only put the original back if nobody replaced us since
+                if sys.stdout is _router:
+                    sys.stdout = _router.output
+                _router = None
+
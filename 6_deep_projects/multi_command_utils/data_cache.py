@@ -0,0 +1,225 @@
+'''
+    Binary snapshot of a parsed CSV file.
+
+    Parsing text is the slow part of loading a DataFile. The first time a
+    file is loaded the parsed columns are written next to it (file name
+    plus CACHE_EXTENSION) and later loads read them straight back into
+    arrays, skipping the parse entirely.
+
+    Layout of a snapshot:
+
+        MAGIC           8 bytes
+        meta length     uint32 (little endian)
+        meta            JSON, the header, row count, source fingerprint and
+                        where each column section lives
+        padding         to an 8 byte boundary
+        sections        per column, the raw typed array, its null map and
+                        for text columns the dictionary ('\0' separated)
+
+    Sections are 8 byte aligned and hold the arrays exactly as they are in
+    memory, so each one is read back with a single copy (frombytes) and 
+    no parsing. A snapshot is only used if the CSV and the load settings
+    (signature) match what was recorded, otherwise the CSV is parsed and
+    the snapshot is rewritten. The CSV matches when its size and modified
+    time are unchanged; only when the size is the same but the modified
+    time moved (i.e. a checkout rewrote it) is the file hashed.
+'''
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import tempfile
+from array import array
+from multi_command_utils.column_store import Column, ColumnStore, COLUMN_TYPES
+
+CACHE_EXTENSION = '.dfcache'
+MAGIC = b'DFCACHE1'
+META_LENGTH = struct.Struct('<I')
+ALIGNMENT = 8
+HASH_BLOCK = 1024 * 1024
+
+TYPE_NAMES = {
+    int : 'int',
+    float : 'float',
+    str : 'str'
+}
+NAME_TYPES = {name : column_type for column_type, name in TYPE_NAMES.items()}
+
+
+def cache_path(file_path):
+    return file_path + CACHE_EXTENSION
+
+
+def source_fingerprint(file_path):
+    '''
+        Size, modified time and hash of a file.
+    '''
+    stat = os.stat(file_path)
+    file_hash = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as source:
+        block = source.read(HASH_BLOCK)
+        while block:
+            file_hash.update(block)
+            block = source.read(HASH_BLOCK)
+
+    return {
+        'size' : stat.st_size,
+        'mtime_ns' : stat.st_mtime_ns,
+        'hash' : file_hash.hexdigest()
+    }
+
+
+def source_matches(file_path, source):
+    '''
+        True if file_path still has the fingerprint source. 
+    '''
+    stat = os.stat(file_path)
+    if source['size'] != stat.st_size:
+        return False
+    if source['mtime_ns'] == stat.st_mtime_ns:
+        return True
+    # Touched but maybe not changed, only the hash can tell
+    return source['hash'] == source_fingerprint(file_path)['hash']
+
+
+def load_snapshot(file_path, signature):
+    '''
+        Returns the ColumnStore saved for file_path, or None if there is
+        no snapshot or it is out of date.
+    '''
+    snapshot_path = cache_path(file_path)
+    if not os.path.exists(snapshot_path):
+        return None
+
+    try:
+        with open(snapshot_path, 'rb') as snapshot:
+            with mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _read_snapshot(mapped, file_path, signature)
+    except (OSError, ValueError, KeyError, struct.error):
+        # A damaged or partial snapshot is just a cache miss
+        return None
+
+
+def save_snapshot(file_path, store, signature, fingerprint):
+    '''
+        Writes the snapshot for file_path. fingerprint must be taken
+        before the CSV was parsed so a file changed mid load is never
+        recorded as current. Returns False if it could not be written.
+    '''
+    snapshot_path = cache_path(file_path)
+    temp_path = None
+    try:
+        # A temp file of its own, parallel loads of the same file (i.e.
+        # preload workers) never write into the same file
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(snapshot_path)), suffix='.tmp')
+        with os.fdopen(handle, 'wb') as snapshot:
+            snapshot.write(snapshot_bytes(store, signature, fingerprint))
+        os.replace(temp_path, snapshot_path)
+    except OSError:
+        # Read only data directory, carry on without a cache
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    return True
+
+
+def snapshot_bytes(store, signature, fingerprint):
+    '''
+        The snapshot of a ColumnStore as a single bytes object, also used
+        to send a loaded file between processes. 
+    '''
+    sections = []
+    offset = 0
+    column_meta = []
+    for column in store.columns:
+        if column.column_type is str:
+            dictionary = '\0'.join(column.dictionary).encode('utf-8', errors='surrogateescape')
+        else:
+            dictionary = b''
+
+        entry = {
+            'type' : TYPE_NAMES[column.column_type],
+            'dictionary_size' : len(column.dictionary)
+        }
+        for name, data in (('values', column.values.tobytes()), ('nulls', bytes(column.nulls)), ('dictionary', dictionary)):
+            entry[name] = [offset, len(data)]
+            sections.append(data)
+            padding = -len(data) % ALIGNMENT
+            if padding:
+                sections.append(b'\0' * padding)
+            offset += len(data) + padding
+        column_meta.append(entry)
+
+    meta = json.dumps({
+        'signature' : signature,
+        'byteorder' : sys.byteorder,
+        'source' : fingerprint,
+        'header' : store.header,
+        'count' : store.count,
+        'columns' : column_meta
+    }).encode('utf-8')
+
+    return b''.join(
+        [MAGIC, META_LENGTH.pack(len(meta)), meta, b'\0' * _data_padding(len(meta))] + sections
+        )
+
+
+def store_from_bytes(buffer):
+    '''
+        ColumnStore from snapshot_bytes() output, no source checks.
+    '''
+    meta, data_start = _read_meta(buffer)
+    return _read_columns(buffer, meta, data_start)
+
+
+def _data_padding(meta_length):
+    return -(len(MAGIC) + META_LENGTH.size + meta_length) % ALIGNMENT
+
+
+def _read_meta(buffer):
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a DataFile snapshot")
+
+    meta_start = len(MAGIC) + META_LENGTH.size
+    meta_length = META_LENGTH.unpack(buffer[len(MAGIC):meta_start])[0]
+    meta = json.loads(buffer[meta_start:meta_start + meta_length].decode('utf-8'))
+    if meta['byteorder'] != sys.byteorder:
+        raise ValueError("Snapshot from a different byte order")
+    return meta, meta_start + meta_length + _data_padding(meta_length)
+
+
+def _read_snapshot(mapped, file_path, signature):
+    meta, data_start = _read_meta(mapped)
+    if meta['signature'] != signature:
+        return None
+
+    if not source_matches(file_path, meta['source']):
+        return None
+
+    return _read_columns(mapped, meta, data_start)
+
+
+def _read_columns(buffer, meta, data_start):
+    columns = []
+    for entry in meta['columns']:
+        column_type = NAME_TYPES[entry['type']]
+        column = Column(column_type)
+
+        start, length = entry['values']
+        column.values = array(COLUMN_TYPES[column_type])
+        column.values.frombytes(buffer[data_start + start:data_start + start + length])
+
+        start, length = entry['nulls']
+        column.nulls = bytearray(buffer[data_start + start:data_start + start + length])
+        column.has_nulls = 1 in column.nulls
+
+        start, length = entry['dictionary']
+        if entry['dictionary_size']:
+            text = buffer[data_start + start:data_start + start + length].decode('utf-8', errors='surrogateescape')
+            column.dictionary = text.split('\0')
+        column.codes = None
+        columns.append(column)
+
+    return ColumnStore.from_columns(meta['header'], columns, meta['count'])
@@ -3,10 +3,26 @@
 '''
 import csv
 import os
+import time
+import bisect
 import collections
+from multi_command_utils.column_store import ColumnStore
+from multi_command_utils.mapped_rows import MappedRows
+from multi_command_utils.result_set import ResultSet
+from multi_command_utils import data_cache
 
 column_data = collections.namedtuple("column", "id value")
 
+# A search other than equality, operator is one of the DataFile operators
+# i.e. column_compare('year', DataFile.BETWEEN, (2005, 2010))
+column_compare = collections.namedtuple("compare", "id operator value")
+
+# Sorted index of a column, keys in order with the row position of each
+sorted_index = collections.namedtuple("sorted_index", "keys positions numeric")
+
+# One step of a search plan, see DataFile.plan()
+plan_step = collections.namedtuple("plan_step", "column hdr_index method estimate positions")
+
 
 class DataFile:
     '''
@@ -15,13 +31,164 @@ class DataFile:
         All data files created are CSV, so this makes a perfect
         opportunity to use class derivation to have a base class
         perform the generic functionaity. 
+
+        Columns that are searched often can be declared as indexed. An
+        index is a dictionary keyed on the (case folded) column value
+        holding the positions of every row with that value, so an 
+        equality search becomes a dictionary lookup instead of a scan
+        over every row. 
+
+        indexed_columns :   List of column names to index. 
+        sorted_columns :    List of column names to keep a sorted index
+                            for, used by range and prefix searches. It
+                            is only built the first time such a search
+                            uses the column.
+        lazy_indexes :      If True, an index is built the first time a
+                            find() uses the column instead of at load.
+
+        Besides column_data (equality) a search can use column_compare 
+        with one of the operators <, <=, >, >=, BETWEEN (inclusive, value
+        is a pair), PREFIX or IN (value is a list). Comparisons are numeric
+        when the value is a number, otherwise case insensitive text. 
+
+        Very large files can be opened with streaming = True. Only the 
+        header is read up front and the rows are never held in memory, 
+        instead iter_rows() and iter_find() parse the file a chunk at a
+        time on every call. Indexes are not available in this mode. 
+
+        With storage = COLUMNAR_STORAGE the rows are kept in a typed
+        ColumnStore (see column_store.py) instead of lists of strings. 
+        schema is a dictionary of column name to int, float or str, if
+        not provided the types are inferred. Rows then come back with 
+        typed values (None for an empty value). 
+
+        storage = MAPPED_STORAGE memory maps the file instead (see 
+        mapped_rows.py). Only the offset of each line is held and rows are
+        decoded when they are returned from a search. The file stays 
+        mapped until close() is called. 
+
+        Files are parsed with the csv module so quoted values may hold
+        commas. dialect (a csv dialect name or class), encoding and 
+        null_marker (a value that means empty, i.e. \\N) default to the
+        DIALECT, ENCODING and NULL_MARKER class attributes, which a 
+        deriving class can override. Statistics on the last load are in
+        load_statistics, see describe_load(). 
+
+        With use_cache = True (or USE_CACHE set on a deriving class) the
+        parsed file is saved as a binary snapshot next to the CSV (see 
+        data_cache.py) and re-used by later loads for as long as the CSV
+        is unchanged. 
     '''
-    def __init__(self, directory, file_name):
+    USE_CACHE = False
+    DIALECT = 'excel'
+    ENCODING = 'ASCII'
+    ERRORS = 'surrogateescape'
+    NULL_MARKER = None
+    CHUNK_SIZE = 64 * 1024
+    ROW_STORAGE = 'rows'
+    COLUMNAR_STORAGE = 'columnar'
+    MAPPED_STORAGE = 'mapped'
+
+    EQUAL = '='
+    LESS = '<'
+    LESS_EQUAL = '<='
+    GREATER = '>'
+    GREATER_EQUAL = '>='
+    BETWEEN = 'between'
+    PREFIX = 'prefix'
+    IN = 'in'
+    RANGE_OPERATORS = (LESS, LESS_EQUAL, GREATER, GREATER_EQUAL, BETWEEN)
+    # Guesses of the share of rows kept when there is no index to count
+    RANGE_SELECTIVITY = 1 / 3
+    PREFIX_SELECTIVITY = 1 / 10
+
+    AGGREGATES = {
+        'count' : len,
+        'sum' : sum,
+        'min' : min,
+        'max' : max,
+        'mean' : lambda values : sum(values) / len(values)
+    }
+
+    def __init__(self, directory, file_name, indexed_columns = None, lazy_indexes = False, sorted_columns = None, streaming = False, storage = ROW_STORAGE, schema = None, use_cache = None, dialect = None, encoding = None, null_marker = None):
+        if storage not in (DataFile.ROW_STORAGE, DataFile.COLUMNAR_STORAGE, DataFile.MAPPED_STORAGE):
+            raise Exception("Unknown storage {}".format(storage))
+        if streaming and storage != DataFile.ROW_STORAGE:
+            raise Exception("Streaming files cannot use {} storage".format(storage))
+
         self.directory = directory
         self.file_name = file_name
         self.header = None
         self.data = []
+        self.indexes = {}
+        self.column_cardinality = {}
+        self.indexed_columns = list(indexed_columns) if indexed_columns else []
+        self.sorted_indexes = {}
+        self.sorted_columns = list(sorted_columns) if sorted_columns else []
+        self.streaming = streaming
+        self.storage = storage
+        self.schema = schema
+        self.use_cache = self.USE_CACHE if use_cache is None else use_cache
+        self.loaded_from_cache = False
+        self.dialect = dialect if dialect is not None else self.DIALECT
+        self.encoding = encoding if encoding is not None else self.ENCODING
+        self.null_marker = null_marker if null_marker is not None else self.NULL_MARKER
+        self.load_statistics = {}
         self._load_data()
+        try:
+            self.header_loaded()
+
+            if not lazy_indexes and not self.streaming:
+                for column_name in self.indexed_columns:
+                    self.create_index(column_name)
+        except Exception:
+            # Don't leave a mapped file open behind a failed load
+            self.close()
+            raise
+
+    def close(self):
+        '''
+            Releases the memory map of a MAPPED_STORAGE file, its rows and
+            indexes are no longer available. Does nothing for the other
+            storage modes. A DataFile can also be used as a context manager.
+        '''
+        if isinstance(self.data, MappedRows):
+            self.data.close()
+            self.data = []
+            self.indexes = {}
+            self.sorted_indexes = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def header_loaded(self):
+        '''
+            Called once the header is known, after the file is loaded or
+            when the DataFile is received from another process. Deriving
+            classes override this to work out their field positions. 
+            Keep them on the instance, not the class, so two files of the
+            same kind (i.e. different seasons) can be loaded side by side.
+        '''
+        pass
+
+    def make_record(self, row_data):
+        '''
+            Turns a row returned by find() into whatever the deriving
+            class wants to hand out (i.e. a record with named fields).
+            By default the row itself.
+        '''
+        return row_data
+
+    def get_source_paths(self):
+        '''
+            Files the data came from, anything built from this DataFile
+            (i.e. a cached command result) is out of date once one of
+            them changes.
+        '''
+        return [os.path.join(self.directory, self.file_name)]
 
     def get_headers(self):
         return self.header
@@ -40,7 +207,155 @@ class DataFile:
         if column_index not in range(len(self.header)):
             raise Exception("Invalid header index {}".format(column_index))
 
-        return [row_data[column_index] for row_data in self.data]
+        if self.storage == DataFile.COLUMNAR_STORAGE:
+            return self.data.columns[column_index].to_list()
+        if self.storage == DataFile.MAPPED_STORAGE:
+            return self.data.column(column_index)
+
+        return [row_data[column_index] for row_data in self.iter_rows()]
+
+    def get_column_values(self, column_name, positions):
+        '''
+            Values of a column for the rows at positions only.
+        '''
+        hdr_index = self.get_field_index(column_name)
+        return [value for _, value in self._cells(hdr_index, positions)]
+
+    def iter_rows(self):
+        '''
+            Generator over every data row. In streaming mode the rows 
+            are read from the file as they are consumed. 
+        '''
+        if not self.streaming:
+            yield from self.data
+        else:
+            rows = self._read_rows()
+            # First row is the header
+            next(rows, None)
+            yield from rows
+
+    def create_index(self, column_name):
+        '''
+            Build (or rebuild) the hash index for a column. 
+
+            The index maps the normalized column value to the list of 
+            row positions, in file order, that hold that value. Values
+            whose rows are all next to each other (a file sorted or
+            grouped by the column) get a range instead of a list, so the
+            index of a clustered column is one small partition per value
+            whatever the number of rows.
+        '''
+        if self.streaming:
+            raise Exception("Indexes are not supported on streaming file {}".format(self.file_name))
+
+        hdr_index = self.get_field_index(column_name)
+        if self.storage == DataFile.COLUMNAR_STORAGE:
+            index = self.data.columns[hdr_index].build_index()
+        elif self.storage == DataFile.MAPPED_STORAGE:
+            index = self.data.build_index(hdr_index)
+        else:
+            index = {}
+            for position, row_data in enumerate(self.data):
+                index.setdefault(DataFile._normalize(row_data[hdr_index]), []).append(position)
+
+        DataFile._compact_index(index)
+        self.indexes[column_name] = index
+        self.column_cardinality[column_name] = len(index)
+        if column_name not in self.indexed_columns:
+            self.indexed_columns.append(column_name)
+        return index
+
+    @staticmethod
+    def _compact_index(index):
+        for key, positions in index.items():
+            if len(positions) > 1 and positions[-1] - positions[0] + 1 == len(positions):
+                index[key] = range(positions[0], positions[-1] + 1)
+        return index
+
+    def get_index(self, column_name):
+        '''
+            Returns the index for a column, building it if it was declared
+            but not yet built. Returns None for columns that are not indexed.
+        '''
+        if self.streaming:
+            return None
+        if column_name in self.indexes:
+            return self.indexes[column_name]
+        if column_name in self.indexed_columns:
+            return self.create_index(column_name)
+        return None
+
+    def key_positions(self, column_name, value):
+        '''
+            Positions of the rows where column_name equals value, answered
+            from the column index which is built the first time if the
+            column isn't indexed. Used to join other files to this one.
+        '''
+        index = self.get_index(column_name)
+        if index is None:
+            index = self.create_index(column_name)
+        return self._index_lookup(index, self.get_field_index(column_name), value)
+
+    def key_positions_many(self, column_name, values):
+        '''
+            Dictionary of value -> positions, as key_positions(), for a 
+            list of values. The index and column are looked up once for
+            all of them.
+        '''
+        index = self.get_index(column_name)
+        if index is None:
+            index = self.create_index(column_name)
+        hdr_index = self.get_field_index(column_name)
+        return {value : self._index_lookup(index, hdr_index, value) for value in values}
+
+    def create_sorted_index(self, column_name):
+        '''
+            Build (or rebuild) the sorted index for a column. Keys are
+            numbers if every non empty value in the column is a number, 
+            otherwise case folded text. Empty values are left out. 
+        '''
+        if self.streaming:
+            raise Exception("Indexes are not supported on streaming file {}".format(self.file_name))
+
+        values = self.get_column_by_name(column_name)
+        keyed = []
+        numeric = True
+        for position, value in enumerate(values):
+            if value is None or value == '':
+                continue
+            number = DataFile._as_number(value)
+            if number is None:
+                numeric = False
+                break
+            keyed.append( (number, position) )
+
+        if not numeric:
+            keyed = [
+                (str(value).casefold(), position)
+                for
+                position, value in enumerate(values)
+                if value is not None and value != ''
+                ]
+
+        keyed.sort()
+        index = sorted_index([key for key, _ in keyed], [position for _, position in keyed], numeric)
+        self.sorted_indexes[column_name] = index
+        if column_name not in self.sorted_columns:
+            self.sorted_columns.append(column_name)
+        return index
+
+    def get_sorted_index(self, column_name):
+        '''
+            Returns the sorted index for a column, building it if it was
+            declared but not yet built, or None.
+        '''
+        if self.streaming:
+            return None
+        if column_name in self.sorted_indexes:
+            return self.sorted_indexes[column_name]
+        if column_name in self.sorted_columns:
+            return self.create_sorted_index(column_name)
+        return None
 
     def find(self, column_data_list):
         '''
@@ -48,47 +363,548 @@ class DataFile:
 
             column_data_list :  This is a list of column_data (named_tuples)
                                 that identify columns to search and values to 
-                                match (case insensitive). 
+                                match (case insensitive). column_compare
+                                entries can be mixed in for other searches.
 
                                 If no list is provided the full data set (rows)
                                 are returned. 
+
+            Predicates on indexed columns are answered from the index and
+            the posting lists intersected, smallest first. Any remaining
+            predicates are then checked only against those rows. 
+
+            Returns a ResultSet, the matching rows are only turned into
+            records (see make_record()) as they are used. In streaming 
+            mode there are no positions so a list of records is returned.
         '''
-        return_data = []
+        if self.streaming:
+            return [self.make_record(row_data) for row_data in self.iter_find(column_data_list)]
+
+        return ResultSet(self, self.find_positions(column_data_list))
+
+    def find_positions(self, column_data_list):
+        '''
+            Same search as find() but returns the row positions, in file
+            order, rather than the rows. 
+        '''
+        if self.streaming:
+            raise Exception("Row positions are not available on streaming file {}".format(self.file_name))
+
+        if not column_data_list:
+            return range(len(self.data))
+
+        positions = None
+        for step in self.plan(column_data_list):
+            if step.method == 'index':
+                positions = step.positions
+            elif step.method == 'intersect':
+                # A range answers membership without building a set
+                members = step.positions if isinstance(step.positions, range) else set(step.positions)
+                positions = [position for position in positions if position in members]
+            else:
+                positions = self._filter_positions(step.hdr_index, step.column, positions)
+
+            if not positions:
+                return []
+
+        return positions
+
+    def plan(self, column_data_list):
+        '''
+            Decide the order, and the way, each predicate of a search is
+            applied. Returns a list of plan_step named tuples. 
+
+            Predicates an index can answer (hash index for equality and
+            IN, sorted index for ranges and prefixes) come first, the 
+            smallest posting list (the exact row count) leading. A later indexed predicate
+            is intersected when its posting list is smaller than the rows
+            left, otherwise those rows are simply filtered. Predicates on
+            columns with no index are ordered by an estimate of the rows
+            they keep (rows / distinct values in the column) and filter 
+            what is left, or scan every row if they come first. 
+        '''
+        total = len(self.data)
+        indexed = []
+        scanned = []
+        for data in column_data_list:
+            hdr_index = self.get_field_index(data.id)
+            positions = self._index_positions(data, hdr_index)
+            if positions is not None:
+                indexed.append( (len(positions), data, hdr_index, positions) )
+            else:
+                scanned.append( (self._estimate(data, total), data, hdr_index, None) )
+
+        indexed.sort(key=lambda entry : entry[0])
+        scanned.sort(key=lambda entry : entry[0])
+
+        steps = []
+        estimate = total
+        for count, data, hdr_index, positions in indexed + scanned:
+            if not steps:
+                method = 'index' if positions is not None else 'scan'
+                estimate = count
+            else:
+                if positions is not None and count <= estimate:
+                    method = 'intersect'
+                else:
+                    method = 'filter'
+                    positions = None
+                # Predicates are assumed independent
+                estimate = estimate * count / total if total else 0
+            steps.append(plan_step(data, hdr_index, method, int(round(estimate)), positions))
+
+        return steps
+
+    def explain(self, column_data_list):
+        '''
+            Describe, as text, how find() would run a search and the rows
+            expected after each step. 
+        '''
+        lines = ["Search {} ({} rows, {} storage)".format(self.file_name, len(self.data), self.storage)]
         if not column_data_list:
-            return_data = self.data
+            lines.append("   1. all rows{}~{} rows".format(' ' * 30, len(self.data)))
+
+        for number, step in enumerate(self.plan(column_data_list or []), 1):
+            predicate = "{} {} {}".format(step.column.id, DataFile._operator(step.column), repr(step.column.value))
+            lines.append("   {}. {} {} ~{} rows".format(number, step.method.ljust(9), predicate.ljust(30), step.estimate))
+        return "\n".join(lines)
+
+    def get_column_cardinality(self, column_name):
+        '''
+            Number of distinct values in a column, worked out once per 
+            load the first time it is needed and used by plan(). 
+        '''
+        if column_name not in self.column_cardinality:
+            hdr_index = self.get_field_index(column_name)
+            if self.storage == DataFile.COLUMNAR_STORAGE:
+                column = self.data.columns[hdr_index]
+                distinct = len(column.dictionary) if column.column_type is str else len(set(column.values))
+            else:
+                distinct = len(set(self.get_column_by_index(hdr_index)))
+            self.column_cardinality[column_name] = distinct
+
+        return self.column_cardinality[column_name]
+
+    def _index_positions(self, data, hdr_index):
+        '''
+            Positions, in file order, for a predicate taken from an index
+            or None if no index can answer it.
+        '''
+        operator = DataFile._operator(data)
+        if operator in (DataFile.EQUAL, DataFile.IN):
+            index = self.get_index(data.id)
+            if index is None:
+                return None
+            if operator == DataFile.EQUAL:
+                return self._index_lookup(index, hdr_index, data.value)
+
+            positions = set()
+            for value in data.value:
+                positions.update(self._index_lookup(index, hdr_index, value))
+            return sorted(positions)
+
+        index = self.get_sorted_index(data.id)
+        if index is None:
+            return None
+        return DataFile._sorted_lookup(index, operator, data.value)
+
+    def _estimate(self, data, total):
+        '''
+            Rows a predicate is expected to keep when no index can count
+            them. 
+        '''
+        operator = DataFile._operator(data)
+        if operator in (DataFile.EQUAL, DataFile.IN):
+            distinct = self.get_column_cardinality(data.id)
+            matches = 1 if operator == DataFile.EQUAL else len(data.value)
+            return min(total, total * matches / distinct) if distinct else 0
+        if operator == DataFile.PREFIX:
+            return total * DataFile.PREFIX_SELECTIVITY
+        return total * DataFile.RANGE_SELECTIVITY
+
+    @staticmethod
+    def _sorted_lookup(index, operator, value):
+        '''
+            Positions from a sorted index with bisect, or None if the 
+            index keys are not the same kind (number/text) as the value.
+        '''
+        keys = index.keys
+        if operator == DataFile.PREFIX:
+            if index.numeric:
+                return None
+            prefix = str(value).casefold()
+            low = bisect.bisect_left(keys, prefix)
+            high = bisect.bisect_left(keys, prefix + chr(0x10ffff))
+        elif operator in DataFile.RANGE_OPERATORS:
+            bounds = DataFile._between_bounds(value) if operator == DataFile.BETWEEN else (value,)
+            bounds = [DataFile._compare_key(bound) for bound in bounds]
+            if any(isinstance(bound, float) != index.numeric for bound in bounds):
+                return None
+
+            low, high = 0, len(keys)
+            if operator == DataFile.LESS:
+                high = bisect.bisect_left(keys, bounds[0])
+            elif operator == DataFile.LESS_EQUAL:
+                high = bisect.bisect_right(keys, bounds[0])
+            elif operator == DataFile.GREATER:
+                low = bisect.bisect_right(keys, bounds[0])
+            elif operator == DataFile.GREATER_EQUAL:
+                low = bisect.bisect_left(keys, bounds[0])
+            else:
+                low = bisect.bisect_left(keys, bounds[0])
+                high = bisect.bisect_right(keys, bounds[1])
         else:
-            search_data = []
-            for data in column_data_list:
-                search_data.append( (self.header.index(data.id), data.value) )
-        
-            for hdr_index in search_data:
-                if len(return_data) == 0:
-                    return_data = self.data
-
-                return_data = [
-                    row_data 
-                    for 
-                    row_data in return_data 
-                    if str(row_data[hdr_index[0]]).lower() == str(hdr_index[1]).lower()
-                    ]
-
-        return return_data 
+            raise ValueError("Unknown search operator {}".format(operator))
 
-    def _load_data(self):
+        return sorted(index.positions[low:high]) if low < high else []
+
+    def _index_lookup(self, index, hdr_index, value):
+        if self.storage == DataFile.COLUMNAR_STORAGE:
+            try:
+                return index.get(self.data.columns[hdr_index].coerce(value), [])
+            except ValueError:
+                return []
+        return index.get(DataFile._normalize(value), [])
+
+    def _filter_positions(self, hdr_index, data, positions):
+        '''
+            Positions (all rows if None) that match the predicate data.
+        '''
+        operator = DataFile._operator(data)
+        if operator == DataFile.EQUAL:
+            return self._equal_positions(hdr_index, data.value, positions)
+
+        if operator == DataFile.IN and self.storage != DataFile.ROW_STORAGE:
+            # Typed or raw byte values, let the storage match each one
+            found = set()
+            for value in data.value:
+                found.update(self._equal_positions(hdr_index, value, positions))
+            return sorted(found)
+
+        matches = DataFile._matcher(data)
+        return [position for position, value in self._cells(hdr_index, positions) if matches(value)]
+
+    def _equal_positions(self, hdr_index, value, positions):
+        if self.storage == DataFile.COLUMNAR_STORAGE:
+            return self.data.columns[hdr_index].match(value, positions)
+        if self.storage == DataFile.MAPPED_STORAGE:
+            return self.data.match(hdr_index, value, positions)
+
+        value = DataFile._normalize(value)
+        if positions is None:
+            return [
+                position
+                for
+                position, row_data in enumerate(self.data)
+                if DataFile._normalize(row_data[hdr_index]) == value
+                ]
+        return [
+            position
+            for 
+            position in positions 
+            if DataFile._normalize(self.data[position][hdr_index]) == value
+            ]
+
+    def _cells(self, hdr_index, positions):
+        '''
+            (position, value) of a column for positions (all if None).
+        '''
+        if positions is None:
+            positions = range(len(self.data))
+
+        if self.storage == DataFile.COLUMNAR_STORAGE:
+            column = self.data.columns[hdr_index]
+            return ((position, column.get(position)) for position in positions)
+        if self.storage == DataFile.MAPPED_STORAGE:
+            return zip(positions, self.data.values(hdr_index, positions))
+        return ((position, self.data[position][hdr_index]) for position in positions)
+
+    def aggregate(self, column_name, function, column_data_list = None):
+        '''
+            Aggregate a numeric column over the rows that match
+            column_data_list (all rows if not provided). Empty values
+            are skipped. 
+
+            function : One of the keys of DataFile.AGGREGATES
+        '''
+        if function not in DataFile.AGGREGATES:
+            raise Exception("Unknown aggregate {}".format(function))
+
+        hdr_index = self.get_field_index(column_name)
+        if self.storage == DataFile.COLUMNAR_STORAGE:
+            positions = self.find_positions(column_data_list) if column_data_list else None
+            values = self.data.columns[hdr_index].numbers(positions)
+        else:
+            values = [
+                float(row_data[hdr_index])
+                for
+                row_data in self.iter_find(column_data_list)
+                if str(row_data[hdr_index]).strip()
+                ]
+
+        if not len(values):
+            return 0 if function in ('count', 'sum') else None
+        return DataFile.AGGREGATES[function](values)
+
+    def iter_find(self, column_data_list):
+        '''
+            Generator version of find(), matching rows are yielded one at
+            a time so a scan never needs every row in memory. 
+        '''
+        if not self.streaming:
+            for position in self.find_positions(column_data_list):
+                yield self.data[position]
+            return
+
+        search_data = []
+        for data in column_data_list or []:
+            search_data.append( (self.get_field_index(data.id), DataFile._matcher(data)) )
+
+        for row_data in self.iter_rows():
+            for hdr_index, matches in search_data:
+                if not matches(row_data[hdr_index]):
+                    break
+            else:
+                yield row_data
+
+    @staticmethod
+    def _normalize(value):
+        '''
+            Values are compared as case folded strings. 
+        '''
+        return str(value).casefold()
+
+    @staticmethod
+    def _operator(data):
+        return getattr(data, 'operator', DataFile.EQUAL)
+
+    @staticmethod
+    def _between_bounds(value):
+        '''
+            The (low, high) pair of a BETWEEN search.
+        '''
+        if isinstance(value, (str, bytes)) or not hasattr(value, '__len__') or len(value) != 2:
+            raise ValueError("BETWEEN needs a (low, high) pair, not {}".format(repr(value)))
+        return tuple(value)
+
+    @staticmethod
+    def _as_number(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _compare_key(value):
+        '''
+            A number if the value is one, otherwise case folded text.
+        '''
+        number = DataFile._as_number(value)
+        return number if number is not None else DataFile._normalize(value)
+
+    @staticmethod
+    def _matcher(data):
+        '''
+            Function(value) -> bool for a single predicate, used where a
+            predicate is checked value by value. 
+        '''
+        operator = DataFile._operator(data)
+        if operator == DataFile.EQUAL:
+            target = DataFile._normalize(data.value)
+            return lambda value : DataFile._normalize(value) == target
+        if operator == DataFile.IN:
+            targets = set(DataFile._normalize(value) for value in data.value)
+            return lambda value : DataFile._normalize(value) in targets
+        if operator == DataFile.PREFIX:
+            prefix = DataFile._normalize(data.value)
+            return lambda value : value is not None and DataFile._normalize(value).startswith(prefix)
+        if operator not in DataFile.RANGE_OPERATORS:
+            raise ValueError("Unknown search operator {}".format(operator))
+
+        bounds = DataFile._between_bounds(data.value) if operator == DataFile.BETWEEN else (data.value,)
+        bounds = [DataFile._compare_key(bound) for bound in bounds]
+        numeric = isinstance(bounds[0], float)
+
+        def key(value):
+            if value is None or value == '':
+                return None
+            if numeric:
+                return DataFile._as_number(value)
+            return DataFile._normalize(value)
+
+        compare = {
+            DataFile.LESS : lambda key : key < bounds[0],
+            DataFile.LESS_EQUAL : lambda key : key <= bounds[0],
+            DataFile.GREATER : lambda key : key > bounds[0],
+            DataFile.GREATER_EQUAL : lambda key : key >= bounds[0],
+            DataFile.BETWEEN : lambda key : bounds[0] <= key <= bounds[1]
+        }[operator]
+
+        def matches(value):
+            value_key = key(value)
+            return value_key is not None and compare(value_key)
+        return matches
+
+    def _read_rows(self):
+        '''
+            Generator of parsed rows (header included) from the file. The
+            C csv reader pulls the file through a CHUNK_SIZE buffer, so 
+            memory is bound by the buffer and not the file size. Blank 
+            lines are skipped and null markers become empty values. 
+        '''
         file_path = os.path.join(self.directory, self.file_name)
-        line = 1
-        with open(file_path,'r', encoding='ASCII', errors="surrogateescape") as input_file:
-            rows = input_file.readlines()
-            #csvReader = csv.reader(input_file)
+        null_marker = self.null_marker
+        with open(file_path, 'r', encoding=self.encoding, errors=DataFile.ERRORS, newline='', buffering=DataFile.CHUNK_SIZE) as input_file:
+            reader = csv.reader(input_file, self.dialect)
             try:
-                for row in rows:
-                    row = row.strip(' \n')
-                    row_data = row.split(',')
-                    if not self.header:
-                        self.header = row_data
-                    else:
-                        self.data.append(row_data)
-                    line += 1
-            except Exception as ex:
-                print("ERROR LINE", line)
-                raise ex
\ No newline at end of file
+                for row_data in reader:
+                    if not row_data:
+                        continue
+                    if null_marker is not None and null_marker in row_data:
+                        row_data = ['' if value == null_marker else value for value in row_data]
+                    yield row_data
+            except csv.Error as ex:
+                print("ERROR LINE", reader.line_num)
+                raise ex
+
+    def describe_load(self):
+        '''
+            One line summary of the last load and its throughput.
+        '''
+        stats = self.load_statistics
+        seconds = stats['seconds'] or 1e-9
+        return "{}: {} rows, {:.1f} MB from {} in {:.3f}s ({:.0f} rows/s, {:.1f} MB/s)".format(
+            self.file_name,
+            stats['rows'],
+            stats['bytes'] / 1e6,
+            stats['source'],
+            stats['seconds'],
+            stats['rows'] / seconds,
+            stats['bytes'] / 1e6 / seconds
+        )
+
+    def _cache_signature(self):
+        '''
+            Describes how the file was loaded, a snapshot taken with 
+            different settings is not re-used. 
+        '''
+        dialect = self.dialect if isinstance(self.dialect, str) else self.dialect.__name__
+        parsing = "{}|{}|{}".format(dialect, self.encoding, self.null_marker)
+        if self.storage == DataFile.ROW_STORAGE:
+            return "{}|{}".format(self.storage, parsing)
+        if self.schema is None:
+            return "{}:inferred|{}".format(self.storage, parsing)
+
+        schema = ["{}={}".format(name, self.schema[name].__name__) for name in sorted(self.schema)]
+        return "{}:{}|{}".format(self.storage, ",".join(schema), parsing)
+
+    def _load_data(self):
+        file_path = os.path.join(self.directory, self.file_name)
+        start = time.perf_counter()
+        source = self._fill_data(file_path)
+        self.load_statistics = {
+            'source' : source,
+            'rows' : len(self.data),
+            'bytes' : os.path.getsize(file_path),
+            'seconds' : time.perf_counter() - start
+        }
+
+    def _fill_data(self, file_path):
+        '''
+            Loads header and data, returns where they came from.
+        '''
+        if self.storage == DataFile.MAPPED_STORAGE:
+            # Nothing is parsed, so nothing to cache
+            self.data = MappedRows(file_path, self.encoding, self.dialect, self.null_marker)
+            self.header = self.data.header
+            return 'mapped'
+
+        use_cache = self.use_cache and not self.streaming
+        fingerprint = None
+
+        if use_cache:
+            store = data_cache.load_snapshot(file_path, self._cache_signature())
+            if store is not None:
+                self.header = store.header
+                self.data = store if self.storage == DataFile.COLUMNAR_STORAGE else store.to_rows()
+                self.loaded_from_cache = True
+                return 'cache'
+
+            # Taken before parsing, see data_cache.save_snapshot
+            fingerprint = data_cache.source_fingerprint(file_path)
+
+        rows = self._read_rows()
+        self.header = next(rows, None)
+        if self.streaming:
+            rows.close()
+        elif self.storage == DataFile.COLUMNAR_STORAGE:
+            store = ColumnStore(self.header, self.schema)
+            for row_data in rows:
+                store.append(row_data)
+            self.data = store.finish()
+        else:
+            self.data.extend(rows)
+
+        if use_cache and self.header:
+            self._save_cache(file_path, fingerprint)
+        return 'csv'
+
+    def _save_cache(self, file_path, fingerprint):
+        store = self._snapshot_store()
+        if store is not None:
+            data_cache.save_snapshot(file_path, store, self._cache_signature(), fingerprint)
+
+    def _snapshot_store(self):
+        '''
+            The data as a ColumnStore for a snapshot, or None if the rows
+            can't be held as columns. 
+        '''
+        if self.storage == DataFile.COLUMNAR_STORAGE:
+            return self.data
+
+        # Rows are saved as text columns
+        try:
+            store = ColumnStore(self.header, {})
+            for row_data in self.data:
+                store.append(row_data)
+        except Exception:
+            # Ragged rows can't be stored as columns
+            return None
+        return store
+
+    def __getstate__(self):
+        '''
+            When a DataFile is pickled (i.e. loaded in a worker process and
+            sent back) the rows travel as a snapshot buffer, not as lists
+            of strings, and only the names of the built indexes are sent.
+            The indexes are built again from the rows when unpickled, 
+            sorted indexes are left to be built on first use. A mapped 
+            file is simply mapped again, its indexes are sent as they are
+            as rebuilding them would read the whole file again.
+        '''
+        state = self.__dict__.copy()
+        if self.storage == DataFile.MAPPED_STORAGE:
+            state['data'] = None
+        elif not self.streaming:
+            store = self._snapshot_store()
+            if store is not None:
+                state['data'] = data_cache.snapshot_bytes(store, self._cache_signature(), None)
+                state['indexes'] = list(self.indexes.keys())
+                state['sorted_indexes'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.storage == DataFile.MAPPED_STORAGE:
+            file_path = os.path.join(self.directory, self.file_name)
+            self.data = MappedRows(file_path, self.encoding, self.dialect, self.null_marker)
+        elif isinstance(self.data, bytes):
+            store = data_cache.store_from_bytes(self.data)
+            self.data = store if self.storage == DataFile.COLUMNAR_STORAGE else store.to_rows()
+        self.header_loaded()
+
+        if isinstance(self.indexes, list):
+            # Only the names were sent, see __getstate__
+            index_names, self.indexes = self.indexes, {}
+            for column_name in index_names:
+                self.create_index(column_name)
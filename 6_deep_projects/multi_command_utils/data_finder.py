@@ -1,21 +1,169 @@
 '''
     data_finder :
-    
-    Utility to find the Formula One data in ANY sub directory of the 
-    6_DeepProjects folder. 
+
+    Utility to find the Formula One data in ANY sub directory of the
+    6_DeepProjects folder.
+
+    The folder is walked once and a map of file name -> directory is
+    kept, so every data reader after the first finds its file without
+    another walk. The map is also saved to disk (CACHE_FILE in the
+    folder) together with the modified time of every directory walked.
+    Adding or removing a file or folder changes the modified time of its
+    directory, so the saved map is only used while none of them have
+    changed.
+
+    To skip the search, point the DATA_ROOT_VARIABLE environment variable
+    (or set_data_root()) at the directory that holds the data. Only that
+    directory, and the folders under it, are then searched.
 '''
 import os
+import json
 import inspect
 
+DATA_ROOT_VARIABLE = 'DEEP_PROJECTS_DATA_ROOT'
+CACHE_FILE = '.data_finder_cache.json'
+
+# Folders that never hold data, not worth walking
+SKIP_DIRECTORIES = ['__pycache__']
+
+_data_root = None
+# Search root -> file map, see _load_file_map()
+_file_maps = {}
+
 
 def find_file_root(file_name):
+    '''
+        Directory holding file_name, or None if it can't be found.
+    '''
+    search_root = get_search_root()
+    explicit = _data_root or os.environ.get(DATA_ROOT_VARIABLE)
+    if explicit and os.path.isfile(os.path.join(search_root, file_name)):
+        return search_root
+
+    file_map = _file_maps.get(search_root)
+    if file_map is None or (file_name not in file_map['files'] and not _is_current(file_map)):
+        file_map = _load_file_map(search_root)
+        _file_maps[search_root] = file_map
+
+    return file_map['files'].get(file_name)
+
+
+def get_search_root():
+    '''
+        The directory searched, the data root if one is set, otherwise
+        the folder above multi_command_utils.
+    '''
+    explicit = _data_root or os.environ.get(DATA_ROOT_VARIABLE)
+    if explicit:
+        return os.path.abspath(explicit)
+
     currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
-    base_directory = os.path.dirname(currentdir)
-    
-    return_path = None
-    for root, dirs, files in os.walk(base_directory, topdown=False):
-        if file_name in files:
-            return_path = root
-            break
-    return return_path
+    return os.path.dirname(currentdir)
+
+
+def set_data_root(directory):
+    '''
+        Search only directory (and the folders under it) for data, None
+        goes back to the environment variable or the default.
+    '''
+    global _data_root
+    _data_root = directory
+
+
+def clear_cache():
+    '''
+        Forget the file maps held in memory, the next search checks the
+        saved map (or walks) again.
+    '''
+    _file_maps.clear()
+
+
+def _load_file_map(search_root):
+    cache_path = os.path.join(search_root, CACHE_FILE)
+    try:
+        with open(cache_path, 'r') as cache_file:
+            file_map = json.load(cache_file)
+        if file_map.get('root') == search_root and _is_current(file_map):
+            return file_map
+    except (OSError, ValueError, AttributeError):
+        # No saved map, or a damaged one
+        pass
+
+    file_map = _walk(search_root)
+    _save_file_map(cache_path, file_map)
+    return file_map
+
+
+def _save_file_map(cache_path, file_map):
+    cache_directory = os.path.dirname(cache_path)
+    try:
+        for attempt in range(2):
+            with open(cache_path, 'w') as cache_file:
+                json.dump(file_map, cache_file)
+
+            # Creating the cache file changes the modified time of the
+            # folder it is in, record that so the map isn't stale straight
+            # away. Rewriting an existing file doesn't change it again.
+            mtime_ns = os.stat(cache_directory).st_mtime_ns
+            if file_map['directories'].get(cache_directory, mtime_ns) == mtime_ns:
+                break
+            file_map['directories'][cache_directory] = mtime_ns
+    except OSError:
+        # Read only folder, keep the map in memory only
+        pass
+
+
+def _is_current(file_map):
+    '''
+        True if no directory walked has been changed since.
+    '''
+    for directory, mtime_ns in file_map['directories'].items():
+        try:
+            if os.stat(directory).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _walk(search_root):
+    '''
+        Bottom up walk (a sub directory before its parent), the first
+        directory found holding a file name is the one recorded.
+    '''
+    files = {}
+    directories = {}
+    for root, dirs, file_names in _bottom_up(search_root):
+        directories[root] = os.stat(root).st_mtime_ns
+        for file_name in file_names:
+            files.setdefault(file_name, root)
+
+    return {
+        'root' : search_root,
+        'files' : files,
+        'directories' : directories
+    }
+
+
+def _bottom_up(directory):
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+
+    dirs = []
+    file_names = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            is_dir = False
+        if is_dir:
+            if not entry.name.startswith('.') and entry.name not in SKIP_DIRECTORIES:
+                dirs.append(entry.name)
+        else:
+            file_names.append(entry.name)
 
+    for name in dirs:
+        yield from _bottom_up(os.path.join(directory, name))
+    yield directory, dirs, file_names
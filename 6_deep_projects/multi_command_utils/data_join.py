@@ -0,0 +1,104 @@
+'''
+    Joins between DataFiles.
+
+    Looking up the related row of another file inside a loop over search
+    results (the race of every result, the constructor of every result,
+    ...) means one search per row per file. join() does the lookups for a
+    whole set of rows at once: each foreign key is answered from the
+    index on the key column of the other file (built once, the first time
+    it is needed) and every distinct key is only looked up, and turned
+    into a record, once.
+
+    EX:
+        joined = join(
+            results,
+            [
+                join_on('race', races_file, 'raceId', 'raceId'),
+                join_on('status', status_file, 'statusId', 'statusId')
+            ],
+            'result')
+
+        for row in joined:
+            print(row.race.name, row.result.grid, row.status.status)
+
+    semi_join() is the other way round, it finds the rows of a file whose
+    key is in a set of values (SQL : WHERE key IN (...)), i.e. every
+    result of the races of a season :
+
+        race_ids = races_file.get_by_race_year(2015).column('raceId')
+        results = semi_join(results_file, 'raceId', race_ids)
+'''
+import collections
+from multi_command_utils.result_set import ResultSet
+
+# name :        Field the matching record is put under in a joined row
+# data_file :   DataFile to join to
+# key :         Column of data_file to match
+# foreign_key : Field of the rows being joined that holds the key value
+join_on = collections.namedtuple("join_on", "name data_file key foreign_key")
+
+
+def join(rows, joins, row_name = 'row'):
+    '''
+        rows :      Records (i.e. a ResultSet) to join from.
+        joins :     List of join_on, one per file joined.
+        row_name :  Field the original row is put under.
+
+        Returns a list of named tuples, one per row, holding the row and
+        the matching record from each joined file (None if there is no
+        match, the first in file order if there is more than one).
+    '''
+    joined_row = collections.namedtuple("joined_row", [row_name] + [data.name for data in joins])
+    lookups = [(data.foreign_key, _key_lookup(data.data_file, data.key)) for data in joins]
+
+    joined = []
+    for row in rows:
+        values = [row]
+        for foreign_key, lookup in lookups:
+            values.append(lookup(getattr(row, foreign_key)))
+        joined.append(joined_row._make(values))
+    return joined
+
+
+def _key_lookup(data_file, key):
+    '''
+        Function returning the record of data_file for a key value, each
+        distinct value is only looked up once.
+    '''
+    found = {}
+
+    def lookup(value):
+        if value in found:
+            return found[value]
+        positions = data_file.key_positions(key, value)
+        record = data_file.make_record(data_file.data[positions[0]]) if len(positions) else None
+        found[value] = record
+        return record
+
+    return lookup
+
+
+def semi_join(data_file, key, values):
+    '''
+        ResultSet of the rows of data_file whose key column is one of
+        values. Each distinct value is looked up once in the key column
+        index. Rows come back in the order of values, and file order for
+        rows with the same value.
+    '''
+    positions = []
+    for value in distinct(values):
+        positions.extend(data_file.key_positions(key, value))
+    return ResultSet(data_file, positions)
+
+
+def distinct(values):
+    '''
+        values without duplicates, in the order they first appear. 
+    '''
+    seen = set()
+    unique = []
+    for value in values:
+        if value not in seen:
+            seen.add(value)
+            unique.append(value)
+    return unique
@@ -0,0 +1,300 @@
+'''
+    A dictionary of datasets (DataFile instances) that are loaded in the
+    background.
+
+    Instead of building every DataFile one after another before the
+    application starts, each dataset is registered with a factory (a
+    class or function that builds it). preload() then starts loading all
+    of them at the same time in a process pool, parsing is CPU bound so
+    threads would mostly wait on each other. A loaded DataFile is sent
+    back to the application as a compact snapshot buffer (see
+    DataFile.__getstate__) rather than as millions of small strings.
+
+    Asking for a dataset (registry[key]) only waits for that dataset. If
+    it was never preloaded, or is still queued behind other files, it is
+    loaded there and then, so a command that only uses one file never
+    waits on the others.
+
+    Each command can be handed its own view of the registry with
+    for_command(). The view gives out proxies, a dataset is only loaded
+    when the command first uses it (calls a method, reads an attribute),
+    not when it is taken out of the dictionary. The registry records
+    which datasets every command actually used, see get_usage().
+
+    A dataset built from other datasets names them when it is
+    registered (uses), the factory is handed proxies to the copies the
+    registry holds instead of parsing the files again. It is preloaded
+    on a thread of this process, as the proxies can't be sent to a
+    worker.
+
+    EX:
+        registry.register('results', ResultsDataFile)
+        registry.register('career', CareerAggregates, uses={'results_file' : 'results'})
+
+    NOTE:
+        Factories must be importable from a module (a class or a top
+        level function) so they can be sent to a worker process. If a
+        process pool can't be used, threads are used instead.
+'''
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def _load_dataset(factory):
+    '''
+        Runs in the worker, the returned DataFile is pickled back.
+    '''
+    return factory()
+
+
+class DatasetRegistry:
+    '''
+        Can be passed anywhere the plain datasets dictionary was, i.e.
+        to an IFunction, as it supports [key], get(), keys(), in and len().
+    '''
+    def __init__(self, workers = None):
+        self.workers = workers
+        self._factories = {}
+        # Key -> {factory keyword : key of the dataset passed in}
+        self._uses = {}
+        self._futures = {}
+        # Keys whose future belongs to the pool
+        self._background = set()
+        self._lock = threading.Lock()
+        self._executor = None
+        # Command name -> keys of the datasets it used
+        self.usage = {}
+
+    def register(self, key, factory, uses = None):
+        '''
+            factory is called with no arguments to build the dataset, 
+            other than the datasets named in uses (keyword -> key) which
+            are passed as proxies so they are only loaded if needed.
+        '''
+        with self._lock:
+            self._factories[key] = factory
+            self._uses[key] = dict(uses) if uses else {}
+            self._futures.pop(key, None)
+            self._background.discard(key)
+
+    def preload(self, keys = None, processes = True):
+        '''
+            Start loading the datasets (all of them if keys is None) in
+            the background and return straight away.
+        '''
+        keys = list(self._factories.keys()) if keys is None else keys
+        with self._lock:
+            pending = [key for key in keys if key not in self._futures]
+            # Built from other datasets, loaded here rather than in the pool
+            dependent = [key for key in pending if self._uses.get(key)]
+            pending = [key for key in pending if key not in dependent]
+
+            if pending and self._executor is None:
+                self._executor = self._create_executor(len(pending), processes)
+
+            for key in pending:
+                try:
+                    self._futures[key] = self._executor.submit(_load_dataset, self._factories[key])
+                    self._background.add(key)
+                except Exception:
+                    # Pool could not start, it will be loaded on first use
+                    break
+
+        for key in dependent:
+            threading.Thread(target=self.get, args=(key,), daemon=True).start()
+
+    def load_all(self):
+        '''
+            Loads every dataset and waits until they are all ready.
+        '''
+        self.preload()
+        for key in self._factories.keys():
+            self[key]
+
+    def for_command(self, command):
+        '''
+            Datasets dictionary for a single command (IFunction), records
+            what the command uses.
+        '''
+        return CommandDatasets(self, command)
+
+    def record_usage(self, command, key):
+        with self._lock:
+            self.usage.setdefault(command, set()).add(key)
+
+    def get_usage(self, command = None):
+        '''
+            Sorted keys used by a command, or a dictionary of command ->
+            keys for all commands if command is None.
+        '''
+        with self._lock:
+            if command is not None:
+                return sorted(self.usage.get(command, []))
+            return {name : sorted(keys) for name, keys in self.usage.items()}
+
+    def describe_loads(self):
+        '''
+            DataFile.describe_load() of every dataset loaded so far, in
+            the order they were registered. Datasets that are not a
+            DataFile (nothing to describe) are left out.
+        '''
+        descriptions = []
+        for key in self._factories.keys():
+            if self.is_loaded(key):
+                dataset = self._futures[key].result()
+                if getattr(dataset, 'load_statistics', None):
+                    descriptions.append(dataset.describe_load())
+        return descriptions
+
+    def is_loaded(self, key):
+        future = self._futures.get(key)
+        return future is not None and future.done() and future.exception() is None
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _create_executor(self, count, processes):
+        workers = self.workers or min(count, os.cpu_count() or 1)
+        if processes:
+            try:
+                return ProcessPoolExecutor(max_workers=workers)
+            except (OSError, NotImplementedError, ImportError):
+                # No multiprocessing on this platform
+                pass
+        return ThreadPoolExecutor(max_workers=workers)
+
+    def _future(self, key):
+        with self._lock:
+            if key not in self._factories:
+                raise KeyError(key)
+
+            future = self._futures.get(key)
+            if future is not None and key in self._background and future.cancel():
+                # Still queued behind other files, quicker to load it here
+                self._background.discard(key)
+                future = None
+
+            if future is None:
+                # Not preloaded, load it in the calling thread. Other
+                # threads asking for the same key wait on this future.
+                future = Future()
+                future.set_running_or_notify_cancel()
+                self._futures[key] = future
+                owner = True
+            else:
+                owner = False
+
+        if owner:
+            try:
+                future.set_result(self._build(key))
+            except Exception as ex:
+                future.set_exception(ex)
+        return future
+
+    def _build(self, key):
+        arguments = {
+            keyword : DatasetProxy(self, used_key)
+            for
+            keyword, used_key in self._uses[key].items()
+            }
+        return self._factories[key](**arguments)
+
+    # Dictionary access
+    def __getitem__(self, key):
+        future = self._future(key)
+        try:
+            return future.result()
+        except Exception:
+            with self._lock:
+                retry = key in self._background and self._futures.get(key) is future
+                if retry:
+                    # A worker can die (or fail to send the result back)
+                    # where loading here works, so try once in this process.
+                    self._background.discard(key)
+                    del self._futures[key]
+            if not retry:
+                raise
+        return self._future(key).result()
+
+    def get(self, key, default = None):
+        if key not in self._factories:
+            return default
+        return self[key]
+
+    def __contains__(self, key):
+        return key in self._factories
+
+    def keys(self):
+        return self._factories.keys()
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def __len__(self):
+        return len(self._factories)
+
+
+class DatasetProxy:
+    '''
+        Stands in for a DataFile, loading it (and recording that the
+        command used it, if there is one) the first time an attribute is
+        asked for.
+    '''
+    def __init__(self, registry, key, command = None):
+        self._registry = registry
+        self._key = key
+        self._command = command
+        self._target = None
+
+    def _load(self):
+        if self._target is None:
+            if self._command is not None:
+                self._registry.record_usage(self._command, self._key)
+            self._target = self._registry[self._key]
+        return self._target
+
+    def __getattr__(self, name):
+        # Only called for names not found on the proxy itself
+        return getattr(self._load(), name)
+
+    def __repr__(self):
+        state = 'loaded' if self._target is not None else 'not loaded'
+        return "DatasetProxy({}, {})".format(self._key, state)
+
+
+class CommandDatasets:
+    '''
+        The datasets dictionary as seen by one command, see
+        DatasetRegistry.for_command().
+    '''
+    def __init__(self, registry, command):
+        self.registry = registry
+        self.command = command
+
+    def __getitem__(self, key):
+        if key not in self.registry:
+            raise KeyError(key)
+        return DatasetProxy(self.registry, key, self.command)
+
+    def get(self, key, default = None):
+        if key not in self.registry:
+            return default
+        return self[key]
+
+    def get_usage(self):
+        return self.registry.get_usage(self.command)
+
+    def __contains__(self, key):
+        return key in self.registry
+
+    def keys(self):
+        return self.registry.keys()
+
+    def __iter__(self):
+        return iter(self.registry)
+
+    def __len__(self):
+        return len(self.registry)
@@ -12,7 +12,8 @@
         - Manages printing out the help information.
         - Manages parsing additional parameters for a function. 
         - Identifies an 'abstract' call execute(args) for derived classes
-          to implement the specific functionality.  
+          to implement the specific functionality, returning a 
+          CommandResult.  
 '''
 import collections
 
@@ -37,6 +38,9 @@ class IFunction:
         """
             Deriving functions must implement this function. This is where
             the actual work for the function resides. 
+
+            Return a CommandResult (see tabular_result.py) rather than
+            printing, the application decides how it is shown.
         """
         raise Exception("execute not implemented")
 
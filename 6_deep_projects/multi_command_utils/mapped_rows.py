@@ -0,0 +1,197 @@
+'''
+    Memory mapped, read only rows of a CSV file.
+
+    Rather than splitting every line into a list of strings when a file
+    is loaded, the file is memory mapped and only the offset of each line
+    is recorded (array('Q'), 8 bytes per row). Blank lines are skipped, as
+    they are when a file is parsed. A row is decoded when it is asked for,
+    and searches only decode the single field they compare, so the memory
+    used is close to the size of the offset array. The pages
+    of the file belong to the operating system's page cache, several
+    processes mapping the same file share them.
+
+    Lines holding a quote character are parsed with the csv module so a
+    quoted value may contain the delimiter, but a quoted value can not
+    span lines in this mode. 
+
+    The map and the file stay open until close() is called, or the
+    MappedRows is used as a context manager.
+
+    EX:
+        with MappedRows(file_path, 'utf-8') as rows:
+            first = rows[0]
+'''
+import csv
+import mmap
+from array import array
+
+ERRORS = 'surrogateescape'
+
+
+class MappedRows:
+    '''
+        Behaves like the list of rows a DataFile holds (len, indexing and
+        iteration return lists of strings) over a memory mapped file.
+        Line 0 of the file is the header.
+    '''
+    def __init__(self, file_path, encoding = 'ascii', dialect = 'excel', null_marker = None):
+        self.file_path = file_path
+        self.encoding = encoding
+        self.dialect = dialect
+        dialect = csv.get_dialect(dialect) if isinstance(dialect, str) else dialect
+        self._delimiter = dialect.delimiter.encode(encoding)
+        self._quote = dialect.quotechar.encode(encoding) if dialect.quotechar else None
+        self._null = null_marker.encode(encoding, ERRORS) if null_marker is not None else None
+        self._file = open(file_path, 'rb')
+        self._map = None
+        self.header = None
+        # Start of every line that isn't blank
+        self.offsets = array('Q')
+
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file, nothing to map
+            self._file.close()
+            return
+
+        self._index_lines()
+        if len(self.offsets):
+            self.header = self._split(self._line_bytes(0))
+
+    def _index_lines(self):
+        mapped = self._map
+        size = len(mapped)
+        offsets = self.offsets
+        start = 0
+        while start < size:
+            end = mapped.find(b'\n', start)
+            if end == -1:
+                # No newline on the last line
+                end = size
+            if end > start and not (end == start + 1 and mapped[start] == 13):
+                offsets.append(start)
+            start = end + 1
+
+    def close(self):
+        '''
+            Closes the map and the file, no row can be read afterwards.
+        '''
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return max(len(self.offsets) - 1, 0)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.row(idx) for idx in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if position < 0 or position >= len(self):
+            raise IndexError("row index out of range")
+        return self.row(position)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self.row(position)
+
+    def row(self, position):
+        '''
+            Decoded data row, position 0 is the first row after the header.
+        '''
+        return self._split(self._line_bytes(position + 1))
+
+    def column(self, hdr_index):
+        return [
+            field.decode(self.encoding, ERRORS)
+            for
+            field in self._fields(hdr_index, range(len(self)))
+            ]
+
+    def values(self, hdr_index, positions):
+        '''
+            Decoded values of one column for the given positions.
+        '''
+        for field in self._fields(hdr_index, positions):
+            yield field.decode(self.encoding, ERRORS)
+
+    def match(self, hdr_index, value, positions = None):
+        '''
+            Positions whose field equals value (case insensitive), only
+            the one field of each row is decoded.
+        '''
+        target = str(value).casefold()
+        if positions is None:
+            positions = range(len(self))
+
+        encoding = self.encoding
+        return [
+            position
+            for
+            position, field in zip(positions, self._fields(hdr_index, positions))
+            if field.decode(encoding, ERRORS).casefold() == target
+            ]
+
+    def build_index(self, hdr_index):
+        '''
+            Maps the case folded field value to the positions that hold it.
+        '''
+        # Grouped on the raw bytes first so each distinct value is only
+        # decoded once, values that fold together are then merged
+        grouped = {}
+        for position, field in enumerate(self._fields(hdr_index, range(len(self)))):
+            grouped.setdefault(field, []).append(position)
+
+        index = {}
+        for field, positions in grouped.items():
+            key = field.decode(self.encoding, ERRORS).casefold()
+            if key in index:
+                index[key] = sorted(index[key] + positions)
+            else:
+                index[key] = positions
+        return index
+
+    def _fields(self, hdr_index, positions):
+        mapped = self._map
+        size = len(mapped)
+        offsets = self.offsets
+        delimiter = self._delimiter
+        quote = self._quote
+        null = self._null
+        for position in positions:
+            start = offsets[position + 1]
+            end = mapped.find(b'\n', start)
+            line = mapped[start:end if end != -1 else size].rstrip(b'\r')
+            if quote and quote in line:
+                field = self._split(line)[hdr_index].encode(self.encoding, ERRORS)
+            else:
+                field = line.split(delimiter)[hdr_index]
+                if field == null:
+                    field = b''
+            yield field
+
+    def _line_bytes(self, line_number):
+        start = self.offsets[line_number]
+        end = self._map.find(b'\n', start)
+        return self._map[start:end if end != -1 else len(self._map)].rstrip(b'\r')
+
+    def _split(self, line):
+        text = line.decode(self.encoding, ERRORS)
+        if self._quote and self._quote in line:
+            row_data = next(csv.reader([text], self.dialect), [''])
+        else:
+            row_data = text.split(self._delimiter.decode(self.encoding))
+
+        if self._null is not None:
+            null = self._null.decode(self.encoding, ERRORS)
+            row_data = ['' if value == null else value for value in row_data]
+        return row_data
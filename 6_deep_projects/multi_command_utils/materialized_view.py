@@ -0,0 +1,70 @@
+'''
+    Results worked out from one or more data files and saved to disk, so
+    they are only worked out again when one of those files changes.
+
+    A view is a JSON file holding the data plus the fingerprint (size,
+    modified time and hash, see data_cache.source_fingerprint) of every
+    source file it was built from and a signature (i.e. a version number)
+    that changes whenever the way it is built changes.
+
+    EX:
+        data = load_view(view_path, sources, 1)
+        if data is None:
+            fingerprints = source_fingerprints(sources)
+            data = build()
+            save_view(view_path, fingerprints, 1, data)
+'''
+import os
+import json
+import tempfile
+from multi_command_utils import data_cache
+
+
+def source_fingerprints(source_paths):
+    '''
+        Take these BEFORE building the view, so a file changed while it
+        is built is never recorded as current.
+    '''
+    return {source_path : data_cache.source_fingerprint(source_path) for source_path in source_paths}
+
+
+def load_view(view_path, source_paths, signature):
+    '''
+        The data saved in the view, or None if there is no view or it is
+        out of date.
+    '''
+    try:
+        with open(view_path, 'r', encoding='utf-8') as view_file:
+            view = json.load(view_file)
+
+        if view['signature'] != signature:
+            return None
+        if sorted(view['sources'].keys()) != sorted(source_paths):
+            return None
+        for source_path in source_paths:
+            if not data_cache.source_matches(source_path, view['sources'][source_path]):
+                return None
+        return view['data']
+    except (OSError, ValueError, KeyError, TypeError):
+        # Missing or damaged view, build it again
+        return None
+
+
+def save_view(view_path, fingerprints, signature, data):
+    '''
+        Returns False if the view could not be written.
+    '''
+    temp_path = None
+    try:
+        # A temp file of its own, so two processes saving the view never
+        # write into the same file
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(view_path)), suffix='.tmp')
+        with os.fdopen(handle, 'w', encoding='utf-8') as view_file:
+            json.dump({'signature' : signature, 'sources' : fingerprints, 'data' : data}, view_file)
+        os.replace(temp_path, view_path)
+    except OSError:
+        # Read only data directory, carry on without saving
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    return True
@@ -38,10 +38,10 @@ class MenuUtils:
         pass
 
     @staticmethod
-    def _menu_recurse(dictionary, command_list):
+    def _menu_recurse(dictionary, command_list, lines):
         '''
             This function is a recursive funciton if a dictionary
-            contains a dictionary called by display_menu_help
+            contains a dictionary called by menu_lines
         '''
         for sub_command in dictionary:
             '''
@@ -58,37 +58,42 @@ class MenuUtils:
             action_taken = False
             if isinstance(dictionary[sub_command], dict):
                 command_list.append(sub_command)
-                MenuUtils._menu_recurse(dictionary[sub_command], command_list)
+                MenuUtils._menu_recurse(dictionary[sub_command], command_list, lines)
                 action_taken = True
             elif isinstance(dictionary[sub_command], IFunction):
                 command_list.append(sub_command)
-                print("%s : %s" % (" ".join(command_list).ljust(21), dictionary[sub_command].get_arguments()) )
+                lines.append("%s : %s" % (" ".join(command_list).ljust(21), dictionary[sub_command].get_arguments()) )
                 action_taken = True
             elif callable(dictionary[sub_command]):
                 command_list.append(sub_command)
-                print("%s :" % (" ".join(command_list).ljust(21)) )
+                lines.append("%s :" % (" ".join(command_list).ljust(21)) )
                 action_taken = True
 
             if action_taken:
                 command_list = command_list[:command_list.index(sub_command)]
-    
+
     @staticmethod
-    def display_menu_help(menu_dictionary, args = None):
+    def header_lines():
+        return [
+            "{}:".format(MenuUtils.MENU_TITLE),
+            "%s" % ("-".ljust(35,'-') ),
+            "%s | %s" % ("Command".ljust(21), "Arguments"),
+            "%s" % ("-".ljust(35,'-') )
+        ]
+
+    @staticmethod
+    def incomplete_line(args):
+        return "*** Incomplete Command -  {} *** type help".format(args)
+
+    @staticmethod
+    def menu_lines(menu_dictionary):
         '''
-            This function starts the process of iterating over the 
-            dictionary menu. A dictionary can only contain 
+            The lines listing every command of the menu dictionary, 
+            followed by a blank line. A dictionary can only contain 
                 1. Keys that identify another dictionary
                 2. Keys that identify actual functions.
         '''
-        print("{}:".format(MenuUtils.MENU_TITLE))
-        print("%s" % ("-".ljust(35,'-') ))
-        print("%s | %s" % ("Command".ljust(21), "Arguments") )
-        print("%s" % ("-".ljust(35,'-') ))
-
-        # If args is a string, this was an incomplete call
-        if isinstance(args, str):
-            print("*** Incomplete Command - ", args, "*** type help")
-
+        lines = []
         for command in menu_dictionary.keys():
             '''
                 If the next item is a 
@@ -99,9 +104,25 @@ class MenuUtils:
 
             '''
             if isinstance(menu_dictionary[command], dict):
-                MenuUtils._menu_recurse(menu_dictionary[command], [command])
+                MenuUtils._menu_recurse(menu_dictionary[command], [command], lines)
             elif isinstance(menu_dictionary[command], IFunction):
-                print("%s : %s" % (command.ljust(21), menu_dictionary[command].get_arguments()) )
+                lines.append("%s : %s" % (command.ljust(21), menu_dictionary[command].get_arguments()) )
             elif callable(menu_dictionary[command]):
-                print("%s :" % (command.ljust(21)) )
-        print('')
+                lines.append("%s :" % (command.ljust(21)) )
+        lines.append('')
+        return lines
+
+    @staticmethod
+    def display_menu_help(menu_dictionary, args = None):
+        '''
+            This function starts the process of iterating over the 
+            dictionary menu and prints the help. 
+        '''
+        lines = MenuUtils.header_lines()
+
+        # If args is a string, this was an incomplete call
+        if isinstance(args, str):
+            lines.append(MenuUtils.incomplete_line(args))
+
+        lines.extend(MenuUtils.menu_lines(menu_dictionary))
+        print("\n".join(lines))
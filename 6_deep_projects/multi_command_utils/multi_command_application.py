@@ -1,11 +1,21 @@
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from multi_command_utils import console
 from multi_command_utils.interface import IFunction
-from multi_command_utils.menuutils import MenuUtils
+from multi_command_utils.renderers import TextRenderer
+from multi_command_utils.tabular_result import CommandResult
+from multi_command_utils.command_router import CommandRouter
 
 class MultiCommandApp:
-    def __init__(self, prompt, application_menu):
+    def __init__(self, prompt, application_menu, renderer = None):
+        '''
+            renderer :  Writes the results functions return, see
+                        renderers.py. Text tables if not provided.
+        '''
         self.prompt = prompt
         self.app_menu = application_menu
+        self.renderer = renderer or TextRenderer()
 
         # Add in default help/quit/clear if not there
         if 'help' not in self.app_menu.keys():
@@ -15,62 +25,124 @@ class MultiCommandApp:
         if 'quit' not in self.app_menu.keys():
             self.app_menu['quit'] = quit
 
+        # Compiled once, the menu is not walked again per command
+        self.router = CommandRouter(self.app_menu)
+
 
     def run(self):
         while True:   
             user_input = input("{} : > ".format(self.prompt))
-            inputs = user_input.split(' ')
-
-            if len(inputs) > 0 and inputs[0] in self.app_menu.keys():
-                current_action = self.app_menu
-                last_command_index = 0
-
-                triggered = False
-                for next_input in inputs:
-        
-                    next_input = next_input.strip()
-                    if len(next_input) == 0 :
-                        continue
-
-                    last_command_index += 1
-                    '''
-                        Note that on an invalid command, a high level function, or 
-                        an instance of IFunction, we want to break the loop once
-                        we execute that if/elif segment as there are no more items 
-                        to parse. 
-                    '''
-                    if next_input not in current_action.keys():
-                        print("Invalid Command : ", " ".join(inputs))
-                        MenuUtils.display_menu_help(self.app_menu)
-                        triggered = True
-                        break
-                    elif callable(current_action[next_input]):
-                        # Top level functions, typically quit and help
-                        current_action[next_input]()
-                        triggered = True
-                        break
-                    elif isinstance(current_action[next_input], IFunction):
-                        # IFunction instance
-                        current_action[next_input].execute(inputs[last_command_index:])
-                        triggered = True
-                        break
-                    else:
-                        current_action = current_action[next_input]
-
-                if not triggered:
-                    MenuUtils.display_menu_help(current_action, next_input)
-
-            else:
-                print("Invalid Command : ", " ".join(inputs))
-                MenuUtils.display_menu_help(self.app_menu)
-
-            
+            try:
+                self.execute(user_input)
+            except Exception:
+                # Functions print their own error, a failed command
+                # never ends the application
+                print("Command Failed : ", user_input)
+
+    def execute(self, user_input):
+        '''
+            Runs a single command line, as typed at the prompt. Commands
+            can be shortened to any prefix that is not ambiguous.
+
+            Returns False if the line isn't a command that can be run 
+            (invalid, ambiguous or incomplete), True once it has run. 
+            Anything the command raises is passed on.
+        '''
+        inputs = user_input.split(' ')
+
+        # The first word has to be a command as typed, not empty
+        if len(inputs) == 0 or len(inputs[0]) == 0:
+            found = None
+        else:
+            found = self.router.route(inputs)
+
+        if found is None or found.error == CommandRouter.INVALID:
+            print("Invalid Command : ", " ".join(inputs))
+            print(self.router.help_text())
+            return False
+        elif found.error == CommandRouter.AMBIGUOUS:
+            print("Ambiguous Command : {} could be {}".format(found.word, ", ".join(self.router.candidates(found.node, found.word))))
+            print(self.router.help_text(found.node))
+            return False
+        elif found.error == CommandRouter.INCOMPLETE:
+            print(self.router.help_text(found.node, found.word))
+            return False
+        elif isinstance(found.action, IFunction):
+            # IFunction instance, anything it returns is rendered here
+            result = found.action.execute(found.arguments)
+            if isinstance(result, CommandResult):
+                self.renderer.render(result)
+        else:
+            # Top level functions, typically quit and help
+            found.action()
+        return True
+
+    def run_batch(self, commands, workers = 1, echo = True):
+        '''
+            Runs commands (i.e. the lines of a script file or sys.stdin)
+            one after another, without prompting, over the datasets the
+            application already has. Blank lines and lines starting with
+            # are skipped, quit ends the batch.
+
+            workers :   More than 1 runs the commands side by side in a
+                        pool of threads. Each command's output is captured
+                        and printed in the order of the commands.
+            echo :      Print each command, as the prompt would, before
+                        its output.
+
+            A failed command doesn't stop the batch. Returns the number 
+            of commands that failed, raised or were not a command (invalid,
+            ambiguous or incomplete).
+        '''
+        if workers is None or workers <= 1:
+            failed = 0
+            for command in self._batch_commands(commands):
+                if echo:
+                    print("{} : > {}".format(self.prompt, command))
+                if not self._execute_batch_command(command):
+                    failed += 1
+            return failed
+
+        commands = list(self._batch_commands(commands))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._capture_batch_command, command) for command in commands]
+            failed = 0
+            for command, future in zip(commands, futures):
+                succeeded, output = future.result()
+                if echo:
+                    print("{} : > {}".format(self.prompt, command))
+                sys.stdout.write(output)
+                if not succeeded:
+                    failed += 1
+            return failed
+
+    def _batch_commands(self, commands):
+        for command in commands:
+            command = command.strip()
+            if len(command) == 0 or command.startswith('#'):
+                continue
+            found = self.router.route(command.split(' '))
+            if found.error is None and found.path == ['quit']:
+                break
+            yield command
+
+    def _execute_batch_command(self, command):
+        try:
+            return self.execute(command)
+        except Exception:
+            # Functions print their own error
+            return False
+
+    def _capture_batch_command(self, command):
+        with console.capture_output() as capture:
+            succeeded = self._execute_batch_command(command)
+        return succeeded, capture.getvalue()
 
     def _help(self):
         '''
             Top level help function
         '''
-        MenuUtils.display_menu_help(self.app_menu)
+        print(self.router.help_text())
 
     def _clear(self):
         '''
@@ -0,0 +1,111 @@
+'''
+    A bounded cache of the records of a DataFile, by a key column.
+
+    Output code often needs the same few records over and over, i.e. the
+    name of the driver on every printed row. Rather than a search per
+    row, records are kept in a least recently used cache. get_many()
+    fills it for a whole list of keys at once, the keys that are not
+    cached are found in one pass over the key column index.
+
+    A cache belongs to one load of the file, data readers create theirs
+    in header_loaded() so a reload always starts with an empty cache.
+'''
+import threading
+import collections
+
+
+class RecordCache:
+    DEFAULT_SIZE = 512
+
+    def __init__(self, data_file, key, size = DEFAULT_SIZE):
+        self.data_file = data_file
+        self.key = key
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._records = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, value):
+        '''
+            The record with key value, or None if there isn't one.
+        '''
+        cache_key = str(value)
+        with self._lock:
+            if cache_key in self._records:
+                self.hits += 1
+                self._records.move_to_end(cache_key)
+                return self._records[cache_key]
+            self.misses += 1
+
+        record = self._lookup(value)
+        with self._lock:
+            return self._store(cache_key, record)
+
+    def get_many(self, values):
+        '''
+            Dictionary of value -> record (None if not found) for a list
+            of values, each distinct value is looked up at most once.
+        '''
+        found = {}
+        missing = []
+        with self._lock:
+            for value in values:
+                if value in found:
+                    continue
+                cache_key = str(value)
+                if cache_key in self._records:
+                    self.hits += 1
+                    self._records.move_to_end(cache_key)
+                    found[value] = self._records[cache_key]
+                else:
+                    self.misses += 1
+                    found[value] = None
+                    missing.append(value)
+
+        if missing:
+            # One pass over the key index for all the misses
+            positions = self.data_file.key_positions_many(self.key, missing)
+            records = [self._record(positions[value]) for value in missing]
+            with self._lock:
+                for value, record in zip(missing, records):
+                    found[value] = self._store(str(value), record)
+        return found
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def get_statistics(self):
+        return {
+            'hits' : self.hits,
+            'misses' : self.misses,
+            'records' : len(self._records),
+            'size' : self.size
+        }
+
+    def __getstate__(self):
+        # Sent to another process empty, locks can't be pickled
+        state = self.__dict__.copy()
+        state['_records'] = collections.OrderedDict()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _lookup(self, value):
+        return self._record(self.data_file.key_positions(self.key, value))
+
+    def _record(self, positions):
+        if not len(positions):
+            return None
+        return self.data_file.make_record(self.data_file.data[positions[0]])
+
+    def _store(self, cache_key, record):
+        self._records[cache_key] = record
+        if len(self._records) > self.size:
+            # Drop the least recently used
+            self._records.popitem(last=False)
+        return record
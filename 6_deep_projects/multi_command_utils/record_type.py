@@ -0,0 +1,66 @@
+'''
+    Record classes for the rows a DataFile returns.
+
+    A data reader usually wraps each row it finds in an object so fields
+    can be read by name (result.grid rather than row[5]). Setting every
+    field with setattr, on an object that carries its own __dict__, is
+    slow and heavy when a search returns tens of thousands of rows.
+
+    record_type() builds a class with __slots__ for the fields and an
+    __init__ that takes the field values in order, generated once, the
+    same way collections.namedtuple builds its classes. Together with
+    field_getter() a row becomes a record in a single call :
+
+        Result = record_type('Result', ['raceId', 'grid'])
+        values = field_getter([2, 5])
+        result = Result(*values(row))
+
+    Deriving from the generated class (with __slots__ = ()) adds methods
+    without adding a __dict__.
+'''
+from operator import itemgetter
+
+
+def record_type(name, fields):
+    fields = tuple(fields)
+    for field in fields:
+        if not field.isidentifier() or field.startswith('_'):
+            raise Exception("Invalid record field name {}".format(field))
+
+    arguments = ", ".join(fields)
+    body = "".join("\n    self.{0} = {0}".format(field) for field in fields) or "\n    pass"
+    namespace = {}
+    exec("def __init__(self, {}):{}".format(arguments, body), namespace)
+
+    def __repr__(self):
+        values = ", ".join("{}={!r}".format(field, getattr(self, field)) for field in fields)
+        return "{}({})".format(type(self).__name__, values)
+
+    def __eq__(self, other):
+        if not isinstance(other, type(self)):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def _values(self):
+        return tuple(getattr(self, field) for field in fields)
+
+    return type(name, (object,), {
+        '__slots__' : fields,
+        '__init__' : namespace['__init__'],
+        '__repr__' : __repr__,
+        '__eq__' : __eq__,
+        '__hash__' : None,
+        '_values' : _values,
+        '_fields' : fields
+    })
+
+
+def field_getter(positions):
+    '''
+        Returns a function taking a row and returning the values at
+        positions, ready to be unpacked into a record. Like itemgetter,
+        but a single position still gives a sequence.
+    '''
+    if len(positions) == 1:
+        return itemgetter(slice(positions[0], positions[0] + 1))
+    return itemgetter(*positions)
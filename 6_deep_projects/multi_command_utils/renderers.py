@@ -0,0 +1,115 @@
+'''
+    Write the CommandResult returned by an IFunction (see 
+    tabular_result.py) to the console or a file.
+
+        TextRenderer :  Tables with a banner header, for the console
+        CsvRenderer :   Each table as CSV, messages and titles as # lines
+        JsonRenderer :  One JSON object per result
+
+    Every renderer writes the rows one at a time as they come from the
+    result, so a result whose rows are a generator is never held in 
+    memory as a whole.
+
+    EX:
+        renderer = RENDERERS['csv']()
+        renderer.render(function.execute(args))
+'''
+import csv
+import sys
+import json
+
+
+class TextRenderer:
+    def render(self, result, output = None):
+        output = output or sys.stdout
+        for message in result.messages:
+            output.write(message + "\n")
+        for table in result.tables:
+            self.render_table(table, output)
+
+    def render_table(self, table, output):
+        for line in table.title:
+            output.write(line + "\n")
+
+        widths = table.widths or TextRenderer._widths(table)
+        banner = '-' * (sum(widths) + len(widths) + 1)
+        output.write(banner + "\n")
+        output.write(TextRenderer.format_row(widths, table.columns, True) + "\n")
+        output.write(banner + "\n")
+        for row in table.rows:
+            output.write(TextRenderer.format_row(widths, row, False) + "\n")
+
+    @staticmethod
+    def format_row(widths, values, print_border):
+        border = '|' if print_border else ' '
+        buffer = ''
+        for idx in range(len(values)):
+            spacer = border if not len(buffer) else '|'
+            buffer += spacer + TextRenderer._text(values[idx]).center(widths[idx])
+        buffer += border
+        return buffer
+
+    @staticmethod
+    def _widths(table):
+        widths = [len(str(column)) + 2 for column in table.columns]
+        # Only rows already in a list, a generator would be used up
+        if isinstance(table.rows, (list, tuple)):
+            for row in table.rows:
+                for idx, value in enumerate(row):
+                    widths[idx] = max(widths[idx], len(TextRenderer._text(value)) + 2)
+        return widths
+
+    @staticmethod
+    def _text(value):
+        if value is None:
+            return ''
+        if isinstance(value, float):
+            return "{:g}".format(value)
+        return str(value)
+
+
+class CsvRenderer:
+    def render(self, result, output = None):
+        output = output or sys.stdout
+        writer = csv.writer(output, lineterminator="\n")
+        for message in result.messages:
+            output.write("# " + message + "\n")
+        for table_count, table in enumerate(result.tables):
+            if table_count:
+                # Blank line between tables
+                output.write("\n")
+            for line in table.title:
+                output.write("# " + line + "\n")
+            writer.writerow(table.columns)
+            for row in table.rows:
+                writer.writerow(['' if value is None else value for value in row])
+
+
+class JsonRenderer:
+    def render(self, result, output = None):
+        '''
+            Same as json.dumps(result.to_dict()) but written a row at a
+            time.
+        '''
+        output = output or sys.stdout
+        output.write('{"messages": ' + json.dumps(result.messages) + ', "tables": [')
+        for table_count, table in enumerate(result.tables):
+            if table_count:
+                output.write(', ')
+            output.write('{"title": ' + json.dumps(table.title))
+            output.write(', "columns": ' + json.dumps(table.columns))
+            output.write(', "widths": ' + json.dumps(table.widths))
+            output.write(', "rows": [')
+            for row_count, row in enumerate(table.rows):
+                if row_count:
+                    output.write(', ')
+                output.write(json.dumps(list(row), default=str))
+            output.write(']}')
+        output.write(']}\n')
+
+
+RENDERERS = {
+    'text' : TextRenderer,
+    'csv' : CsvRenderer,
+    'json' : JsonRenderer
+}
@@ -0,0 +1,263 @@
+'''
+    Saves the output of commands to disk so running the same command
+    again replays it instead of working it out from the data files.
+
+    An IFunction is wrapped with ResultCache.wrap(). When it is run the
+    command name and the parsed arguments (see 
+    IFunction._parse_execute_arguments) make up the key of the entry. 
+    A miss runs the function, printing as normal, while the printed
+    output and the result execute() returns (see tabular_result, its
+    rows are read and saved as a list) are kept. The entry
+    also records the size and modified time of every file behind the
+    datasets the command used, a hit is only replayed while those files
+    are unchanged so a changed CSV invalidates it. A command that raises
+    or returns nothing is not saved.
+
+    Entries are JSON files in one directory. A hit touches its file, when
+    the directory grows past max_bytes the least recently used entries
+    are removed.
+
+    EX:
+        results = ResultCache(os.path.join(data_directory, RESULT_CACHE_DIRECTORY))
+        app_functions = {
+            "stats" : results.wrap(DriverStats(datasets.for_command('get driver stats')))
+        }
+
+    NOTE:
+        The datasets used by a command are known from the DatasetRegistry
+        view passed to the function (see DatasetRegistry.for_command), 
+        with a plain dictionary every dataset in it is used. A dataset 
+        only counts if it has get_source_paths() (DataFile does).
+'''
+import os
+import sys
+import json
+import hashlib
+import tempfile
+from multi_command_utils import console
+from multi_command_utils.interface import IFunction
+from multi_command_utils.tabular_result import CommandResult
+
+RESULT_CACHE_DIRECTORY = '.result_cache'
+
+
+class ResultCache:
+    # Change whenever the format of an entry, or what a command
+    # returns, changes
+    SIGNATURE = 4
+    DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+    ENTRY_EXTENSION = '.json'
+
+    def __init__(self, directory, max_bytes = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+
+    def wrap(self, function, command = None):
+        '''
+            Returns an IFunction that answers from the cache, or runs
+            function. command defaults to the name given to the datasets
+            view of the function (DatasetRegistry.for_command).
+        '''
+        command = command or getattr(function.datasets, 'command', None)
+        if not command:
+            raise Exception("A command name is required to cache {}".format(type(function).__name__))
+        return CachedFunction(self, function, command)
+
+    def get(self, command, arguments):
+        '''
+            The saved entry (a dictionary with output and result) for a
+            command, or None if there isn't a current one.
+        '''
+        entry_path = self._entry_path(command, arguments)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as entry_file:
+                entry = json.load(entry_file)
+
+            if entry['signature'] != ResultCache.SIGNATURE:
+                return None
+            if entry['command'] != command or entry['arguments'] != ResultCache._normalize(arguments):
+                return None
+            for source_path, version in entry['sources'].items():
+                if ResultCache._version(source_path) != version:
+                    return None
+
+            # Most recently used
+            os.utime(entry_path)
+            return entry
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, damaged or a source file has gone
+            return None
+
+    def put(self, command, arguments, output, result, source_paths):
+        '''
+            result is CommandResult.to_dict(), or None.
+
+            Returns False if the entry could not be written (i.e. the
+            rows can't be saved as JSON or the directory is read only).
+        '''
+        entry = {
+            'signature' : ResultCache.SIGNATURE,
+            'command' : command,
+            'arguments' : ResultCache._normalize(arguments),
+            'sources' : {source_path : ResultCache._version(source_path) for source_path in source_paths},
+            'output' : output,
+            'result' : result
+        }
+
+        entry_path = self._entry_path(command, arguments)
+        temp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # A temp file of its own, so two processes saving the same
+            # entry never write into the same file
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(handle, 'w', encoding='utf-8') as entry_file:
+                json.dump(entry, entry_file)
+            os.replace(temp_path, entry_path)
+        except (OSError, TypeError, ValueError):
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+        self._evict()
+        return True
+
+    def clear(self):
+        for entry_path, _, _ in self._entries():
+            os.remove(entry_path)
+
+    def get_statistics(self):
+        entries = self._entries()
+        return {
+            'hits' : self.hits,
+            'misses' : self.misses,
+            'entries' : len(entries),
+            'bytes' : sum(size for _, size, _ in entries),
+            'max_bytes' : self.max_bytes
+        }
+
+    def _entries(self):
+        '''
+            (path, size, last used) of every entry.
+        '''
+        entries = []
+        try:
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if entry.name.endswith(ResultCache.ENTRY_EXTENSION) and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            pass
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        # Least recently used first
+        for entry_path, size, _ in sorted(entries, key=lambda entry : entry[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            total -= size
+
+    def _entry_path(self, command, arguments):
+        key = json.dumps([command, ResultCache._normalize(arguments)])
+        name = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.directory, name + ResultCache.ENTRY_EXTENSION)
+
+    @staticmethod
+    def _normalize(arguments):
+        '''
+            Parsed arguments as a sorted list of [name, value] so the
+            order they were typed in doesn't matter.
+        '''
+        normalized = []
+        for name in sorted(arguments.keys()):
+            value = arguments[name]
+            if isinstance(value, dict):
+                value = sorted([key, query_value] for key, query_value in value.items())
+            normalized.append([name, value])
+        return normalized
+
+    @staticmethod
+    def _version(source_path):
+        stat = os.stat(source_path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+
+class CachedFunction(IFunction):
+    '''
+        Stands in for an IFunction in the application menu, see 
+        ResultCache.wrap().
+    '''
+    def __init__(self, cache, function, command):
+        # Same arguments and datasets as the function, so help and 
+        # argument checks are unchanged
+        self.arguments = function.arguments
+        self.datasets = function.datasets
+        self.cache = cache
+        self.function = function
+        self.command = command
+
+    def execute(self, args):
+        try:
+            execute_args = self._parse_execute_arguments(args)
+        except Exception:
+            # Let the function report the bad arguments
+            return self.function.execute(args)
+
+        if not self.cache.enabled or IFunction.GLOBAL_HELP in execute_args.keys():
+            return self.function.execute(args)
+
+        entry = self.cache.get(self.command, execute_args)
+        if entry is not None:
+            self.cache.hits += 1
+            sys.stdout.write(entry['output'])
+            return CachedFunction._result(entry['result'])
+
+        self.cache.misses += 1
+        with console.capture_output(tee=True) as capture:
+            result = self.function.execute(args)
+            # Rows are read now, the result handed on is the saved copy
+            result = result.to_dict() if isinstance(result, CommandResult) else None
+
+        # Nothing returned means the command didn't run through
+        if result is not None:
+            self.cache.put(self.command, execute_args, capture.getvalue(), result, self._source_paths())
+        return CachedFunction._result(result)
+
+    @staticmethod
+    def _result(result):
+        return CommandResult.from_dict(result) if result is not None else None
+
+    def get_help(self, indent, command_list = None):
+        self.function.get_help(indent, command_list)
+
+    def _parse_execute_arguments(self, args):
+        return self.function._parse_execute_arguments(args)
+
+    def _source_paths(self):
+        datasets = self.datasets
+        if datasets is None:
+            return []
+
+        if hasattr(datasets, 'registry'):
+            # Only what the command used
+            used = [datasets.registry[key] for key in datasets.get_usage()]
+        else:
+            used = [datasets[key] for key in datasets.keys()]
+
+        source_paths = []
+        for dataset in used:
+            get_source_paths = getattr(dataset, 'get_source_paths', None)
+            if get_source_paths is not None:
+                source_paths.extend(path for path in get_source_paths() if path not in source_paths)
+        return source_paths
+
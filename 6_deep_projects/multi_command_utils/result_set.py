@@ -0,0 +1,62 @@
+'''
+    The rows found by a DataFile search.
+
+    A search used to return a list holding every matching row, and a data
+    reader then built a record object for each of them, even when the
+    caller only wanted to know how many rows matched or needed just the
+    first or last one. A ResultSet holds only the positions of the
+    matching rows. A row, turned into a record by DataFile.make_record(),
+    is built when it is asked for.
+'''
+
+
+class ResultSet:
+    '''
+        Behaves like a read only list of records (len, indexing, slicing
+        and iteration) over the rows of data_file at positions.
+
+        Records are not kept, asking for the same entry twice builds it
+        twice. Use to_list() if the records are needed more than once.
+    '''
+    def __init__(self, data_file, positions):
+        self.data_file = data_file
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ResultSet(self.data_file, self.positions[index])
+        return self.data_file.make_record(self.data_file.data[self.positions[index]])
+
+    def __iter__(self):
+        data = self.data_file.data
+        make_record = self.data_file.make_record
+        for position in self.positions:
+            yield make_record(data[position])
+
+    def __repr__(self):
+        return "ResultSet({}, {} rows)".format(self.data_file.file_name, len(self.positions))
+
+    def first(self):
+        '''
+            First record, or None if nothing matched.
+        '''
+        return self[0] if len(self.positions) else None
+
+    def last(self):
+        '''
+            Last record, or None if nothing matched.
+        '''
+        return self[-1] if len(self.positions) else None
+
+    def column(self, column_name):
+        '''
+            The values of a single column for every row in the set, no
+            records are built.
+        '''
+        return self.data_file.get_column_values(column_name, self.positions)
+
+    def to_list(self):
+        return list(self)
@@ -0,0 +1,78 @@
+'''
+    What an IFunction returns from execute() instead of printing.
+
+    A CommandResult is some lines of text (headings, messages) followed 
+    by any number of TabularResult tables. A table is its column names 
+    and its rows, each row a list of values (int, float, str or None) in
+    column order. rows can be a generator, the rows are then only worked
+    out as a renderer (see renderers.py) writes them, and can only be 
+    read once.
+
+    EX:
+        def execute(self, args):
+            ...
+            return CommandResult(
+                [TabularResult(["Year", "Driver Name"], self._champion_rows(...))],
+                ["Search All Years:"])
+'''
+
+
+class TabularResult:
+    '''
+        columns :   Names of the columns.
+        rows :      Iterable of rows.
+        widths :    Width of each column for text output, worked out from
+                    the column names (and the rows if they are a list) if
+                    not provided.
+        title :     Lines of text that go before the table.
+    '''
+    def __init__(self, columns, rows, widths = None, title = None):
+        self.columns = list(columns)
+        self.rows = rows
+        self.widths = widths
+        self.title = TabularResult._lines(title)
+
+    def to_dict(self):
+        '''
+            The table with every row read, i.e. for JSON.
+        '''
+        return {
+            'title' : self.title,
+            'columns' : self.columns,
+            'widths' : self.widths,
+            'rows' : [list(row) for row in self.rows]
+        }
+
+    @staticmethod
+    def from_dict(data):
+        return TabularResult(data['columns'], data['rows'], data['widths'], data['title'])
+
+    @staticmethod
+    def _lines(text):
+        if text is None:
+            return []
+        if isinstance(text, str):
+            return [text]
+        return list(text)
+
+
+class CommandResult:
+    '''
+        tables :    List of TabularResult.
+        messages :  Lines of text that go before the tables.
+    '''
+    def __init__(self, tables = None, messages = None):
+        self.tables = list(tables) if tables else []
+        self.messages = TabularResult._lines(messages)
+
+    def to_dict(self):
+        return {
+            'messages' : self.messages,
+            'tables' : [table.to_dict() for table in self.tables]
+        }
+
+    @staticmethod
+    def from_dict(data):
+        return CommandResult(
+            [TabularResult.from_dict(table) for table in data['tables']],
+            data['messages'])
@@ -0,0 +1,88 @@
+'''
+    Shared fixtures. Tests run from 6_deep_projects, the packages are
+    imported the same way the applications import them.
+'''
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SURNAMES = ['Hamilton', 'Häkkinen', 'Räikkönen', 'RÄIKKÖNEN', 'Hill', 'Senna', '"Smith, Jr"', 'hakkinen']
+TEAMS = ['Ferrari', 'McLaren', 'Williams']
+
+
+def result_rows(count = 60):
+    '''
+        Rows of the results file written by results_csv, the year is in 
+        blocks of 6 so each year is a contiguous run of rows.
+    '''
+    rows = []
+    for position in range(count):
+        rows.append([
+            str(position + 1),
+            SURNAMES[position % len(SURNAMES)].strip('"'),
+            str(2000 + position // 6),
+            TEAMS[position % len(TEAMS)],
+            str((position * 7) % 25)
+            ])
+    return rows
+
+
+@pytest.fixture
+def results_csv(tmp_path):
+    '''
+        (directory, file name) of a small UTF-8 results file.
+    '''
+    lines = ['resultId,surname,year,team,points']
+    for position, row_data in enumerate(result_rows()):
+        surname = SURNAMES[position % len(SURNAMES)]
+        lines.append(','.join([row_data[0], surname] + row_data[2:]))
+    (tmp_path / 'results.csv').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(tmp_path), 'results.csv'
+
+
+F1_RACES = [
+    'raceId,year,round,circuitId,name,date,time,url',
+    '1,2001,1,1,"Australian Grand Prix, Melbourne",2001-03-04,\\N,http://f1/1',
+    '2,2001,2,2,Malaysian Grand Prix,2001-03-18,\\N,http://f1/2',
+    '4,2002,2,2,Malaysian Grand Prix,2002-03-17,\\N,http://f1/4',
+    '3,2002,1,1,Australian Grand Prix,2002-03-03,\\N,http://f1/3',
+    '5,2002,10,3,Italian Grand Prix,2002-09-15,\\N,http://f1/5'
+    ]
+
+# raceId, driverId, constructorId, grid, position (\N for a DNF), points
+F1_RESULTS = [
+    (1, 1, 10, 1, 1, 10), (1, 2, 20, 2, '\\N', 0),
+    (2, 1, 10, 3, 2, 6), (2, 2, 20, 1, 1, 10),
+    (3, 1, 10, 2, 3, 4), (3, 2, 20, 5, 4, 3),
+    (4, 1, 10, 1, '\\N', 0), (4, 2, 20, 2, 1, 10),
+    (5, 2, 20, 1, 2, 6),
+    # A race missing from races.csv, counted in the career only
+    (99, 1, 10, 4, 5, 2)
+    ]
+
+
+def f1_result_line(result_id, race_id, driver_id, constructor_id, grid, position, points):
+    '''
+        A line of results.csv, the columns not used are filled in.
+    '''
+    return ','.join(str(value) for value in [
+        result_id, race_id, driver_id, constructor_id, driver_id, grid, position, position, result_id,
+        points, 50, '\\N', 5400000 + result_id, 30, 1, '1:30.0', '200.0', 1 if position != '\\N' else 5])
+
+
+@pytest.fixture
+def f1_directory(tmp_path):
+    '''
+        Folder holding a small races.csv and results.csv in the layout of
+        the Formula One data, two seasons and two drivers.
+    '''
+    directory = tmp_path / 'f1'
+    directory.mkdir()
+    (directory / 'races.csv').write_text('\n'.join(F1_RACES) + '\n', encoding='utf-8')
+    lines = ['resultId,raceId,driverId,constructorId,number,grid,position,positionText,positionOrder,points,laps,time,milliseconds,fastestLap,rank,fastestLapTime,fastestLapSpeed,statusId']
+    for result_id, result in enumerate(F1_RESULTS, 1):
+        lines.append(f1_result_line(result_id, *result))
+    (directory / 'results.csv').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(directory)
@@ -0,0 +1,79 @@
+import pytest
+from multi_command_utils.column_store import Column, ColumnStore
+from multi_command_utils.data_file import DataFile, column_data
+from conftest import result_rows
+
+HEADER = ['resultId', 'surname', 'year', 'team', 'points']
+
+
+def make_store(rows, schema = None):
+    store = ColumnStore(HEADER, schema)
+    for row_data in rows:
+        store.append(row_data)
+    return store.finish()
+
+
+def test_types_are_inferred():
+    rows = [['1', 'Hill', '1996', 'Williams', '9.5'], ['2', 'Senna', '', 'McLaren', '']]
+    store = make_store(rows)
+
+    assert store.get_schema() == {'resultId' : int, 'surname' : str, 'year' : int, 'team' : str, 'points' : float}
+    assert store[0] == [1, 'Hill', 1996, 'Williams', 9.5]
+    # Empty values are nulls
+    assert store[1] == [2, 'Senna', None, 'McLaren', None]
+    assert store.to_rows() == [['1', 'Hill', '1996', 'Williams', '9.5'], ['2', 'Senna', '', 'McLaren', '']]
+
+
+def test_schema_overrides_inference():
+    store = make_store(result_rows(), {'resultId' : int, 'points' : float})
+
+    assert store.get_schema()['year'] is str
+    assert store.get_schema()['points'] is float
+    assert len(store) == 60
+    assert store[-1] == [60, result_rows()[-1][1], '2009', 'Williams', float(result_rows()[-1][4])]
+    with pytest.raises(IndexError):
+        store[60]
+
+
+def test_text_is_dictionary_encoded():
+    column = Column(str)
+    column.extend(['Ferrari', 'McLaren', 'Ferrari', '', 'ferrari', 'Ferrari'])
+
+    assert column.dictionary == ['Ferrari', 'McLaren', 'ferrari']
+    assert list(column.values) == [0, 1, 0, 0, 2, 0]
+    assert column.to_list() == ['Ferrari', 'McLaren', 'Ferrari', None, 'ferrari', 'Ferrari']
+    # Matched on codes, case folded, the null stored as code 0 isn't a hit
+    assert column.match('FERRARI') == [0, 2, 4, 5]
+    assert column.match('') == [3]
+    assert column.build_index() == {'ferrari' : [0, 2, 4, 5], 'mclaren' : [1], None : [3]}
+
+
+def test_numeric_column():
+    column = Column(int)
+    column.extend(['3', '1', '', '3'])
+
+    assert column.match(3) == [0, 3]
+    assert column.match('3.0') == [0, 3]
+    assert column.match('three') == []
+    assert list(column.numbers()) == [3, 1, 3]
+    with pytest.raises(Exception):
+        Column(str).numbers()
+    with pytest.raises(Exception):
+        Column(bytes)
+
+
+def test_short_row_is_rejected():
+    with pytest.raises(Exception):
+        ColumnStore(HEADER).append(['1', 'Hill'])
+
+
+def test_columnar_file_matches_rows(results_csv):
+    directory, file_name = results_csv
+    rows = DataFile(directory, file_name, use_cache=False, encoding='utf-8')
+    columnar = DataFile(directory, file_name, ['team'], storage=DataFile.COLUMNAR_STORAGE, use_cache=False, encoding='utf-8')
+
+    assert isinstance(columnar.data, ColumnStore)
+    assert columnar.data.to_rows() == rows.data
+    for search in ([column_data('team', 'mclaren')], [column_data('year', '2004'), column_data('surname', 'hill')]):
+        assert list(columnar.find_positions(search)) == list(rows.find_positions(search))
+    assert columnar.aggregate('points', 'sum') == sum(int(row_data[4]) for row_data in result_rows())
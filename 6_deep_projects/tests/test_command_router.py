@@ -0,0 +1,98 @@
+from multi_command_utils.command_router import CommandRouter
+from multi_command_utils.interface_dummy import DummyFunction
+from multi_command_utils.multi_command_application import MultiCommandApp
+
+STATS = DummyFunction({})
+STANDINGS = DummyFunction({})
+CONSTRUCTOR = DummyFunction({})
+RACES = DummyFunction({})
+
+
+def quit_app():
+    pass
+
+
+MENU = {
+    "get" : {
+        "driver" : {
+            "stats" : STATS,
+            "standings" : STANDINGS
+        },
+        "constructor" : {
+            "standings" : CONSTRUCTOR
+        }
+    },
+    "list" : {
+        "races" : RACES
+    },
+    "quit" : quit_app
+}
+
+
+def route(command):
+    return CommandRouter(MENU).route(command.split(' '))
+
+
+def test_full_names():
+    found = route("get driver stats -i 102")
+
+    assert found.error is None
+    assert found.action is STATS
+    assert found.path == ['get', 'driver', 'stats']
+    assert found.arguments == ['-i', '102']
+
+
+def test_unique_prefixes():
+    found = route("g d stat -i 102")
+
+    assert found.action is STATS
+    assert found.path == ['get', 'driver', 'stats']
+    assert route("g c s -y 2010").action is CONSTRUCTOR
+    assert route("q").action is quit_app
+
+
+def test_ambiguous_prefix():
+    found = route("get driver st -i 102")
+
+    assert found.error == CommandRouter.AMBIGUOUS
+    assert found.action is None
+    assert found.word == 'st'
+    assert CommandRouter(MENU).candidates(found.node, found.word) == ['stats', 'standings']
+
+
+def test_full_name_wins_over_longer_name():
+    router = CommandRouter({"race" : RACES, "races" : STATS})
+
+    assert router.route(["race"]).action is RACES
+    assert router.route(["races"]).action is STATS
+
+
+def test_incomplete_command():
+    found = route("get driver")
+
+    assert found.error == CommandRouter.INCOMPLETE
+    assert found.node.path == ['get', 'driver']
+    assert found.word == 'driver'
+
+
+def test_invalid_command():
+    found = route("get pilot stats")
+
+    assert found.error == CommandRouter.INVALID
+    assert found.word == 'pilot'
+    assert found.path == ['get']
+
+
+def test_help_is_rendered_once():
+    router = CommandRouter(MENU)
+    node = router.route(["get"]).node
+
+    assert node.help_lines() is node.help_lines()
+    assert router.help_text(node, 'get').startswith(router.help_text().split('\n')[0])
+
+
+def test_application_reports_ambiguous_command(capsys):
+    app = MultiCommandApp("Test", dict(MENU))
+    app.execute("get driver st")
+
+    assert capsys.readouterr().out.startswith("Ambiguous Command : st could be stats, standings\n")
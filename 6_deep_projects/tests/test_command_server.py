@@ -0,0 +1,100 @@
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from multi_command_utils.command_server import CommandServer
+from multi_command_utils.interface import IFunction, argument_definition
+from multi_command_utils.multi_command_application import MultiCommandApp
+from multi_command_utils.tabular_result import CommandResult, TabularResult
+
+
+class Standings(IFunction):
+    def __init__(self, datasets):
+        super().__init__(datasets, [argument_definition('-y',True, 'Year')])
+
+    def execute(self, args):
+        execute_args = super()._parse_execute_arguments(args)
+        print("Season {}".format(execute_args['-y']))
+        return CommandResult(
+            [TabularResult(["Position", "Driver"], [[1, "Senna"], [2, "Prost"]], title="Final")],
+            ["Standings {}".format(execute_args['-y'])])
+
+
+def exchange(requests):
+    '''
+        Sends the raw requests, one after another, over one connection
+        to a CommandServer and returns (status, headers, JSON body) of
+        each response.
+    '''
+    app = MultiCommandApp("Test", {"get" : {"driver" : {"standings" : Standings({})}}})
+    server = CommandServer(app)
+
+    async def run():
+        server._executor = ThreadPoolExecutor(max_workers=2)
+        listener = await asyncio.start_server(server._connection, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        responses = []
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            for request in requests:
+                writer.write(request)
+                await writer.drain()
+
+                status = int((await reader.readline()).split()[1])
+                headers = {}
+                line = (await reader.readline()).decode('latin-1').strip()
+                while line:
+                    name, _, value = line.partition(':')
+                    headers[name.lower()] = value.strip()
+                    line = (await reader.readline()).decode('latin-1').strip()
+                body = await reader.readexactly(int(headers['content-length']))
+                responses.append((status, headers, json.loads(body)))
+            writer.close()
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            server._executor.shutdown()
+        return responses
+
+    return asyncio.run(run())
+
+
+def test_request_response_round_trip():
+    responses = exchange([
+        b"GET /get/driver/standings?y=1988 HTTP/1.1\r\nHost: localhost\r\n\r\n",
+        b'POST /g/d/s HTTP/1.1\r\nHost: localhost\r\nContent-Length: 12\r\nConnection: close\r\n\r\n{"y" : 1989}'
+        ])
+
+    status, headers, response = responses[0]
+    assert status == 200
+    assert headers['connection'] == 'keep-alive'
+    assert response == {
+        'command' : 'get driver standings',
+        'arguments' : {'y' : '1988'},
+        'messages' : ['Standings 1988'],
+        'tables' : [{'title' : ['Final'], 'columns' : ['Position', 'Driver'], 'widths' : None, 'rows' : [[1, 'Senna'], [2, 'Prost']]}],
+        'output' : 'Season 1988\n',
+        'error' : None
+    }
+
+    # Same connection, shortened path and JSON arguments
+    status, headers, response = responses[1]
+    assert status == 200
+    assert headers['connection'] == 'close'
+    assert response['messages'] == ['Standings 1989']
+
+
+def test_errors():
+    responses = exchange([
+        b"GET /get/driver/standings HTTP/1.1\r\n\r\n",
+        b"GET /get/driver/stats HTTP/1.1\r\n\r\n",
+        b"GET / HTTP/1.1\r\n\r\n"
+        ])
+
+    status, _, response = responses[0]
+    assert status == 400
+    assert response['error']
+    assert response['tables'] == []
+
+    assert responses[1][0] == 404
+    assert responses[2][0] == 200
+    assert responses[2][2] == {'endpoints' : {'/get/driver/standings' : ['y', 'h', 'q']}}
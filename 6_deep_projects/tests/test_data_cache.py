@@ -0,0 +1,96 @@
+import os
+import pytest
+from multi_command_utils import data_cache
+from multi_command_utils.data_file import DataFile, column_data
+
+STORAGES = [DataFile.ROW_STORAGE, DataFile.COLUMNAR_STORAGE]
+
+
+def open_file(results_csv, storage):
+    directory, file_name = results_csv
+    return DataFile(directory, file_name, ['team'], storage=storage, use_cache=True, encoding='utf-8')
+
+
+def csv_path(results_csv):
+    return os.path.join(*results_csv)
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+def test_snapshot_round_trip(results_csv, storage):
+    parsed = open_file(results_csv, storage)
+    assert not parsed.loaded_from_cache
+    assert os.path.exists(data_cache.cache_path(csv_path(results_csv)))
+
+    cached = open_file(results_csv, storage)
+    assert cached.loaded_from_cache
+    assert cached.header == parsed.header
+    assert [list(row_data) for row_data in cached.data] == [list(row_data) for row_data in parsed.data]
+    assert list(cached.find_positions([column_data('team', 'williams')])) == list(parsed.find_positions([column_data('team', 'williams')]))
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+def test_changed_source_is_parsed_again(results_csv, storage):
+    rows = len(open_file(results_csv, storage).data)
+
+    with open(csv_path(results_csv), 'a', encoding='utf-8') as source:
+        source.write('61,Senna,2010,Lotus,12\n')
+
+    changed = open_file(results_csv, storage)
+    assert not changed.loaded_from_cache
+    assert len(changed.data) == rows + 1
+    assert len(changed.find([column_data('team', 'lotus')])) == 1
+
+    # And the snapshot was rewritten for the new file
+    assert open_file(results_csv, storage).loaded_from_cache
+
+
+def rewrite(results_csv, old, new, mtime_ns):
+    path = csv_path(results_csv)
+    with open(path, 'r', encoding='utf-8') as source:
+        text = source.read()
+    with open(path, 'w', encoding='utf-8') as source:
+        source.write(text.replace(old, new))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_same_size_edit_is_detected(results_csv):
+    open_file(results_csv, DataFile.ROW_STORAGE)
+
+    # Same size, a new modified time, so the hash is checked
+    rewrite(results_csv, 'Ferrari', 'Ferrarj', os.stat(csv_path(results_csv)).st_mtime_ns + 1000)
+
+    changed = open_file(results_csv, DataFile.ROW_STORAGE)
+    assert not changed.loaded_from_cache
+    assert len(changed.find([column_data('team', 'ferrari')])) == 0
+
+
+def test_touched_file_reuses_snapshot(results_csv):
+    open_file(results_csv, DataFile.ROW_STORAGE)
+
+    rewrite(results_csv, 'Ferrari', 'Ferrari', os.stat(csv_path(results_csv)).st_mtime_ns + 1000)
+
+    assert open_file(results_csv, DataFile.ROW_STORAGE).loaded_from_cache
+
+
+def test_unchanged_size_and_time_are_trusted(results_csv, monkeypatch):
+    open_file(results_csv, DataFile.ROW_STORAGE)
+
+    def no_hash(file_path):
+        raise AssertionError("source hashed")
+    monkeypatch.setattr(data_cache, 'source_fingerprint', no_hash)
+
+    assert open_file(results_csv, DataFile.ROW_STORAGE).loaded_from_cache
+
+
+def test_cache_is_off_by_default(results_csv):
+    directory, file_name = results_csv
+    data_file = DataFile(directory, file_name)
+
+    assert not data_file.use_cache
+    assert not os.path.exists(data_cache.cache_path(csv_path(results_csv)))
+
+
+def test_different_settings_do_not_share_a_snapshot(results_csv):
+    open_file(results_csv, DataFile.ROW_STORAGE)
+
+    assert data_cache.load_snapshot(csv_path(results_csv), 'another signature') is None
@@ -0,0 +1,76 @@
+import pytest
+from multi_command_utils.data_file import DataFile, column_data, column_compare
+from conftest import result_rows
+
+STORAGES = [DataFile.ROW_STORAGE, DataFile.COLUMNAR_STORAGE, DataFile.MAPPED_STORAGE]
+COLUMNS = ['resultId', 'surname', 'year', 'team', 'points']
+
+# (search, test of a row worked out by hand)
+SEARCHES = [
+    ([column_compare('year', DataFile.BETWEEN, (2002, 2004))], lambda row : 2002 <= int(row['year']) <= 2004),
+    ([column_compare('points', DataFile.GREATER_EQUAL, 20)], lambda row : int(row['points']) >= 20),
+    ([column_compare('points', DataFile.LESS, 5)], lambda row : int(row['points']) < 5),
+    ([column_compare('points', DataFile.GREATER, 24)], lambda row : False),
+    ([column_compare('surname', DataFile.PREFIX, 'HA')], lambda row : row['surname'].casefold().startswith('ha')),
+    ([column_compare('surname', DataFile.PREFIX, 'rä')], lambda row : row['surname'].casefold().startswith('rä')),
+    ([column_compare('team', DataFile.IN, ['Ferrari', 'williams'])], lambda row : row['team'] in ('Ferrari', 'Williams')),
+    (
+        [column_compare('year', DataFile.LESS_EQUAL, 2003), column_compare('surname', DataFile.PREFIX, 'h'), column_data('team', 'McLaren')],
+        lambda row : int(row['year']) <= 2003 and row['surname'].casefold().startswith('h') and row['team'] == 'McLaren'
+    )
+    ]
+
+
+def expected_positions(matches):
+    return [
+        position
+        for
+        position, row_data in enumerate(result_rows())
+        if matches(dict(zip(COLUMNS, row_data)))
+        ]
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+@pytest.mark.parametrize('sorted_columns', [None, ['year', 'points', 'surname']])
+@pytest.mark.parametrize('column_data_list, matches', SEARCHES)
+def test_compare_matches_across_storage(results_csv, storage, sorted_columns, column_data_list, matches):
+    directory, file_name = results_csv
+    data_file = DataFile(directory, file_name, ['team'], sorted_columns=sorted_columns, storage=storage, use_cache=False, encoding='utf-8')
+    with data_file:
+        assert list(data_file.find_positions(column_data_list)) == expected_positions(matches)
+
+
+def test_sorted_index_answers_range(results_csv):
+    directory, file_name = results_csv
+    data_file = DataFile(directory, file_name, sorted_columns=['year'], use_cache=False, encoding='utf-8')
+    steps = data_file.plan([column_compare('year', DataFile.BETWEEN, (2002, 2004)), column_data('team', 'Ferrari')])
+
+    assert [(step.column.id, step.method) for step in steps] == [('year', 'index'), ('team', 'filter')]
+    assert steps[0].estimate == 18
+
+
+def test_sorted_index_built_on_first_use(results_csv):
+    directory, file_name = results_csv
+    data_file = DataFile(directory, file_name, ['team'], sorted_columns=['year'], use_cache=False, encoding='utf-8')
+    assert data_file.sorted_indexes == {}
+
+    data_file.find_positions([column_data('team', 'Ferrari')])
+    assert data_file.sorted_indexes == {}
+
+    data_file.find_positions([column_compare('year', DataFile.GREATER, 2005)])
+    assert list(data_file.sorted_indexes.keys()) == ['year']
+
+
+@pytest.mark.parametrize('sorted_columns', [None, ['year']])
+@pytest.mark.parametrize('operator, value', [
+    (DataFile.BETWEEN, 2003),
+    (DataFile.BETWEEN, (2001, 2002, 2003)),
+    (DataFile.BETWEEN, '20'),
+    ('~', 2003)
+    ])
+def test_bad_compare_raises(results_csv, sorted_columns, operator, value):
+    directory, file_name = results_csv
+    data_file = DataFile(directory, file_name, sorted_columns=sorted_columns, use_cache=False, encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        data_file.find_positions([column_compare('year', operator, value)])
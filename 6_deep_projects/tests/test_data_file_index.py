@@ -0,0 +1,73 @@
+import pickle
+import pytest
+from multi_command_utils.data_file import DataFile, column_data
+
+STORAGES = [DataFile.ROW_STORAGE, DataFile.COLUMNAR_STORAGE, DataFile.MAPPED_STORAGE]
+SEARCHES = [
+    ('team', 'ferrari'),
+    ('year', '2003'),
+    ('surname', 'räikkönen'),
+    ('surname', 'Smith, Jr'),
+    ('team', 'Lotus')
+    ]
+
+
+def open_file(results_csv, storage, indexed_columns = None):
+    directory, file_name = results_csv
+    return DataFile(directory, file_name, indexed_columns, storage=storage, use_cache=False, encoding='utf-8')
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+@pytest.mark.parametrize('column, value', SEARCHES)
+def test_indexed_find_matches_scan(results_csv, storage, column, value):
+    scanned = open_file(results_csv, DataFile.ROW_STORAGE)
+    expected = list(scanned.find_positions([column_data(column, value)]))
+
+    with open_file(results_csv, storage, [column]) as indexed:
+        assert indexed.get_index(column) is not None
+        assert list(indexed.find_positions([column_data(column, value)])) == expected
+
+
+def test_case_folded_matches(results_csv):
+    data_file = open_file(results_csv, DataFile.ROW_STORAGE, ['surname'])
+    found = data_file.find([column_data('surname', 'RÄIKKÖNEN')])
+
+    assert [row_data[0] for row_data in found] == ['3', '4', '11', '12', '19', '20', '27', '28', '35', '36', '43', '44', '51', '52', '59', '60']
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+def test_contiguous_postings_are_ranges(results_csv, storage):
+    with open_file(results_csv, storage, ['year']) as data_file:
+        positions = data_file.key_positions('year', '2003')
+
+    assert positions == range(18, 24)
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+def test_rows_match_across_storage(results_csv, storage):
+    rows = open_file(results_csv, DataFile.ROW_STORAGE).find([column_data('team', 'McLaren')])
+
+    with open_file(results_csv, storage, ['team']) as data_file:
+        found = data_file.find([column_data('team', 'McLaren')])
+        assert [[str(value) for value in row_data] for row_data in found] == [list(row_data) for row_data in rows]
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+def test_pickled_file_rebuilds_indexes(results_csv, storage):
+    with open_file(results_csv, storage, ['team', 'year']) as data_file:
+        state = data_file.__getstate__()
+        if storage != DataFile.MAPPED_STORAGE:
+            # Only the names travel, not the index dictionaries
+            assert state['indexes'] == ['team', 'year']
+            assert isinstance(state['data'], bytes)
+
+        received = pickle.loads(pickle.dumps(data_file))
+        try:
+            assert received.indexes.keys() == data_file.indexes.keys()
+            for column_name in ['team', 'year']:
+                assert {key : list(positions) for key, positions in received.get_index(column_name).items()} == \
+                    {key : list(positions) for key, positions in data_file.get_index(column_name).items()}
+            search = [column_data('team', 'williams'), column_data('year', '2004')]
+            assert list(received.find_positions(search)) == list(data_file.find_positions(search))
+        finally:
+            received.close()
@@ -0,0 +1,96 @@
+import os
+import csv
+import functools
+import pytest
+from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.dataset_registry import DatasetRegistry
+from conftest import result_rows
+
+STORAGES = [DataFile.ROW_STORAGE, DataFile.COLUMNAR_STORAGE, DataFile.MAPPED_STORAGE]
+
+
+def test_load_statistics(results_csv):
+    directory, file_name = results_csv
+    data_file = DataFile(directory, file_name, use_cache=False, encoding='utf-8')
+
+    stats = data_file.load_statistics
+    assert stats['source'] == 'csv'
+    assert stats['rows'] == len(result_rows())
+    assert stats['bytes'] == os.path.getsize(os.path.join(directory, file_name))
+    assert stats['seconds'] >= 0
+
+    description = data_file.describe_load()
+    assert description.startswith("{}: {} rows".format(file_name, len(result_rows())))
+    assert "from csv in" in description and "rows/s" in description and "MB/s" in description
+
+
+def test_load_statistics_name_the_source(results_csv):
+    directory, file_name = results_csv
+    DataFile(directory, file_name, use_cache=True, encoding='utf-8')
+
+    assert DataFile(directory, file_name, use_cache=True, encoding='utf-8').load_statistics['source'] == 'cache'
+    with DataFile(directory, file_name, storage=DataFile.MAPPED_STORAGE, encoding='utf-8') as mapped:
+        assert mapped.load_statistics['source'] == 'mapped'
+
+
+def test_registry_describes_loaded_files(results_csv):
+    directory, file_name = results_csv
+    registry = DatasetRegistry()
+    registry.register('results', functools.partial(DataFile, directory, file_name, use_cache=False, encoding='utf-8'))
+    registry.register('unused', functools.partial(DataFile, directory, file_name, use_cache=False, encoding='utf-8'))
+
+    assert registry.describe_loads() == []
+    registry['results']
+    descriptions = registry.describe_loads()
+    assert len(descriptions) == 1
+    assert descriptions[0].startswith(file_name)
+
+
+def write_file(tmp_path, lines, encoding, file_name = 'drivers.csv'):
+    (tmp_path / file_name).write_bytes('\n'.join(lines).encode(encoding) + b'\n')
+    return str(tmp_path), file_name
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+def test_dialect_and_null_marker(tmp_path, storage):
+    directory, file_name = write_file(
+        tmp_path,
+        ['driverId;surname;number', '1;"Hill; Damon";5', '2;Senna;\\N', '3;\\N;7'],
+        'utf-8')
+
+    with DataFile(directory, file_name, storage=storage, use_cache=False, dialect='excel', null_marker='\\N') as data_file:
+        assert data_file.get_headers() == ['driverId;surname;number']
+
+    class SemiColon(csv.excel):
+        delimiter = ';'
+
+    with DataFile(directory, file_name, ['number'], storage=storage, use_cache=False, dialect=SemiColon, null_marker='\\N') as data_file:
+        assert data_file.get_headers() == ['driverId', 'surname', 'number']
+        assert data_file.get_column_values('surname', [0]) == ['Hill; Damon']
+        # The null marker reads as an empty value
+        assert list(data_file.find_positions([column_data('number', '')])) == [1]
+        # Typed columns keep an empty value as None
+        empty = None if storage == DataFile.COLUMNAR_STORAGE else ''
+        assert data_file.get_column_values('surname', [2]) == [empty]
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+def test_encoding(tmp_path, storage):
+    directory, file_name = write_file(tmp_path, ['driverId,surname', '1,Räikkönen', '2,Häkkinen'], 'latin-1')
+
+    with DataFile(directory, file_name, storage=storage, use_cache=False, encoding='latin-1') as data_file:
+        assert data_file.get_column_values('surname', [0, 1]) == ['Räikkönen', 'Häkkinen']
+        assert list(data_file.find_positions([column_data('surname', 'häkkinen')])) == [1]
+
+
+def test_class_attributes_are_the_defaults(tmp_path):
+    directory, file_name = write_file(tmp_path, ['driverId|surname', '1|Räikkönen', '2|\\N'], 'utf-8')
+
+    class PipeFile(DataFile):
+        DIALECT = type('Pipe', (csv.excel,), {'delimiter' : '|'})
+        ENCODING = 'utf-8'
+        NULL_MARKER = '\\N'
+
+    data_file = PipeFile(directory, file_name, use_cache=False)
+    assert data_file.get_headers() == ['driverId', 'surname']
+    assert data_file.get_column_values('surname', [0, 1]) == ['Räikkönen', '']
@@ -0,0 +1,84 @@
+import pytest
+from multi_command_utils.data_file import DataFile, column_data, column_compare
+from conftest import result_rows
+
+STORAGES = [DataFile.ROW_STORAGE, DataFile.COLUMNAR_STORAGE, DataFile.MAPPED_STORAGE]
+
+
+def open_file(results_csv, storage, indexed_columns = None):
+    directory, file_name = results_csv
+    return DataFile(directory, file_name, indexed_columns, storage=storage, use_cache=False, encoding='utf-8')
+
+
+def expected_positions(**values):
+    '''
+        Positions of the rows holding every value, worked out by hand.
+    '''
+    columns = ['resultId', 'surname', 'year', 'team', 'points']
+    return [
+        position
+        for
+        position, row_data in enumerate(result_rows())
+        if all(row_data[columns.index(name)].casefold() == str(value).casefold() for name, value in values.items())
+        ]
+
+
+def test_indexed_predicate_runs_first(results_csv):
+    data_file = open_file(results_csv, DataFile.ROW_STORAGE, ['year'])
+    steps = data_file.plan([column_data('team', 'Ferrari'), column_data('year', '2004')])
+
+    assert [(step.column.id, step.method) for step in steps] == [('year', 'index'), ('team', 'filter')]
+    assert steps[0].estimate == 6
+
+
+def test_larger_posting_list_filters_what_is_left(results_csv):
+    data_file = open_file(results_csv, DataFile.ROW_STORAGE, ['year', 'team'])
+    steps = data_file.plan([column_data('team', 'Ferrari'), column_data('year', '2004')])
+
+    assert [(step.column.id, step.method) for step in steps] == [('year', 'index'), ('team', 'filter')]
+
+
+def test_small_posting_list_is_intersected(results_csv):
+    data_file = open_file(results_csv, DataFile.ROW_STORAGE, ['resultId', 'surname'])
+    column_data_list = [
+        column_data('surname', 'Hamilton'),
+        column_compare('resultId', DataFile.IN, [str(result_id) for result_id in range(1, 9)])
+        ]
+    steps = data_file.plan(column_data_list)
+
+    # 8 rows each, the second is no bigger than what the first leaves
+    assert [step.method for step in steps] == ['index', 'intersect']
+    assert list(data_file.find_positions(column_data_list)) == [0]
+
+
+def test_unindexed_predicates_ordered_by_estimate(results_csv):
+    data_file = open_file(results_csv, DataFile.ROW_STORAGE)
+    steps = data_file.plan([column_data('team', 'Ferrari'), column_data('resultId', '7')])
+
+    # resultId is unique so it is expected to keep a single row
+    assert [(step.column.id, step.method) for step in steps] == [('resultId', 'scan'), ('team', 'filter')]
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+@pytest.mark.parametrize('indexed_columns', [None, ['year'], ['year', 'team', 'surname']])
+def test_find_matches_across_storage_and_plans(results_csv, storage, indexed_columns):
+    searches = [
+        {'team' : 'williams', 'year' : '2001'},
+        {'surname' : 'häkkinen', 'team' : 'McLaren'},
+        {'year' : '2005', 'team' : 'Ferrari', 'surname' : 'Senna'},
+        {'year' : '1999', 'team' : 'Ferrari'}
+        ]
+    with open_file(results_csv, storage, indexed_columns) as data_file:
+        for search in searches:
+            column_data_list = [column_data(name, value) for name, value in search.items()]
+            assert list(data_file.find_positions(column_data_list)) == expected_positions(**search)
+            assert list(data_file.find_positions(list(reversed(column_data_list)))) == expected_positions(**search)
+
+
+def test_explain_describes_each_step(results_csv):
+    data_file = open_file(results_csv, DataFile.ROW_STORAGE, ['year'])
+    lines = data_file.explain([column_data('team', 'Ferrari'), column_data('year', '2004')]).split('\n')
+
+    assert lines[0] == "Search results.csv (60 rows, rows storage)"
+    assert lines[1].split()[:3] == ['1.', 'index', 'year']
+    assert lines[2].split()[:3] == ['2.', 'filter', 'team']
@@ -0,0 +1,54 @@
+import pytest
+from multi_command_utils.data_file import DataFile, column_data, column_compare
+from conftest import result_rows
+
+SEARCHES = [
+    [column_data('team', 'ferrari')],
+    [column_data('surname', 'räikkönen'), column_data('year', '2001')],
+    [column_data('surname', 'Smith, Jr')],
+    [column_compare('year', DataFile.BETWEEN, (2003, 2005)), column_data('team', 'Williams')],
+    [column_compare('surname', DataFile.PREFIX, 'h')],
+    [column_data('team', 'Lotus')],
+    []
+    ]
+
+
+def open_file(results_csv, streaming):
+    directory, file_name = results_csv
+    return DataFile(directory, file_name, ['team'], streaming=streaming, use_cache=False, encoding='utf-8')
+
+
+def test_streaming_holds_no_rows(results_csv):
+    data_file = open_file(results_csv, True)
+
+    assert data_file.get_headers() == ['resultId', 'surname', 'year', 'team', 'points']
+    assert data_file.data == []
+    assert data_file.get_index('team') is None
+    with pytest.raises(Exception):
+        data_file.create_index('team')
+
+
+def test_iter_rows_reads_the_file(results_csv):
+    data_file = open_file(results_csv, True)
+    assert list(data_file.iter_rows()) == result_rows()
+
+    # Nothing was kept, a changed file is read again
+    directory, file_name = results_csv
+    with open('{}/{}'.format(directory, file_name), 'a', encoding='utf-8') as results_file:
+        results_file.write('61,Prost,2010,McLaren,9\n')
+    assert list(data_file.iter_rows())[-1] == ['61', 'Prost', '2010', 'McLaren', '9']
+
+
+@pytest.mark.parametrize('search', SEARCHES)
+def test_iter_find_matches_find(results_csv, search):
+    expected = [list(row_data) for row_data in open_file(results_csv, False).iter_find(search)]
+
+    assert [list(row_data) for row_data in open_file(results_csv, True).iter_find(search)] == expected
+
+
+def test_iter_find_is_lazy(results_csv):
+    found = open_file(results_csv, True).iter_find([column_data('team', 'McLaren')])
+
+    assert next(found) == result_rows()[1]
+    assert next(found) == result_rows()[4]
+    found.close()
@@ -0,0 +1,77 @@
+import pytest
+from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.data_join import join, join_on, semi_join, distinct
+from multi_command_utils.record_type import record_type, field_getter
+from conftest import result_rows
+
+
+class RecordFile(DataFile):
+    '''
+        Hands out records with a field per column.
+    '''
+    def header_loaded(self):
+        self.record_class = record_type('Record', self.header)
+        self.record_values = field_getter(list(range(len(self.header))))
+
+    def make_record(self, row_data):
+        return self.record_class(*self.record_values(row_data))
+
+
+@pytest.fixture
+def files(results_csv):
+    directory, file_name = results_csv
+    with open('{}/teams.csv'.format(directory), 'w', encoding='utf-8') as teams_file:
+        teams_file.write('team,country\nFerrari,Italy\nMcLaren,England\nFerrari,Duplicate\n')
+    results = RecordFile(directory, file_name, use_cache=False, encoding='utf-8')
+    teams = RecordFile(directory, 'teams.csv', use_cache=False, encoding='utf-8')
+    return results, teams
+
+
+def count_lookups(data_file, monkeypatch):
+    lookups = []
+    key_positions = data_file.key_positions
+    def counted(column_name, value):
+        lookups.append(value)
+        return key_positions(column_name, value)
+    monkeypatch.setattr(data_file, 'key_positions', counted)
+    return lookups
+
+
+def test_join_adds_the_matching_record(files, monkeypatch):
+    results, teams = files
+    lookups = count_lookups(teams, monkeypatch)
+
+    rows = results.find([column_data('year', '2001')])
+    joined = join(rows, [join_on('team', teams, 'team', 'team')], 'result')
+
+    assert [row.result.resultId for row in joined] == [row_data[0] for row_data in result_rows()[6:12]]
+    for row in joined:
+        if row.result.team == 'Williams':
+            assert row.team is None
+        else:
+            # First in file order when the key is in the file twice
+            assert row.team.team == row.result.team
+            assert row.team.country == {'Ferrari' : 'Italy', 'McLaren' : 'England'}[row.result.team]
+    # Each distinct key looked up once
+    assert sorted(lookups) == ['Ferrari', 'McLaren', 'Williams']
+
+
+def test_join_of_nothing(files):
+    results, teams = files
+    assert join(results.find([column_data('year', '1950')]), [join_on('team', teams, 'team', 'team')]) == []
+
+
+def test_semi_join(files, monkeypatch):
+    results, _ = files
+    lookups = count_lookups(results, monkeypatch)
+
+    found = semi_join(results, 'year', ['2003', '2001', '2003', '1950'])
+
+    expected = [row_data[0] for row_data in result_rows()[18:24] + result_rows()[6:12]]
+    assert [result.resultId for result in found] == expected
+    assert found.column('year') == ['2003'] * 6 + ['2001'] * 6
+    assert lookups == ['2003', '2001', '1950']
+
+
+def test_distinct_keeps_first_order():
+    assert distinct(['b', 'a', 'b', 'c', 'a']) == ['b', 'a', 'c']
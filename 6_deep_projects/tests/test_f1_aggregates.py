@@ -0,0 +1,61 @@
+import os
+from Formula1.f1_data_readers.Aggregates import CareerAggregates, AGGREGATES_FILE, EMPTY_CAREER, career
+from Formula1.f1_data_readers.Results import ResultsDataFile
+from Formula1.f1_data_readers.Races import RacesDataFile
+from conftest import f1_result_line, F1_RESULTS
+
+
+def test_career_totals(f1_directory):
+    aggregates = CareerAggregates(f1_directory)
+
+    assert aggregates.driver(1) == career(5, 3, 1, 2, 3, 1, 22.0)
+    assert aggregates.driver('2') == career(5, 3, 2, 2, 4, 1, 29.0)
+    assert aggregates.constructor(10) == aggregates.driver(1)
+    assert aggregates.constructor(20) == aggregates.driver(2)
+    assert aggregates.driver(3) == EMPTY_CAREER
+
+
+def test_season_totals(f1_directory):
+    aggregates = CareerAggregates(f1_directory)
+
+    assert aggregates.years() == ['2001', '2002']
+    assert aggregates.season_driver(2001, 1) == career(2, 2, 1, 1, 1, 0, 16.0)
+    assert aggregates.season_driver('2002', 2) == career(3, 2, 1, 1, 2, 0, 19.0)
+    assert aggregates.season_constructors(2002)['20'] == aggregates.season_driver(2002, 2)
+    assert sorted(aggregates.season_drivers(2001).keys()) == ['1', '2']
+    assert aggregates.season_driver(1999, 1) == EMPTY_CAREER
+
+
+def test_loaded_readers_are_used(f1_directory):
+    results = ResultsDataFile(f1_directory)
+    races = RacesDataFile(f1_directory)
+
+    aggregates = CareerAggregates(f1_directory, results_file=results, races_file=races)
+    assert aggregates.driver(1) == CareerAggregates._career(CareerAggregates._build(results, races)['drivers'], 1)
+
+
+def test_saved_totals_until_a_source_changes(f1_directory):
+    first = CareerAggregates(f1_directory)
+    assert not first.loaded_from_cache
+    assert os.path.exists(os.path.join(f1_directory, AGGREGATES_FILE))
+
+    second = CareerAggregates(f1_directory)
+    assert second.loaded_from_cache
+    assert second.driver(2) == first.driver(2)
+
+    # A new win for driver 2 in the 2001 opener
+    with open(os.path.join(f1_directory, 'results.csv'), 'a', encoding='utf-8') as results_file:
+        results_file.write(f1_result_line(len(F1_RESULTS) + 1, 1, 2, 20, 3, 1, 10) + '\n')
+
+    changed = CareerAggregates(f1_directory)
+    assert not changed.loaded_from_cache
+    assert changed.driver(2) == career(6, 4, 3, 2, 4, 1, 39.0)
+    assert changed.season_driver(2001, 2).races == 3
+    assert CareerAggregates(f1_directory).loaded_from_cache
+
+
+def test_changed_signature_rebuilds(f1_directory, monkeypatch):
+    CareerAggregates(f1_directory)
+    monkeypatch.setattr(CareerAggregates, 'SIGNATURE', CareerAggregates.SIGNATURE + 1)
+
+    assert not CareerAggregates(f1_directory).loaded_from_cache
@@ -0,0 +1,88 @@
+import pytest
+from multi_command_utils.data_file import column_data
+from Formula1.f1_data_readers.LapTimes import LapTimesDataFile, LapTime
+from Formula1.f1_data_readers.PitStops import PitStopsDataFile
+from Formula1.f1_data_readers.Qualifying import QualifyingDataFile
+
+LAP_TIMES = [
+    'raceId,driverId,lap,position,time,milliseconds',
+    '1,1,1,1,1:38.109,98109',
+    '1,2,1,2,1:39.200,99200',
+    '1,1,2,1,1:32.000,92000',
+    '1,2,2,2,1:33.500,93500',
+    '2,1,1,2,1:40.000,100000'
+    ]
+
+PIT_STOPS = [
+    'raceId,driverId,stop,lap,time,duration,milliseconds',
+    '1,1,1,20,14:10:05,22.345,22345',
+    '1,2,1,21,14:11:40,23.100,23100',
+    '2,1,1,15,15:02:11,16:44.021,1004021',
+    '2,1,2,40,15:40:00,21.000,21000'
+    ]
+
+QUALIFYING = [
+    'qualifyId,raceId,driverId,constructorId,number,position,q1,q2,q3',
+    '1,1,1,10,1,1,1:20.0,1:19.0,1:18.0',
+    '2,1,2,20,2,2,1:20.5,1:19.5,\\N',
+    '3,2,2,20,2,1,1:21.0,\\N,\\N',
+    '4,2,1,10,1,\\N,\\N,\\N,\\N'
+    ]
+
+
+def write(directory, file_name, lines):
+    with open('{}/{}'.format(directory, file_name), 'w', encoding='utf-8') as data_file:
+        data_file.write('\n'.join(lines) + '\n')
+
+
+@pytest.fixture
+def race_files(f1_directory):
+    write(f1_directory, 'lapTimes.csv', LAP_TIMES)
+    write(f1_directory, 'pitStops.csv', PIT_STOPS)
+    write(f1_directory, 'qualifying.csv', QUALIFYING)
+    return f1_directory
+
+
+def test_lap_times(race_files):
+    lap_times = LapTimesDataFile(race_files)
+
+    laps = lap_times.get_by_race_id('1')
+    assert len(laps) == 4
+    assert laps[0] == LapTime(1, 1, 1, 1, '1:38.109', 98109)
+    assert [lap.milliseconds for lap in lap_times.get_by_race_id(1, driver_id='2')] == [99200, 93500]
+    assert len(lap_times.get_by_race_id(3)) == 0
+    # The file is in race order, each race is one range of rows
+    assert lap_times.get_index('raceId')[1] == range(0, 4)
+    assert lap_times.aggregate('milliseconds', 'min', [column_data('raceId', 1)]) == 92000
+
+
+def test_pit_stops(race_files):
+    pit_stops = PitStopsDataFile(race_files)
+
+    stops = pit_stops.get_by_race_id(2)
+    assert [(stop.stop, stop.lap) for stop in stops] == [(1, 15), (2, 40)]
+    # A long stop is written in minutes, duration stays text
+    assert stops[0].duration == '16:44.021'
+    assert stops[0].milliseconds == 1004021
+    assert [stop.driverId for stop in pit_stops.get_by_race_id(1, 2)] == [2]
+
+
+def test_qualifying(race_files):
+    qualifying = QualifyingDataFile(race_files)
+
+    first_race = qualifying.get_by_race_id(1)
+    assert [(result.driverId, result.position, result.q3) for result in first_race] == [(1, 1, '1:18.0'), (2, 2, None)]
+    # \N is read as a null
+    assert qualifying.get_by_race_id(2)[1].position is None
+    assert [result.raceId for result in qualifying.get_by_driver_id('2')] == [1, 2]
+
+
+@pytest.mark.parametrize('reader', [LapTimesDataFile, PitStopsDataFile, QualifyingDataFile])
+def test_snapshot_is_reused(race_files, reader):
+    first = reader(race_files)
+    second = reader(race_files)
+
+    assert not first.loaded_from_cache
+    assert second.loaded_from_cache
+    assert list(second.data) == list(first.data)
+    assert second.data.get_schema() == first.data.get_schema()
@@ -0,0 +1,38 @@
+import pickle
+import pytest
+from Formula1.f1_data_readers.Races import RacesDataFile
+
+
+def test_season_finals(f1_directory):
+    races = RacesDataFile(f1_directory)
+
+    # Round 10 is after round 2, the rounds are compared as numbers
+    assert races.get_season_finals() == {'2001' : '2', '2002' : '5'}
+    assert races.get_final_race_id(2001) == '2'
+    assert races.get_final_race_id(' 2002 ') == '5'
+    with pytest.raises(Exception):
+        races.get_final_race_id(1999)
+
+
+def test_season_finals_worked_out_once(f1_directory, monkeypatch):
+    races = RacesDataFile(f1_directory)
+    finals = races.get_season_finals()
+
+    monkeypatch.setattr(races, 'get_column_by_name', None)
+    assert races.get_season_finals() is finals
+
+
+def test_season_finals_follow_a_reload(f1_directory):
+    races = RacesDataFile(f1_directory)
+    races.get_season_finals()
+
+    received = pickle.loads(pickle.dumps(races))
+    assert received.season_finals is None
+    assert received.get_season_finals() == {'2001' : '2', '2002' : '5'}
+
+
+def test_races_of_a_season(f1_directory):
+    races = RacesDataFile(f1_directory)
+
+    assert [race.raceId for race in races.get_by_race_year(2002)] == ['4', '3', '5']
+    assert races.get_by_race_id(1).first().name == 'Australian Grand Prix, Melbourne'
@@ -0,0 +1,69 @@
+import os
+import pytest
+from multi_command_utils.mapped_rows import MappedRows
+from conftest import result_rows
+
+
+def write_file(tmp_path, content):
+    file_path = str(tmp_path / 'drivers.csv')
+    with open(file_path, 'wb') as output_file:
+        output_file.write(content)
+    return file_path
+
+
+def test_rows_match_the_parsed_file(results_csv):
+    directory, file_name = results_csv
+    with MappedRows(os.path.join(directory, file_name), 'utf-8') as rows:
+        assert rows.header == ['resultId', 'surname', 'year', 'team', 'points']
+        assert len(rows) == 60
+        assert list(rows) == result_rows()
+        assert rows[-1] == result_rows()[-1]
+        assert rows[1:3] == result_rows()[1:3]
+        assert rows.column(3) == [row_data[3] for row_data in result_rows()]
+        with pytest.raises(IndexError):
+            rows[60]
+
+
+def test_blank_lines_and_line_endings(tmp_path):
+    file_path = write_file(tmp_path, b'id,name\r\n\r\n1,Hill\r\n\n2,Senna')
+
+    with MappedRows(file_path) as rows:
+        assert len(rows) == 2
+        assert list(rows) == [['1', 'Hill'], ['2', 'Senna']]
+
+
+def test_quoted_values_and_null_marker(tmp_path):
+    file_path = write_file(tmp_path, b'id,name,number\n1,"Hill, Damon",5\n2,Senna,\\N\n')
+
+    with MappedRows(file_path, null_marker='\\N') as rows:
+        assert rows[0] == ['1', 'Hill, Damon', '5']
+        assert rows[1] == ['2', 'Senna', '']
+        assert list(rows.values(1, [0, 1])) == ['Hill, Damon', 'Senna']
+        assert rows.match(2, '') == [1]
+        assert rows.match(1, 'hill, DAMON') == [0]
+
+
+def test_index_folds_case(tmp_path):
+    file_path = write_file(tmp_path, 'id,team\n1,Ferrari\n2,McLaren\n3,FERRARI\n4,Ferrari\n'.encode('utf-8'))
+
+    with MappedRows(file_path) as rows:
+        assert rows.build_index(1) == {'ferrari' : [0, 2, 3], 'mclaren' : [1]}
+
+
+def test_empty_file(tmp_path):
+    with MappedRows(write_file(tmp_path, b'')) as rows:
+        assert rows.header is None
+        assert len(rows) == 0
+        assert list(rows) == []
+
+
+def test_close(tmp_path):
+    rows = MappedRows(write_file(tmp_path, b'id,name\n1,Hill\n'))
+    with rows:
+        assert rows[0] == ['1', 'Hill']
+
+    assert rows._map is None and rows._file.closed
+    with pytest.raises(Exception):
+        rows[0]
+    # Closing again does nothing
+    rows.close()
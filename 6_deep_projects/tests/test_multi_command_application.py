@@ -0,0 +1,108 @@
+import time
+import pytest
+from multi_command_utils.interface import IFunction, argument_definition
+from multi_command_utils.multi_command_application import MultiCommandApp
+from multi_command_utils.tabular_result import CommandResult, TabularResult
+
+
+class Echo(IFunction):
+    '''
+        Returns its -w argument as a message and a table, -x raises and
+        -s sleeps for that many seconds first.
+    '''
+    def __init__(self, datasets):
+        super().__init__(
+            datasets,
+            [
+            argument_definition('-w',True, 'Word'),
+            argument_definition('-x',False, 'Raise'),
+            argument_definition('-s',False, 'Sleep')
+            ])
+
+    def execute(self, args):
+        try:
+            execute_args = super()._parse_execute_arguments(args)
+            if '-s' in execute_args.keys():
+                time.sleep(float(execute_args['-s']))
+            if '-x' in execute_args.keys():
+                raise Exception("Failed {}".format(execute_args['-w']))
+            print("Echo {}".format(execute_args['-w']))
+            return CommandResult([TabularResult(["Word"], [[execute_args['-w']]], [8])], [execute_args['-w']])
+        except Exception as ex:
+            print(str(ex))
+            raise ex
+
+
+def make_app():
+    return MultiCommandApp("Test", {"get" : {"echo" : Echo({}), "each" : Echo({})}})
+
+
+@pytest.mark.parametrize('command, succeeded', [
+    ("get echo -w one", True),
+    ("get echo -w one -x", False),
+    ("get echo", False),
+    ("bogus", False),
+    ("get e -w one", False),
+    ("get", False),
+    ("help", True)
+    ])
+def test_execute_reports_what_happened(command, succeeded, capsys):
+    app = make_app()
+    try:
+        result = app.execute(command)
+    except Exception:
+        result = False
+
+    assert result is succeeded
+
+
+def test_batch_counts_every_failure(capsys):
+    app = make_app()
+    failed = app.run_batch(["get echo -w one", "bogus", "get e -w two", "get echo -w three -x", "get", "get echo -w four"])
+
+    assert failed == 4
+    output = capsys.readouterr().out
+    assert "Echo one" in output and "Echo four" in output
+
+
+def test_run_keeps_going_after_an_error(capsys, monkeypatch):
+    lines = iter(["get echo -w one -x", "get echo -w two"])
+
+    def next_line(prompt):
+        try:
+            return next(lines)
+        except StopIteration:
+            raise EOFError
+    monkeypatch.setattr('builtins.input', next_line)
+
+    with pytest.raises(EOFError):
+        make_app().run()
+    output = capsys.readouterr().out
+    assert "Command Failed :  get echo -w one -x" in output
+    assert "Echo two" in output
+
+
+BATCH = [
+    "# Slowest first, so the later commands finish before it",
+    "get echo -w one -s 0.2",
+    "",
+    "get echo -w two -s 0.1",
+    "get echo -w three -x",
+    "bogus",
+    "get echo -w four",
+    "quit",
+    "get echo -w five"
+    ]
+
+
+def test_parallel_batch_keeps_the_order(capsys):
+    assert make_app().run_batch(BATCH) == 2
+    in_order = capsys.readouterr().out
+
+    assert make_app().run_batch(BATCH, workers=4) == 2
+    parallel = capsys.readouterr().out
+
+    assert parallel == in_order
+    assert parallel.index("Echo one") < parallel.index("Echo two") < parallel.index("Echo four")
+    # quit ends the batch
+    assert "five" not in parallel
@@ -0,0 +1,60 @@
+import pytest
+from multi_command_utils.data_file import DataFile
+from multi_command_utils.record_cache import RecordCache
+from conftest import result_rows
+
+
+@pytest.fixture
+def results(results_csv):
+    directory, file_name = results_csv
+    return DataFile(directory, file_name, ['resultId'], use_cache=False, encoding='utf-8')
+
+
+def test_get_counts_hits_and_misses(results):
+    cache = RecordCache(results, 'resultId', 4)
+
+    assert cache.get('3') == result_rows()[2]
+    assert cache.get(3) == result_rows()[2]
+    assert cache.get('999') is None
+    assert cache.get_statistics() == {'hits' : 1, 'misses' : 2, 'records' : 2, 'size' : 4}
+
+
+def test_least_recently_used_is_evicted(results):
+    cache = RecordCache(results, 'resultId', 3)
+    for value in ['1', '2', '3']:
+        cache.get(value)
+    # 1 is now the most recently used, so 2 goes first
+    cache.get('1')
+    cache.get('4')
+
+    assert list(cache._records.keys()) == ['3', '1', '4']
+    cache.get('2')
+    assert cache.get_statistics()['misses'] == 5
+    assert list(cache._records.keys()) == ['1', '4', '2']
+
+
+def test_get_many_looks_up_misses_in_one_pass(results, monkeypatch):
+    cache = RecordCache(results, 'resultId', 10)
+    cache.get('1')
+
+    calls = []
+    key_positions_many = results.key_positions_many
+    def counted(column_name, values):
+        calls.append(list(values))
+        return key_positions_many(column_name, values)
+    monkeypatch.setattr(results, 'key_positions_many', counted)
+    monkeypatch.setattr(results, 'key_positions', None)
+
+    found = cache.get_many(['1', '5', '5', '7', '999'])
+
+    assert calls == [['5', '7', '999']]
+    assert found == {'1' : result_rows()[0], '5' : result_rows()[4], '7' : result_rows()[6], '999' : None}
+    assert cache.get_statistics() == {'hits' : 1, 'misses' : 4, 'records' : 4, 'size' : 10}
+
+
+def test_get_many_keeps_the_bound(results):
+    cache = RecordCache(results, 'resultId', 2)
+    found = cache.get_many([str(value) for value in range(1, 6)])
+
+    assert len(found) == 5
+    assert list(cache._records.keys()) == ['4', '5']
@@ -0,0 +1,77 @@
+import io
+import csv
+import json
+import pytest
+from multi_command_utils.renderers import TextRenderer, CsvRenderer, JsonRenderer, RENDERERS
+from multi_command_utils.tabular_result import CommandResult, TabularResult
+
+ROWS = [[1996, 'Hill, Damon', 97.0], [1997, 'Villeneuve', None], [2007, 'Räikkönen', 110.5]]
+
+
+def make_result(rows = None):
+    return CommandResult(
+        [
+            TabularResult(["Year", "Driver Name", "Points"], ROWS if rows is None else rows, title="Champions"),
+            TabularResult(["Team"], [["Williams"]], [12])
+        ],
+        ["Search All Years:"])
+
+
+def render(renderer, result):
+    output = io.StringIO()
+    renderer.render(result, output)
+    return output.getvalue()
+
+
+def test_text():
+    # Widths from the longest value, None is blank and 97.0 prints as 97
+    assert render(TextRenderer(), make_result()).split("\n") == [
+        "Search All Years:",
+        "Champions",
+        "-------------------------------",
+        "| Year | Driver Name | Points |",
+        "-------------------------------",
+        "  1996 | Hill, Damon |   97    ",
+        "  1997 |  Villeneuve |         ",
+        "  2007 |  Räikkönen  | 110.5   ",
+        "--------------",
+        "|    Team    |",
+        "--------------",
+        "   Williams   ",
+        ""
+        ]
+
+
+def test_text_widths_without_a_list_of_rows():
+    text = render(TextRenderer(), make_result(row for row in ROWS))
+
+    # Widths from the column names only, the rows are still written
+    assert TextRenderer.format_row([6, 13, 8], ["Year", "Driver Name", "Points"], True) in text
+    assert 'Räikkönen' in text
+
+
+def test_csv():
+    text = render(CsvRenderer(), make_result())
+    lines = text.split("\n")
+
+    assert lines[:3] == ["# Search All Years:", "# Champions", "Year,Driver Name,Points"]
+    assert list(csv.reader(lines[3:6])) == [['1996', 'Hill, Damon', '97.0'], ['1997', 'Villeneuve', ''], ['2007', 'Räikkönen', '110.5']]
+    assert lines[6:] == ["", "Team", "Williams", ""]
+
+
+def test_json_matches_to_dict():
+    assert json.loads(render(JsonRenderer(), make_result())) == make_result().to_dict()
+    # Rows from a generator are written as they come
+    assert json.loads(render(JsonRenderer(), make_result(row for row in ROWS))) == make_result().to_dict()
+
+
+def test_empty_result():
+    assert render(TextRenderer(), CommandResult()) == ''
+    assert render(CsvRenderer(), CommandResult(messages="Nothing found")) == "# Nothing found\n"
+    assert json.loads(render(JsonRenderer(), CommandResult())) == {'messages' : [], 'tables' : []}
+
+
+@pytest.mark.parametrize('name', ['text', 'csv', 'json'])
+def test_round_trip_renders_the_same(name):
+    renderer = RENDERERS[name]()
+    assert render(renderer, CommandResult.from_dict(make_result().to_dict())) == render(renderer, make_result())
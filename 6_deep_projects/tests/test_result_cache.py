@@ -0,0 +1,139 @@
+import os
+import functools
+import pytest
+from multi_command_utils.data_file import DataFile, column_data
+from multi_command_utils.dataset_registry import DatasetRegistry
+from multi_command_utils.interface import IFunction, argument_definition
+from multi_command_utils.result_cache import ResultCache
+from multi_command_utils.tabular_result import CommandResult, TabularResult
+
+
+class TeamCount(IFunction):
+    '''
+        Counts the results of a team (-t), -n returns nothing and -x 
+        raises so the cases that must not be saved can be tried.
+    '''
+    def __init__(self, datasets):
+        super().__init__(
+            datasets,
+            [
+            argument_definition('-t',True, 'Team'),
+            argument_definition('-n',False, 'Return nothing'),
+            argument_definition('-x',False, 'Raise')
+            ])
+        self.runs = 0
+
+    def execute(self, args):
+        execute_args = super()._parse_execute_arguments(args)
+        self.runs += 1
+        if '-x' in execute_args.keys():
+            raise Exception("Failed")
+        if '-n' in execute_args.keys():
+            return None
+
+        found = self.datasets['results'].find([column_data('team', execute_args['-t'])])
+        print("Counting {}".format(execute_args['-t']))
+        return CommandResult(
+            [TabularResult(["Team", "Results"], [[execute_args['-t'], len(found)]])],
+            ["Team search"])
+
+
+@pytest.fixture
+def cached(results_csv, tmp_path):
+    '''
+        (cache, wrapped function, function) over the results file.
+    '''
+    directory, file_name = results_csv
+    registry = DatasetRegistry()
+    registry.register('results', functools.partial(DataFile, directory, file_name, use_cache=False, encoding='utf-8'))
+    registry.register('unused', functools.partial(DataFile, directory, file_name, use_cache=False, encoding='utf-8'))
+
+    cache = ResultCache(str(tmp_path / 'results_cache'))
+    function = TeamCount(registry.for_command('count team'))
+    return cache, cache.wrap(function), function
+
+
+def test_repeat_is_replayed(cached, capsys):
+    cache, wrapped, function = cached
+    first = wrapped.execute(['-t', 'Ferrari'])
+    first_output = capsys.readouterr().out
+
+    second = wrapped.execute(['-t', 'Ferrari'])
+    assert function.runs == 1
+    assert capsys.readouterr().out == first_output == "Counting Ferrari\n"
+    assert second.to_dict() == first.to_dict()
+    assert second.tables[0].rows == [['Ferrari', 20]]
+    assert cache.get_statistics()['hits'] == 1
+    assert cache.get_statistics()['misses'] == 1
+
+
+def test_argument_order_does_not_matter(cached):
+    _, wrapped, function = cached
+    wrapped.execute(['-t', 'Ferrari', '-q', 'year=2001;surname=Hill'])
+    wrapped.execute(['-q', 'surname=Hill;year=2001', '-t', 'Ferrari'])
+
+    assert function.runs == 1
+
+
+def test_other_arguments_miss(cached):
+    _, wrapped, function = cached
+    wrapped.execute(['-t', 'Ferrari'])
+    result = wrapped.execute(['-t', 'Williams'])
+
+    assert function.runs == 2
+    assert result.tables[0].rows == [['Williams', 20]]
+
+
+def test_changed_source_invalidates(cached, results_csv):
+    _, wrapped, function = cached
+    wrapped.execute(['-t', 'Lotus'])
+
+    with open(os.path.join(*results_csv), 'a', encoding='utf-8') as source:
+        source.write('61,Senna,2010,Lotus,12\n')
+
+    # The registry still holds the old rows, the entry is still dropped
+    wrapped.execute(['-t', 'Lotus'])
+    assert function.runs == 2
+
+
+def test_only_used_datasets_are_sources(cached, results_csv):
+    _, wrapped, function = cached
+    wrapped.execute(['-t', 'Ferrari'])
+
+    assert wrapped._source_paths() == [os.path.join(*results_csv)]
+
+
+@pytest.mark.parametrize('args', [['-t', 'Ferrari', '-n'], ['-t', 'Ferrari', '-x']])
+def test_failed_commands_are_not_saved(cached, args):
+    cache, wrapped, function = cached
+    for _ in range(2):
+        try:
+            wrapped.execute(args)
+        except Exception:
+            pass
+
+    assert function.runs == 2
+    assert cache.get_statistics()['entries'] == 0
+
+
+def test_disabled_cache_always_runs(cached):
+    cache, wrapped, function = cached
+    cache.enabled = False
+    wrapped.execute(['-t', 'Ferrari'])
+    wrapped.execute(['-t', 'Ferrari'])
+
+    assert function.runs == 2
+
+
+def test_put_leaves_no_temp_files(tmp_path, results_csv):
+    directory, file_name = results_csv
+    cache = ResultCache(str(tmp_path / 'results_cache'))
+    source_paths = [os.path.join(directory, file_name)]
+
+    assert cache.put('count team', {'-t' : 'Ferrari'}, "saved\n", None, source_paths)
+    # Rows that can't be saved as JSON, the partial entry is removed
+    assert not cache.put('count team', {'-t' : 'McLaren'}, "", {'rows' : [object()]}, source_paths)
+
+    assert [name for name in os.listdir(cache.directory) if name.endswith('.tmp')] == []
+    assert cache.get('count team', {'-t' : 'Ferrari'})['output'] == "saved\n"
+    assert cache.get('count team', {'-t' : 'McLaren'}) is None